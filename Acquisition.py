@@ -0,0 +1,126 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#/***************************************************************************/
+#/* Raspberry Pi ELM327 OBBII CAN BUS Diagnostic Software.                  */
+#/*                                                                         */
+#/* Class: Acquisition                                                      */
+#/* Aquire PID data from the ECU for all subscribers, such as meters, plots */
+#/* and loggers. The PIDs needed by all of the subscribers are combined, so */
+#/* each PID is only requested once, and the data for each PID is written   */
+#/* to the sample buffer, where every subscriber reads the data it needs.   */
+#/***************************************************************************/
+
+
+
+import time
+import Scheduler
+import SampleBuffer
+
+
+
+class Acquisition:
+	def __init__(self, ThisELM327):
+		self.ThisELM327 = ThisELM327
+		self.Subscribers = {}
+		self.ThisScheduler = Scheduler.Scheduler()
+		self.Samples = SampleBuffer.SampleBuffer()
+
+
+
+#/*******************************************************************/
+#/* Add a subscriber. GetPIDs is called to get the list of PIDs the */
+#/* subscriber currently needs, the data for the PIDs is read from  */
+#/* the sample buffer. When Grouped, all of the subscriber's PIDs   */
+#/* are requested together whenever any of them is due to be        */
+#/* refreshed, such as for plot series which share a time axis.     */
+#/*******************************************************************/
+	def Subscribe(self, Name, GetPIDs, Grouped = False):
+		self.Subscribers[Name] = (GetPIDs, Grouped)
+
+
+
+#/********************************/
+#/* Remove a subscriber by name. */
+#/********************************/
+	def Unsubscribe(self, Name):
+		self.Subscribers.pop(Name, None)
+
+
+
+#/*******************************************************************/
+#/* Return the PIDs currently needed by each subscriber, and a list */
+#/* of the unique PIDs needed by all of the subscribers.            */
+#/*******************************************************************/
+	def GetPIDs(self):
+		SubscriberPIDs = {}
+		PIDs = []
+		for Name in list(self.Subscribers):
+			SubscriberPIDs[Name] = []
+			try:
+				for PID in self.Subscribers[Name][0]():
+					if PID != "" and PID not in SubscriberPIDs[Name]:
+						SubscriberPIDs[Name].append(PID)
+						if PID not in PIDs:
+							PIDs.append(PID)
+			except Exception as Catch:
+				print(str(Catch))
+
+		return SubscriberPIDs, PIDs
+
+
+
+#/*******************************************************************/
+#/* Request the PIDs which are due to be refreshed, once each, and  */
+#/* write the data for each PID to the sample buffer. When only one */
+#/* PID is needed, it is requested every time, focusing on the one  */
+#/* PID, so the ELM327 device can repeat the last command. Return   */
+#/* the time until the next PID is due, or -1 when no PIDs are      */
+#/* needed.                                                         */
+#/*******************************************************************/
+	def Poll(self):
+		SubscriberPIDs, PIDs = self.GetPIDs()
+		self.ThisScheduler.SetPIDs(PIDs)
+
+		if len(PIDs) == 1:
+			DuePIDs = PIDs
+		else:
+			DuePIDs = self.ThisScheduler.GetDuePIDs()
+			# Add all of the PIDs of a grouped subscriber when any of them are due.
+			for Name in SubscriberPIDs:
+				if Name in self.Subscribers and self.Subscribers[Name][1] == True:
+					for PID in SubscriberPIDs[Name]:
+						if PID in DuePIDs:
+							for GroupPID in SubscriberPIDs[Name]:
+								if GroupPID not in DuePIDs:
+									DuePIDs.append(GroupPID)
+							break
+
+		if len(DuePIDs) > 0:
+			PidData = self.ThisELM327.DoPIDs(DuePIDs)
+			self.ThisScheduler.SetRefreshed(DuePIDs)
+			Now = time.monotonic()
+			for PID in DuePIDs:
+				if PID in PidData:
+					SendTime, ReceiveTime = self.ThisELM327.GetPidTimes(PID)
+					if SendTime == 0:
+						SendTime = Now
+						ReceiveTime = Now
+					self.Samples.Write(SendTime, ReceiveTime, PID, PidData[PID])
+
+		if len(PIDs) == 1:
+			Result = 0
+		else:
+			Result = self.ThisScheduler.GetWaitTime()
+
+		return Result
@@ -0,0 +1,126 @@
+#!/usr/bin/python3
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#/***************************************************************************/
+#/* Raspberry Pi ELM327 OBBII CAN BUS Diagnostic Software.                  */
+#/*                                                                         */
+#/* Benchmark the ELM327 class response reader against a simulated serial   */
+#/* port, so the host side cost of reading a response can be measured       */
+#/* without an ELM327 device or a vehicle. Run from the application         */
+#/* directory, so the ELM327 class can load it's data files:                */
+#/*                                                                         */
+#/*    python3 BenchmarkELM327.py                                           */
+#/***************************************************************************/
+
+
+
+import time
+import ELM327
+
+
+
+# Number of requests to time for each response.
+BENCHMARK_COUNT = 20000
+
+# Typical ELM327 responses, with echo off, spaces off and linefeeds off.
+BENCHMARK_RESPONSES = {
+	"SINGLE PID" : b'410C1AF8\r\r>',
+	"MULTIPLE PID" : b'00F\r0:410C1AF80D32\r1:057B0480000000\r2:0F4B1133000000\r\r>',
+	"VIN" : b'014\r0:490201314731\r1:4A433534343452\r2:37323532333637\r\r>',
+	"NO DATA" : b'NO DATA\r\r>',
+}
+
+
+
+#/*******************************************************************/
+#/* Simulate a serial port connected to an ELM327 device, returning */
+#/* the same response to every request written to the port.         */
+#/*******************************************************************/
+class SimulatedPort:
+	def __init__(self, Response):
+		self.name = "SIMULATED"
+		self.Response = Response
+		self.Waiting = b''
+
+
+	def write(self, Data):
+		self.Waiting = self.Response
+		return len(Data)
+
+
+	@property
+	def in_waiting(self):
+		return len(self.Waiting)
+
+
+	def read(self, Size = 1):
+		Result = self.Waiting[:Size]
+		self.Waiting = self.Waiting[Size:]
+		return Result
+
+
+	def readinto(self, Buffer):
+		Data = self.read(len(Buffer))
+		Buffer[:len(Data)] = Data
+		return len(Data)
+
+
+	def close(self):
+		return
+
+
+
+#/***************************************************************/
+#/* The previous response reader, reading a character at a time */
+#/* into a string, for comparison.                              */
+#/***************************************************************/
+def ReadResponseByCharacter(ThisPort, Data):
+	ThisPort.write(Data)
+	Response = ""
+	ReadChar = 1
+	while ReadChar != b'>' and ReadChar != b'' and ReadChar != 0:
+		ReadChar = ThisPort.read()
+		if ReadChar[0] > 127:
+			pass
+		elif ReadChar != b'>':
+			Response += str(ReadChar, 'utf-8')
+	Result = Response.replace('\r', '\n').replace('\n\n', '\n')
+	if Result[-1:] != '\n':
+		Result += '\n'
+
+	return Result
+
+
+
+#/*****************************************************/
+#/* Time a function over the benchmark request count. */
+#/*****************************************************/
+def TimeRequests(Function, Data):
+	StartTime = time.perf_counter()
+	for Count in range(BENCHMARK_COUNT):
+		Result = Function(Data)
+	return (time.perf_counter() - StartTime) / BENCHMARK_COUNT, Result
+
+
+
+ThisELM327 = ELM327.ELM327()
+for ThisResponse in BENCHMARK_RESPONSES:
+	ThisPort = SimulatedPort(BENCHMARK_RESPONSES[ThisResponse])
+	ThisELM327.ELM327 = ThisPort
+	ByCharacterTime, ByCharacterResult = TimeRequests(lambda Data: ReadResponseByCharacter(ThisPort, Data), b'010C\r')
+	BufferedTime, BufferedResult = TimeRequests(ThisELM327.GetResponse, b'010C\r')
+	if ByCharacterResult != BufferedResult:
+		print(ELM327.STRING_ERROR + " " + ThisResponse + " RESPONSES DIFFER")
+	print("{:14s} BY CHARACTER {:8.2f}us  BUFFERED {:8.2f}us  {:5.1f}x".format(ThisResponse, 1000000 * ByCharacterTime, 1000000 * BufferedTime, ByCharacterTime / BufferedTime))
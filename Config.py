@@ -27,51 +27,14 @@ import os
 import pygame
 import Visual
 import Button
+import ConfigFile
 
 
 
-# Configuration default values.
-ConfigValues = {
-	"FontName" : "freemono",
-	"SerialPort" : "/dev/serial/by-id/usb-FTDI_FT232R_USB_UART_A800eaG9-if00-port0",
-	"Vehicle" : "DATA/TroubleCodes-R53_Cooper_S.txt",
-	"Debug": "OFF",
-}
-
-
-
-#/*********************************/
-#/* Load configuration from disk. */
-#/*********************************/
-def LoadConfig():
-	if os.path.isfile("CONFIG/CONFIG.CFG"):
-		File = open("CONFIG/CONFIG.CFG", 'r')
-		TextLine = "."
-		while TextLine != "":
-			TextLine = File.readline()
-			TextLine = TextLine.replace("\n", "")
-			if TextLine[:9] == "FontName=":
-				ConfigValues["FontName"] = str(TextLine[9:])
-			elif TextLine[:11] == "SerialPort=":
-				ConfigValues["SerialPort"] = str(TextLine[11:])
-			elif TextLine[:8] == "Vehicle=":
-				ConfigValues["Vehicle"] = str(TextLine[8:])
-			elif TextLine[:6] == "Debug=":
-				ConfigValues["Debug"] = str(TextLine[6:])
-		File.close()
-
-
-
-#/*******************************/
-#/* Save configuration to disk. */
-#/*******************************/
-def SaveConfig():
-	File = open("CONFIG/CONFIG.CFG", 'w')
-	File.write("FontName=" + str(ConfigValues["FontName"]) + "\n")
-	File.write("SerialPort=" + str(ConfigValues["SerialPort"]) + "\n")
-	File.write("Vehicle=" + str(ConfigValues["Vehicle"]) + "\n")
-	File.write("Debug=" + str(ConfigValues["Debug"]) + "\n")
-	File.close()
+# The configuration is loaded and saved by ConfigFile, which does not need pygame.
+ConfigValues = ConfigFile.ConfigValues
+LoadConfig = ConfigFile.LoadConfig
+SaveConfig = ConfigFile.SaveConfig
 
 
 
@@ -96,6 +59,7 @@ class Config(Visual.Visual):
 			"SELECT_SERIAL_PORT" : Button.Button(self.ThisSurface, "SELECT_SERIAL_PORT", Visual.PRESS_DOWN, Visual.X_MARGIN, 85, Button.Visual.BUTTON_HEIGHT, Button.Visual.BUTTON_HEIGHT, "IMAGE:ICONS/Select.png"),
 			"SELECT_VEHICLE" : Button.Button(self.ThisSurface, "SELECT_VEHICLE", Visual.PRESS_DOWN, Visual.X_MARGIN, 160, Button.Visual.BUTTON_HEIGHT, Button.Visual.BUTTON_HEIGHT, "IMAGE:ICONS/Select.png"),
 			"SELECT_DEBUG" : Button.Button(self.ThisSurface, "SELECT_DEBUG", Visual.PRESS_DOWN, Visual.X_MARGIN, 235, Button.Visual.BUTTON_HEIGHT, Button.Visual.BUTTON_HEIGHT, "IMAGE:ICONS/Select.png"),
+			"SELECT_TRIP_LOG" : Button.Button(self.ThisSurface, "SELECT_TRIP_LOG", Visual.PRESS_DOWN, self.xLen / 2, 235, Button.Visual.BUTTON_HEIGHT, Button.Visual.BUTTON_HEIGHT, "IMAGE:ICONS/Select.png"),
 			"SAVE_CONFIG" : Button.Button(self.ThisSurface, "SAVE_CONFIG", Visual.PRESS_DOWN, Button.Visual.BUTTON_HEIGHT, self.yLen - 1.5*Button.Visual.BUTTON_HEIGHT, Button.Visual.BUTTON_HEIGHT, Button.Visual.BUTTON_HEIGHT, "IMAGE:ICONS/Config.png"),
 			"CLOSE" : Button.Button(self.ThisSurface, "CLOSE", Visual.PRESS_DOWN, self.xLen - 2*Button.Visual.BUTTON_HEIGHT, self.yLen - 1.5*Button.Visual.BUTTON_HEIGHT, Button.Visual.BUTTON_HEIGHT, Button.Visual.BUTTON_HEIGHT, "IMAGE:ICONS/Close.png"),
 		}
@@ -189,6 +153,11 @@ class Config(Visual.Visual):
 						ConfigValues["Debug"] = "ON"
 					else:
 						ConfigValues["Debug"] = "OFF"
+				elif Result["BUTTON"] == "SELECT_TRIP_LOG":
+					if ConfigValues["TripLog"] == "OFF":
+						ConfigValues["TripLog"] = "ON"
+					else:
+						ConfigValues["TripLog"] = "OFF"
 		else:
 			# Always return true, no other user interface is available until this dialog answered.
 			Result = {}
@@ -247,6 +216,16 @@ class Config(Visual.Visual):
 		RenderText = Visual.Fonts["LargeFont"].render(ThisText, self.ColourValueText)
 		ThisSurface.blit(RenderText[0], (self.xPos + xOffset + 2*Visual.X_MARGIN + Visual.BUTTON_HEIGHT, self.yPos + yOffset + 235 + TextHeight + Visual.Y_MARGIN))
 
+		# Display the trip log configuration option.
+		ThisText = "Trip Log:"
+		TextHeight = Visual.Fonts["LargeFont"].get_rect(ThisText)[3]
+		RenderText = Visual.Fonts["LargeFont"].render(ThisText, self.ColourText)
+		ThisSurface.blit(RenderText[0], (self.xPos + xOffset + self.xLen / 2 + Visual.X_MARGIN + Visual.BUTTON_HEIGHT, self.yPos + yOffset + 235))
+		ThisText = ConfigValues["TripLog"]
+		TextHeight = Visual.Fonts["LargeFont"].get_rect(ThisText)[3]
+		RenderText = Visual.Fonts["LargeFont"].render(ThisText, self.ColourValueText)
+		ThisSurface.blit(RenderText[0], (self.xPos + xOffset + self.xLen / 2 + Visual.X_MARGIN + Visual.BUTTON_HEIGHT, self.yPos + yOffset + 235 + TextHeight + Visual.Y_MARGIN))
+
 		# Display all buttons on the gadgit.
 		for ThisButton in self.Buttons:
 			self.Buttons[ThisButton].Display(self.ThisSurface, self.xPos, self.yPos)
@@ -0,0 +1,73 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#/***************************************************************************/
+#/* Raspberry Pi ELM327 OBBII CAN BUS Diagnostic Software.                  */
+#/*                                                                         */
+#/* Load and save the application configuration. Kept apart from the        */
+#/* configuration dialog, so the configuration can be used without pygame,  */
+#/* such as when aquiring data without a display.                           */
+#/***************************************************************************/
+
+
+
+import os
+
+
+
+# Configuration default values.
+ConfigValues = {
+	"FontName" : "freemono",
+	"SerialPort" : "/dev/serial/by-id/usb-FTDI_FT232R_USB_UART_A800eaG9-if00-port0",
+	"Vehicle" : "DATA/TroubleCodes-R53_Cooper_S.txt",
+	"Debug": "OFF",
+	"TripLog": "OFF",
+}
+
+
+
+#/*********************************/
+#/* Load configuration from disk. */
+#/*********************************/
+def LoadConfig():
+	if os.path.isfile("CONFIG/CONFIG.CFG"):
+		File = open("CONFIG/CONFIG.CFG", 'r')
+		TextLine = "."
+		while TextLine != "":
+			TextLine = File.readline()
+			TextLine = TextLine.replace("\n", "")
+			if TextLine[:9] == "FontName=":
+				ConfigValues["FontName"] = str(TextLine[9:])
+			elif TextLine[:11] == "SerialPort=":
+				ConfigValues["SerialPort"] = str(TextLine[11:])
+			elif TextLine[:8] == "Vehicle=":
+				ConfigValues["Vehicle"] = str(TextLine[8:])
+			elif TextLine[:6] == "Debug=":
+				ConfigValues["Debug"] = str(TextLine[6:])
+			elif TextLine[:8] == "TripLog=":
+				ConfigValues["TripLog"] = str(TextLine[8:])
+		File.close()
+
+
+
+#/*******************************/
+#/* Save configuration to disk. */
+#/*******************************/
+def SaveConfig():
+	File = open("CONFIG/CONFIG.CFG", 'w')
+	File.write("FontName=" + str(ConfigValues["FontName"]) + "\n")
+	File.write("SerialPort=" + str(ConfigValues["SerialPort"]) + "\n")
+	File.write("Vehicle=" + str(ConfigValues["Vehicle"]) + "\n")
+	File.write("Debug=" + str(ConfigValues["Debug"]) + "\n")
+	File.write("TripLog=" + str(ConfigValues["TripLog"]) + "\n")
+	File.close()
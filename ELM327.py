@@ -23,8 +23,12 @@
 
 
 
+import os
 import time
+import math
 import serial
+import FreezeFrame
+import MonitorTest
 
 
 DEBUG = "OFF"
@@ -36,17 +40,66 @@ CONNECT_CAN_BUS_FAIL = 2
 
 # Serial port constants.
 SERIAL_PORT_NAME = None
-#SERIAL_PORT_BAUD = 115200
-#SERIAL_PORT_BAUD = 57600
 SERIAL_PORT_BAUD = 38400
-#SERIAL_PORT_BAUD = 9600
+# Baud rates tried when detecting the baud rate the ELM327 device is using.
+SERIAL_PORT_BAUD_DETECT = [38400, 9600, 115200, 57600, 230400, 500000]
+# Baud rates tried, fastest first, when negotiating a faster baud rate.
+SERIAL_PORT_BAUD_NEGOTIATE = [500000, 230400, 115200, 57600]
+# Baud rate found for each serial port, used first on the next connection.
+SERIAL_PORT_BAUD_FILE = "CONFIG/BAUD.CFG"
+# Supported PID responses for each vehicle, used instead of requesting them on the next connection.
+CAPABILITY_CACHE_FILE = "CONFIG/CAPABILITY.CFG"
 SERIAL_PORT_TIME_OUT = 7
+SERIAL_PORT_DETECT_TIME_OUT = 0.5
 SERIAL_LINEFEED_TYPE = b'\r'
 #SERIAL_LINEFEED_TYPE = b'\r\n'
+SERIAL_READ_BUFFER_SIZE = 4096
+# Received characters which are rejected, any with the high bit set.
+SERIAL_REJECT_CHARACTERS = bytes(range(128, 256))
 
 # ELM327 Device related constants.
-ELM_RESET_PERIOD = 1
-ELM_CONNECT_SETTLE_PERIOD = 5
+# Longest time to wait for the ELM327 device prompt after a reset.
+ELM_RESET_TIME_OUT = 2
+# Longest time to keep trying to connect to the ECU.
+ELM_CONNECT_TIME_OUT = 5
+# Period between attempts when polling the ELM327 device.
+ELM_POLL_PERIOD = 0.1
+
+# ELM327 baud rate divisor clock, AT BRD.
+ELM_BAUD_CLOCK = 4000000
+# ELM327 baud rate change timeout, AT BRT, in steps of 5ms.
+ELM_BAUD_TIME_OUT = 0x19
+# Number of requests which must succeed after a baud rate change.
+ELM_BAUD_TEST_COUNT = 5
+
+# ELM327 response timeout, AT ST, in steps of 4.096ms.
+ELM_TIMEOUT_STEP = 0.004096
+ELM_TIMEOUT_MIN = 0x08
+ELM_TIMEOUT_DEFAULT = 0x32
+# Timeout set as a multiple of the longest measured ECU response time.
+ELM_TIMEOUT_MARGIN = 2
+# Requests used to measure the ECU response time during connection.
+ELM_TIMING_PROBES = [b'0100\r', b'0101\r']
+ELM_TIMING_PROBE_COUNT = 3
+# Number of responses measured before the timeout is tuned again.
+ELM_TIMING_RETUNE_COUNT = 100
+
+# OBDII protocol numbers, as reported by AT DPN, which are a CAN BUS.
+CAN_PROTOCOLS = "6789ABC"
+# Maximum number of Mode 01 PIDs which can be requested in a single request on a CAN BUS.
+MAX_PIDS_PER_REQUEST = 6
+# Maximum number of Mode 02 PIDs, with their freeze frame number, in a single request on a CAN BUS.
+MAX_FREEZE_PIDS_PER_REQUEST = 3
+# OBDII modes where the expected number of responses is added to a request.
+RESPONSE_COUNT_MODES = [b'01', b'02', b'09']
+# PIDs which can respond with multiple frames, the response count is not added to these.
+MULTIPLE_FRAME_PIDS = ["0902", "0904", "0906", "0908", "090A", "090B"]
+# Response services which have no PID byte, the trouble code services.
+SERVICES_WITHOUT_PID = [0x43, 0x44, 0x47, 0x4A]
+# ELM327 responses which show a request failed, rather than the ECU having no data for the request.
+ELM_ERROR_RESPONSES = ["?", "ERR", "BUS BUSY", "BUFFER FULL", "STOPPED", "UNABLE TO CONNECT", "LV RESET", "ACT ALERT"]
+# First ELM327 device version supporting the expected number of responses.
+RESPONSE_COUNT_VERSION = 1.3
 
 # Constant string responses.
 STRING_NOT_IMPLEMENTED = "!NOT IMPLEMENTED!"
@@ -67,11 +120,24 @@ FIELD_PID_MIN_2 = 6
 FIELD_PID_MAX_2 = 7
 FIELD_PID_HIGH_2 = 8
 
+# Monitor test names, for each bit of the monitor status, PID 0101.
+MONITOR_TESTS_COMMON = ("MISSFIRE TEST", "FUEL SYSTEM TEST", "COMPONENTS TEST")
+MONITOR_TESTS_SPARK = ("CATALYST TEST", "HEATED CATALYST TEST", "EVAPORATIVE SYSTEM TEST", "SECONDARY AIR SYSTEM TEST", "A/C REFRIGERANT TEST", "OXYGEN SENSOR TEST", "OXYGEN SENSOR HEATER TEST", "EGR SYSTEM TEST")
+MONITOR_TESTS_COMPRESSION = ("NMHC CATALYST TEST", "NOx/SCR MONITOR TEST", "Reserved 1 TEST", "BOOST PRESSURE TEST", "Reserved 2 TEST", "EXHAUST GAS SENSOR TEST", "PM FILTER MONITORING TEST", "EGR/VVT SYSTEM TEST")
+
 
 
 # PID Numbers and their function pointers implemented in this class.
 PidFunctions = {}
 
+# PID Numbers and the number of data bytes returned for each PID.
+PidDataLength = {}
+
+# PID Numbers of the PIDs which return data, and the functions which return the request
+# for each PID and decode the response frames, without talking to the ELM327 device.
+PidRequests = {}
+PidDecoders = {}
+
 
 
 class ELM327:
@@ -79,8 +145,40 @@ class ELM327:
 		self.InitResult = ""
 		self.ValidPIDs = {}
 		self.ValidFreezePIDs = {}
+		self.FreezeSupport = {}
+		self.ValidMonitorIDs = {}
 		self.MilOn = False
 		self.FreezeFrameCount = 0
+		self.ELM327 = None
+		self.Configured = False
+		self.CanBus = False
+		self.Protocol = ""
+		self.PendingResponses = {}
+		self.PendingTimes = {}
+		self.ReadBuffer = bytearray(SERIAL_READ_BUFFER_SIZE)
+		self.SendTime = 0
+		self.FirstByteTime = 0
+		self.ReceiveTime = 0
+		self.ResponseTimes = (0, 0)
+		self.RequestSendTime = 0
+		self.RequestReceiveTime = 0
+		self.PidTimes = {}
+		self.NoData = False
+		self.PromptReceived = False
+		self.LastCommand = b''
+		self.TimingTuned = False
+		self.Timeout = ELM_TIMEOUT_DEFAULT
+		self.TimeoutPending = None
+		self.TimeoutMin = ELM_TIMEOUT_MIN
+		self.LatencyMax = 0
+		self.LatencyCount = 0
+		self.ResponseCounts = {}
+		self.ResponseCountEnabled = False
+		self.Vin = ""
+		self.CalibrationId = ""
+		self.VehicleKey = ""
+		self.Capabilities = {}
+		self.CapabilitiesChanged = False
 
 #  /*************************************************/
 # /* Read Vehicle OBD Standards lookup table data. */
@@ -163,6 +261,30 @@ class ELM327:
 		except:
 			self.InitResult += "FAILED TO READ FILE: DATA/PidDescriptionsMode05.txt\n"
 
+#  /***************************************************/
+# /* Read Mode 06 PID description lookup table data. */
+#/***************************************************/
+		self.PidDescriptionsMode06 = {}
+		try:
+			with open("DATA/PidDescriptionsMode06.txt") as ThisFile:
+				for ThisLine in ThisFile:
+					Digit, Code = ThisLine.partition(" ")[::2]
+					self.PidDescriptionsMode06[Digit] = Code.strip()
+		except:
+			self.InitResult += "FAILED TO READ FILE: DATA/PidDescriptionsMode06.txt\n"
+
+#  /****************************************************/
+# /* Read Mode 06 test description lookup table data. */
+#/****************************************************/
+		self.TestDescriptionsMode06 = {}
+		try:
+			with open("DATA/TestDescriptionsMode06.txt") as ThisFile:
+				for ThisLine in ThisFile:
+					Digit, Code = ThisLine.partition(" ")[::2]
+					self.TestDescriptionsMode06[Digit] = Code.strip()
+		except:
+			self.InitResult += "FAILED TO READ FILE: DATA/TestDescriptionsMode06.txt\n"
+
 #  /***************************************************/
 # /* Read Mode 09 PID description lookup table data. */
 #/***************************************************/
@@ -215,6 +337,7 @@ class ELM327:
 #/***********************************************/
 	def Close(self):
 		Result = True
+		self.Configured = False
 
 		# Close serial port.
 		try:
@@ -317,62 +440,87 @@ class ELM327:
 	def Connect(self):
 		Result = CONNECT_SUCCESS
 		self.InitResult = ""
+		self.CanBus = False
+		self.PendingResponses = {}
+		self.PendingTimes = {}
+		self.ResponseCounts = {}
 
 #  /****************************************************************/
 # /* Open the required serial port which the ELM327 device is on. */
 #/****************************************************************/
 		try:
-			self.ELM327 = serial.Serial(SERIAL_PORT_NAME, SERIAL_PORT_BAUD)
-			self.ELM327.timeout = SERIAL_PORT_TIME_OUT
-			self.ELM327.write_timeout = SERIAL_PORT_TIME_OUT
-
-			time.sleep(ELM_RESET_PERIOD)
-
-			# Initialize the ELM327 device.
-			Response = self.GetResponse(b'AT Z\r')
-
-			time.sleep(ELM_RESET_PERIOD)
-
-			# Echo Off, for faster communications.
-			Response = self.GetResponse(b'AT E0\r').replace('\r', '')
-			if Response != 'AT E0\nOK\n':
-				self.InitResult += "FAILED: AT E0 (Set Echo Off)\n"
-
-			# Linefeed off, for faster communications.
-			if self.InitResult == "":
-				Response = self.GetResponse(b'AT L0\r').replace('\r', '')
-				if Response != 'OK\n':
-					self.InitResult += "FAILED: AT L0 (Set Linefeed Off)\n"
-
-			# Responses on, for format recognition.
-			if self.InitResult == "":
-				Response = self.GetResponse(b'AT R1\r')
-				if Response != 'OK\n':
-					self.InitResult += "FAILED: AT R1 (Set Responses On)\n"
-
-			# Headers off, for format recognition.
-			if self.InitResult == "":
-				Response = self.GetResponse(b'AT H0\r')
-				if Response != 'OK\n':
-					self.InitResult += "FAILED: AT H0 (Set Headers Off)\n"
-
-			# Don't print space characters, for faster communications.
-			if self.InitResult == "":
-				Response = self.GetResponse(b'AT S0\r')
-				if Response != 'OK\n':
-					self.InitResult += "FAILED: AT S0 (Set Space Characters Off)\n"
-
-			# Set CAN communication protocol to ISO 9141-2 or auto detect on fail.
-			if self.InitResult == "":
-				Response = self.GetResponse(b'AT SP A3\r')
-				if Response != 'OK\n':
-					self.InitResult += "FAILED: AT SP A3 (Set Protocol ISO 9141-2 / Auto)\n"
-
-			# Set CAN Baud to high speed.
-			if self.InitResult == "":
-				Response = self.GetResponse(b'AT IB 10\r')
-				if Response[-3:] != 'OK\n':
-					self.InitResult += "FAILED: AT IB 10 (Set High Speed CAN BUS)\n"
+			# Skip the reset when the ELM327 device is already configured, such as on a reconnection.
+			if self.IsConfigured() == False:
+				self.TimingTuned = False
+				self.ResponseCountEnabled = False
+
+				# Close any serial port previously used.
+				self.Close()
+				StoredBaudRate = self.LoadBaudRate()
+				self.ELM327 = serial.Serial(SERIAL_PORT_NAME, StoredBaudRate)
+				self.ELM327.timeout = SERIAL_PORT_TIME_OUT
+				self.ELM327.write_timeout = SERIAL_PORT_TIME_OUT
+
+				# Find the baud rate the ELM327 device is currently using.
+				self.DetectBaudRate(StoredBaudRate)
+
+				# Initialize the ELM327 device.
+				Response = self.ResetDevice(self.ELM327.baudrate)
+				if Response == "":
+					self.InitResult += "FAILED: BAUD RATE DETECTION\n"
+				else:
+					# Use the fastest baud rate the ELM327 device and serial port can hold.
+					self.NegotiateBaudRate(StoredBaudRate)
+
+				# Check the ELM327 version supports adding the expected number of responses to requests.
+				VersionIndex = Response.find("ELM327 v")
+				try:
+					if VersionIndex != -1 and float(Response[VersionIndex + 8:].split()[0]) >= RESPONSE_COUNT_VERSION:
+						self.ResponseCountEnabled = True
+				except:
+					self.ResponseCountEnabled = False
+
+				# Echo Off, for faster communications.
+				if self.InitResult == "":
+					Response = self.GetResponse(b'AT E0\r').replace('\r', '')
+					if Response != 'AT E0\nOK\n':
+						self.InitResult += "FAILED: AT E0 (Set Echo Off)\n"
+
+				# Linefeed off, for faster communications.
+				if self.InitResult == "":
+					Response = self.GetResponse(b'AT L0\r').replace('\r', '')
+					if Response != 'OK\n':
+						self.InitResult += "FAILED: AT L0 (Set Linefeed Off)\n"
+
+				# Responses on, for format recognition.
+				if self.InitResult == "":
+					Response = self.GetResponse(b'AT R1\r')
+					if Response != 'OK\n':
+						self.InitResult += "FAILED: AT R1 (Set Responses On)\n"
+
+				# Headers off, for format recognition.
+				if self.InitResult == "":
+					Response = self.GetResponse(b'AT H0\r')
+					if Response != 'OK\n':
+						self.InitResult += "FAILED: AT H0 (Set Headers Off)\n"
+
+				# Don't print space characters, for faster communications.
+				if self.InitResult == "":
+					Response = self.GetResponse(b'AT S0\r')
+					if Response != 'OK\n':
+						self.InitResult += "FAILED: AT S0 (Set Space Characters Off)\n"
+
+				# Set CAN communication protocol to ISO 9141-2 or auto detect on fail.
+				if self.InitResult == "":
+					Response = self.GetResponse(b'AT SP A3\r')
+					if Response != 'OK\n':
+						self.InitResult += "FAILED: AT SP A3 (Set Protocol ISO 9141-2 / Auto)\n"
+
+				# Set CAN Baud to high speed.
+				if self.InitResult == "":
+					Response = self.GetResponse(b'AT IB 10\r')
+					if Response[-3:] != 'OK\n':
+						self.InitResult += "FAILED: AT IB 10 (Set High Speed CAN BUS)\n"
 
 			if self.InitResult != "":
 				Result = CONNECT_ELM327_FAIL
@@ -383,22 +531,36 @@ class ELM327:
 			print(str(Catch))
 
 		if Result == CONNECT_SUCCESS:
-			# Wait before tring to connect to ensure EML device is idle.
-			time.sleep(ELM_CONNECT_SETTLE_PERIOD)
+			self.Configured = True
 			# Request Mode 01 PID 01 (MIL Information) to test connection.
-			Response = self.GetResponse(b'0101\r')
-			if Response.find("UNABLE TO CONNECT") != -1:
+			Response = self.ConnectBus()
+			if Response == "":
 				Result = CONNECT_CAN_BUS_FAIL
 				# Close serial port if connection failed.
-				self.ELM327.close()
+				self.Close()
 			else:
-				Response = self.PruneData(Response, 2)
 				ResultVal1 = int(Response[:2], 16)
 				if (ResultVal1 & 0x80) != 0:
 					self.MilOn = True
 				self.FreezeFrameCount = ResultVal1 & 0x7F
+				# Get the protocol in use, multiple PIDs per request is only supported on a CAN BUS.
+				Response = self.GetResponse(b'AT DPN\r').strip()
+				self.Protocol = Response[-1:]
+				if Response[-1:] in CAN_PROTOCOLS:
+					self.CanBus = True
 
 		if Result == CONNECT_SUCCESS:
+			# Use the supported PIDs from a previous connection to the same vehicle when still valid.
+			self.ValidPIDs = {}
+			self.ClearFreezeSupport()
+			self.LoadCapabilities()
+			# Set the shortest safe response timeout for the ECU, as tuned on a previous connection when stored.
+			if self.TimingTuned == False:
+				self.TuneTiming(self.Capabilities.get("TIMEOUT", ""))
+				if self.Capabilities.get("TIMEOUT") != '%2.2X' % self.Timeout:
+					self.Capabilities["TIMEOUT"] = '%2.2X' % self.Timeout
+					self.CapabilitiesChanged = True
+
 			# Manually add standard PIDs supported, prefix with '!', don't show as user selectable option.
 			# Application specific display locations.
 			self.ValidPIDs['03'] = "! Show stored Diagnostic Trouble Codes"
@@ -427,50 +589,530 @@ class ELM327:
 				self.PID01C0()
 			# Get Mode 05 PID support.
 			self.PID050100()
+			# Get Mode 06 monitor ID support.
+			self.LoadMonitorSupport()
 			# Get Mode 09 PID support.
 			self.PID0900()
+			self.SaveCapabilities()
+
+		return Result
+
+
+
+#/******************************************************************/
+#/* Check if the ELM327 device is already open on the configured   */
+#/* serial port and still configured by a previous connection. An  */
+#/* ELM327 device which has been reset or powered off has echo on, */
+#/* so it's response starts with the request rather than the       */
+#/* identification.                                                */
+#/******************************************************************/
+	def IsConfigured(self):
+		Result = False
+
+		try:
+			if self.Configured == True and self.ELM327.is_open == True and self.ELM327.name == SERIAL_PORT_NAME:
+				self.ELM327.timeout = SERIAL_PORT_DETECT_TIME_OUT
+				self.ELM327.reset_input_buffer()
+				if self.GetResponse(b'AT I\r').find("ELM") == 0:
+					Result = True
+				self.ELM327.timeout = SERIAL_PORT_TIME_OUT
+		except:
+			Result = False
+		self.Configured = Result
+
+		return Result
+
+
+
+#/********************************************************************/
+#/* Reset the ELM327 device, waiting for the prompt which the ELM327 */
+#/* device sends once the reset is complete, rather than a fixed     */
+#/* period. A reset can return the ELM327 device to it's default     */
+#/* baud rate, so the baud rate is detected again. Return the ELM327 */
+#/* device identification, or an empty string on failure.            */
+#/********************************************************************/
+	def ResetDevice(self, BaudRate):
+		self.Configured = False
+		self.ELM327.timeout = ELM_RESET_TIME_OUT
+		self.GetResponse(b'AT Z\r')
+		self.ELM327.timeout = SERIAL_PORT_TIME_OUT
+
+		return self.DetectBaudRate(BaudRate)
+
+
+
+#/*******************************************************************/
+#/* Connect to the CAN BUS of the ECU, requesting Mode 01 PID 01    */
+#/* (MIL Information) until the ECU responds or the connection time */
+#/* is exceeded. Return the PID data, or an empty string when a     */
+#/* connection could not be made.                                   */
+#/*******************************************************************/
+	def ConnectBus(self):
+		Result = ""
+
+		Deadline = time.monotonic() + ELM_CONNECT_TIME_OUT
+		while Result == "":
+			Response = self.GetResponse(b'0101\r')
+			for Line in Response.split('\n'):
+				if Line[:4] == '4101' and self.IsHexData(Line):
+					Result = Line[4:]
+			if Result == "":
+				if time.monotonic() + ELM_POLL_PERIOD >= Deadline:
+					break
+				time.sleep(ELM_POLL_PERIOD)
+
+		return Result
+
+
+
+#/********************************************************************/
+#/* Find the baud rate the ELM327 device is currently using. Try the */
+#/* suggested baud rate first, followed by the other common baud     */
+#/* rates. Return the ELM327 device identification, or an empty      */
+#/* string if the ELM327 device was not found.                       */
+#/********************************************************************/
+	def DetectBaudRate(self, BaudRate):
+		Result = ""
+
+		self.ELM327.timeout = SERIAL_PORT_DETECT_TIME_OUT
+		BaudRates = [BaudRate]
+		for ThisBaudRate in SERIAL_PORT_BAUD_DETECT:
+			if ThisBaudRate not in BaudRates:
+				BaudRates.append(ThisBaudRate)
+		for ThisBaudRate in BaudRates:
+			self.ELM327.baudrate = ThisBaudRate
+			self.ELM327.reset_input_buffer()
+			# Try twice, the first request can be rejected from previous characters sent at the wrong baud rate.
+			for Count in range(2):
+				Response = self.GetResponse(b'AT I\r')
+				if Response.find("ELM") != -1:
+					Result = Response
+					break
+			if Result != "":
+				break
+		self.ELM327.timeout = SERIAL_PORT_TIME_OUT
+
+		return Result
+
+
+
+#/***********************************************************************/
+#/* Negotiate the fastest baud rate the ELM327 device and the serial    */
+#/* port can reliably hold, trying the baud rate which worked last time */
+#/* first. Bluetooth serial ports are not changed, as the baud rate     */
+#/* between the bluetooth device and the ELM327 device is fixed.        */
+#/***********************************************************************/
+	def NegotiateBaudRate(self, StoredBaudRate):
+		if str(SERIAL_PORT_NAME).find("rfcomm") == -1:
+			Response = self.GetResponse(bytearray("AT BRT " + "{:02X}".format(ELM_BAUD_TIME_OUT) + "\r", 'UTF-8'))
+			if Response[-3:] == 'OK\n':
+				BaudRates = []
+				for ThisBaudRate in SERIAL_PORT_BAUD_NEGOTIATE:
+					if ThisBaudRate > self.ELM327.baudrate:
+						BaudRates.append(ThisBaudRate)
+				if StoredBaudRate in BaudRates:
+					BaudRates.remove(StoredBaudRate)
+					BaudRates.insert(0, StoredBaudRate)
+				for ThisBaudRate in BaudRates:
+					if self.ChangeBaudRate(ThisBaudRate) == True:
+						break
+		if self.ELM327.baudrate != StoredBaudRate:
+			self.SaveBaudRate(self.ELM327.baudrate)
+
+
+
+#/*********************************************************************/
+#/* Change the baud rate of the ELM327 device. The ELM327 device      */
+#/* responds OK at the current baud rate, then sends it's             */
+#/* identification at the new baud rate and waits for a carriage      */
+#/* return to confirm the change. Without the confirmation the ELM327 */
+#/* device returns to the previous baud rate. Once changed, a number  */
+#/* of requests must succeed for the new baud rate to be kept.        */
+#/*********************************************************************/
+	def ChangeBaudRate(self, BaudRate):
+		Result = False
+		PreviousBaudRate = self.ELM327.baudrate
+		Confirmed = False
+
+		try:
+			self.ELM327.timeout = SERIAL_PORT_DETECT_TIME_OUT
+			Divisor = round(ELM_BAUD_CLOCK / BaudRate)
+			Data = bytearray("AT BRD " + "{:02X}".format(Divisor) + "\r", 'UTF-8').replace(b'\r', SERIAL_LINEFEED_TYPE)
+			self.ELM327.write(Data)
+			Response = self.ELM327.read_until(b'OK')
+			if Response.find(b'OK') != -1:
+				# Listen for the ELM327 device identification at the new baud rate.
+				self.ELM327.baudrate = BaudRate
+				Response = self.ELM327.read_until(b'\r')
+				if Response.find(b'ELM') != -1:
+					self.ELM327.write(SERIAL_LINEFEED_TYPE)
+					self.ReadResponse()
+					Confirmed = True
+					# Test the new baud rate is reliable.
+					Result = True
+					for Count in range(ELM_BAUD_TEST_COUNT):
+						if self.GetResponse(b'AT I\r').find("ELM") == -1:
+							Result = False
+							break
+				if Confirmed == False:
+					# The ELM327 device returns to the previous baud rate and prompts for a request.
+					self.ELM327.baudrate = PreviousBaudRate
+					self.ReadResponse()
+			elif Response.find(b'?') != -1:
+				# Baud rate divisor not supported, read the remaining prompt.
+				self.ReadResponse()
+		except Exception as Catch:
+			print(STRING_ERROR + " BAUD RATE " + str(BaudRate) + " : " + str(Catch))
+
+		if Result == False and Confirmed == True:
+			# Unreliable baud rate, reset the ELM327 device to it's default baud rate.
+			self.ResetDevice(PreviousBaudRate)
+		self.ELM327.timeout = SERIAL_PORT_TIME_OUT
+
+		return Result
+
+
+
+#/************************************************************/
+#/* Load the baud rate last used on the current serial port. */
+#/************************************************************/
+	def LoadBaudRate(self):
+		Result = SERIAL_PORT_BAUD
+
+		try:
+			if os.path.isfile(SERIAL_PORT_BAUD_FILE):
+				File = open(SERIAL_PORT_BAUD_FILE, 'r')
+				for TextLine in File:
+					TextElements = TextLine.replace("\n", "").split('|')
+					if len(TextElements) == 2 and TextElements[0] == "SerialPort=" + str(SERIAL_PORT_NAME) and TextElements[1][:5] == "Baud=":
+						Result = int(TextElements[1][5:])
+				File.close()
+		except Exception as Catch:
+			print(STRING_ERROR + " " + SERIAL_PORT_BAUD_FILE + " : " + str(Catch))
+
+		return Result
+
+
+
+#/*******************************************************/
+#/* Save the baud rate used on the current serial port. */
+#/*******************************************************/
+	def SaveBaudRate(self, BaudRate):
+		try:
+			TextLines = []
+			if os.path.isfile(SERIAL_PORT_BAUD_FILE):
+				File = open(SERIAL_PORT_BAUD_FILE, 'r')
+				for TextLine in File:
+					if TextLine.split('|')[0] != "SerialPort=" + str(SERIAL_PORT_NAME):
+						TextLines.append(TextLine)
+				File.close()
+			TextLines.append("SerialPort=" + str(SERIAL_PORT_NAME) + "|Baud=" + str(BaudRate) + "\n")
+			File = open(SERIAL_PORT_BAUD_FILE, 'w')
+			for TextLine in TextLines:
+				File.write(TextLine)
+			File.close()
+		except Exception as Catch:
+			print(STRING_ERROR + " " + SERIAL_PORT_BAUD_FILE + " : " + str(Catch))
+
+
+
+#/*********************************************************************/
+#/* Read the identification of the connected vehicle, the VIN or      */
+#/* calibration ID. Only requested when the Mode 09 supported PIDs    */
+#/* response shows the ECU provides it. Return an empty string when   */
+#/* the ECU does not provide the identification.                      */
+#/*********************************************************************/
+	def GetVehicleId(self, Request):
+		Result = ""
+
+		try:
+			Payload = self.GetPayload(self.ParseResponse(self.GetResponse(Request)), 0x49, int(Request[2:4], 16), 1, True)
+			Result = self.DecodeText(Payload)
+			# Remove any message count and field separator characters.
+			Result = "".join(Char for Char in Result if Char.isprintable() and Char not in "|=").strip()
+		except:
+			Result = ""
 
 		return Result
 
 
 
-#/***************************************************************/
-#/* Return a list of PIDs the currently connected ECU supports. */
-#/***************************************************************/
-	def GetValidPIDs(self, FreezeIndex = -1):
+#/*******************************************************************/
+#/* Only keep the data lines of a supported PIDs response which are */
+#/* responses to the request, in a consistent order, so responses   */
+#/* can be compared and stored. Each data line is the response      */
+#/* service and PID followed by the four byte supported PID bitmap. */
+#/*******************************************************************/
+	def NormalizeSupportResponse(self, Request, Response):
+		Prefix = '%X' % (int(Request[:1], 16) + 4) + Request[1:]
+		Lines = []
+		for Line in Response.split('\n'):
+			if Line[:len(Prefix)] == Prefix and len(Line) >= len(Prefix) + 8 and self.IsHexData(Line):
+				Lines.append(Line)
+		Lines.sort()
+
+		return ",".join(Lines)
+
+
+
+#/*******************************************************************/
+#/* Check a response failed with an ELM327 error, such as BUS BUSY, */
+#/* or ended without a prompt.                                      */
+#/*******************************************************************/
+	def IsErrorResponse(self, Response):
+		Result = (self.PromptReceived == False)
+
+		for ThisError in ELM_ERROR_RESPONSES:
+			if Response.find(ThisError) != -1:
+				Result = True
+
+		return Result
+
+
+
+#/*******************************************************************/
+#/* Request a supported PIDs response from the ECU. Return the      */
+#/* normalized response, an empty string when the ECU responded NO  */
+#/* DATA, as the ECU supports none of the PIDs, or None when the    */
+#/* request failed, so the response is not stored.                  */
+#/*******************************************************************/
+	def RequestSupportResponse(self, Data):
+		Request = str(bytes(Data[:-1]), 'utf-8')
+		Response = self.GetResponse(Data)
+		Result = None
+		if self.IsErrorResponse(Response) == False:
+			if self.NoData == True:
+				Result = ""
+			else:
+				Result = self.NormalizeSupportResponse(Request, Response)
+				if Result == "":
+					Result = None
+
+		return Result
+
+
+
+#/*******************************************************************/
+#/* Read the supported PID responses stored for each vehicle, as a  */
+#/* dictionary of the responses for each vehicle key.               */
+#/*******************************************************************/
+	def ReadCapabilities(self):
+		Result = {}
+
+		try:
+			if os.path.isfile(CAPABILITY_CACHE_FILE):
+				File = open(CAPABILITY_CACHE_FILE, 'r')
+				for TextLine in File:
+					TextElements = TextLine.replace("\n", "").split('|')
+					if len(TextElements) >= 2:
+						Capabilities = {}
+						for TextElement in TextElements[2:]:
+							Request, Data = TextElement.partition("=")[::2]
+							Capabilities[Request] = Data
+						Result["|".join(TextElements[:2])] = Capabilities
+				File.close()
+		except Exception as Catch:
+			print(STRING_ERROR + " " + CAPABILITY_CACHE_FILE + " : " + str(Catch))
+
+		return Result
+
+
+
+#/**********************************************************************/
+#/* Load the supported PID responses stored for the connected vehicle. */
+#/* Mode 01 PID 00 is requested, and the stored responses of the last  */
+#/* vehicle stored with the same Mode 01 PID 00 response are used,     */
+#/* with it's VIN and calibration ID, without any other requests.      */
+#/* Otherwise the VIN and calibration ID are only requested when the   */
+#/* Mode 09 supported PIDs show they are supported, any responses      */
+#/* stored for the vehicle are discarded and the supported PIDs are    */
+#/* requested from the ECU again. A vehicle without a VIN is           */
+#/* identified by the protocol and the Mode 01 PID 00 response.        */
+#/**********************************************************************/
+	def LoadCapabilities(self):
+		self.Capabilities = {}
+		self.CapabilitiesChanged = False
+		self.VehicleKey = ""
+		self.Vin = ""
+		self.CalibrationId = ""
+
+		Support = self.RequestSupportResponse(b'0100\r')
+		if Support is not None and Support != "":
+			StoredCapabilities = self.ReadCapabilities()
+			for VehicleKey in StoredCapabilities:
+				if StoredCapabilities[VehicleKey].get("0100") == Support:
+					self.VehicleKey = VehicleKey
+
+			if self.VehicleKey != "":
+				for KeyElement in self.VehicleKey.split('|'):
+					Name, Value = KeyElement.partition("=")[::2]
+					if Name == "VIN":
+						self.Vin = Value
+					elif Name == "CALID":
+						self.CalibrationId = Value
+				for Request in StoredCapabilities[self.VehicleKey]:
+					# Freeze frame supported PIDs change, so are not kept.
+					if Request[:2] != '02':
+						self.Capabilities[Request] = StoredCapabilities[self.VehicleKey][Request]
+			else:
+				self.Capabilities["0100"] = Support
+				self.CapabilitiesChanged = True
+				# Mode 09 PID 02 is the VIN, Mode 09 PID 04 is the calibration ID.
+				Mode09Bitmap = 0
+				for Bitmap in self.GetSupportBitmaps(self.GetSupportResponse(b'0900\r'), self.GetMode09ByteCount()):
+					Mode09Bitmap |= Bitmap
+				if (Mode09Bitmap & 0x40000000) != 0:
+					self.Vin = self.GetVehicleId(b'0902\r')
+				if self.Vin != "" and (Mode09Bitmap & 0x10000000) != 0:
+					self.CalibrationId = self.GetVehicleId(b'0904\r')
+				if self.Vin != "":
+					self.VehicleKey = "VIN=" + self.Vin + "|CALID=" + self.CalibrationId
+				else:
+					self.VehicleKey = "PROTOCOL=" + self.Protocol + "|SUPPORT=" + Support
+
+
+
+#/*******************************************************************/
+#/* Save the supported PID responses for the connected vehicle when */
+#/* any have been requested from the ECU since they were loaded.    */
+#/* A NO DATA response is saved, as no supported PIDs. Failed       */
+#/* requests are not saved, so they are requested again on the next */
+#/* connection.                                                     */
+#/*******************************************************************/
+	def SaveCapabilities(self):
+		if self.CapabilitiesChanged == True and self.VehicleKey != "":
+			try:
+				StoredCapabilities = self.ReadCapabilities()
+				StoredCapabilities.pop(self.VehicleKey, None)
+				StoredCapabilities[self.VehicleKey] = self.Capabilities
+				File = open(CAPABILITY_CACHE_FILE, 'w')
+				for VehicleKey in StoredCapabilities:
+					TextLine = VehicleKey
+					for Request in StoredCapabilities[VehicleKey]:
+						if StoredCapabilities[VehicleKey][Request] is not None:
+							TextLine += "|" + Request + "=" + StoredCapabilities[VehicleKey][Request]
+					File.write(TextLine + "\n")
+				File.close()
+				self.CapabilitiesChanged = False
+			except Exception as Catch:
+				print(STRING_ERROR + " " + CAPABILITY_CACHE_FILE + " : " + str(Catch))
+
+
+
+#/*******************************************************************/
+#/* Get a supported PIDs response, from the responses already known */
+#/* for the connected vehicle, otherwise from the ECU. A failed     */
+#/* request is remembered until the next connection, but is not     */
+#/* stored.                                                         */
+#/*******************************************************************/
+	def GetSupportResponse(self, Data):
+		Request = str(bytes(Data[:-1]), 'utf-8')
+		if Request not in self.Capabilities:
+			self.Capabilities[Request] = self.RequestSupportResponse(Data)
+			self.CapabilitiesChanged = True
+
+		Result = ""
+		if self.Capabilities[Request] is not None and self.Capabilities[Request] != "":
+			Result = self.Capabilities[Request].replace(',', '\n') + '\n'
+
+		return Result
+
+
+
+#/*******************************************************************/
+#/* Return a list of PIDs the currently connected ECU supports, or  */
+#/* the PIDs a freeze frame supports. The PIDs a freeze frame       */
+#/* supports are only requested from the ECU the first time, or     */
+#/* when a refresh is requested, and are kept until the next        */
+#/* connection, or until the trouble codes are cleared.             */
+#/*******************************************************************/
+	def GetValidPIDs(self, FreezeIndex = -1, Refresh = False):
 		Result = self.ValidPIDs
 
 		if FreezeIndex != -1:
-			# Get Mode 02 PID support [01 -> 20].
-			self.PID0200(FreezeIndex)
-			# If Mode 02 PID 20 is supported, get Mode 02 PID support [21 -> 40].
-			if '0120' in self.ValidFreezePIDs:
-				self.PID0220(FreezeIndex)
-			# If Mode 02 PID 40 is supported, get Mode 02 PID support [41 -> 60].
-			if '0140' in self.ValidFreezePIDs:
-				self.PID0240(FreezeIndex)
-			# If Mode 02 PID 60 is supported, get Mode 02 PID support [61 -> 80].
-			if '0160' in self.ValidFreezePIDs:
-				self.PID0260(FreezeIndex)
-			# If Mode 02 PID 80 is supported, get Mode 02 PID support [81 -> A0].
-			if '0180' in self.ValidFreezePIDs:
-				self.PID0280(FreezeIndex)
-			# If Mode 02 PID A0 is supported, get Mode 02 PID support [A1 -> C0].
-			if '01A0' in self.ValidFreezePIDs:
-				self.PID02A0(FreezeIndex)
-			# If Mode 02 PID C0 is supported, get Mode 02 PID support [C1 -> E0].
-			if '01C0' in self.ValidFreezePIDs:
-				self.PID02C0(FreezeIndex)
-			Result = self.ValidFreezePIDs
+			if Refresh == True or FreezeIndex not in self.FreezeSupport:
+				self.LoadFreezeSupport(FreezeIndex)
+			Result = self.FreezeSupport[FreezeIndex]
 
 		return Result
 
 
 
+#/********************************************************************/
+#/* Request the PIDs a freeze frame supports from the ECU, replacing */
+#/* any PIDs previously found for the freeze frame.                  */
+#/********************************************************************/
+	def LoadFreezeSupport(self, FreezeIndex):
+		ThisFreezeIndex = "{:02d}".format(FreezeIndex)
+		self.RemoveFreezeSupport(FreezeIndex)
+
+		# Get Mode 02 PID support [01 -> 20].
+		self.PID0200(FreezeIndex)
+		# If Mode 02 PID 20 is supported, get Mode 02 PID support [21 -> 40].
+		if '0220' + ThisFreezeIndex in self.ValidFreezePIDs:
+			self.PID0220(FreezeIndex)
+		# If Mode 02 PID 40 is supported, get Mode 02 PID support [41 -> 60].
+		if '0240' + ThisFreezeIndex in self.ValidFreezePIDs:
+			self.PID0240(FreezeIndex)
+		# If Mode 02 PID 60 is supported, get Mode 02 PID support [61 -> 80].
+		if '0260' + ThisFreezeIndex in self.ValidFreezePIDs:
+			self.PID0260(FreezeIndex)
+		# If Mode 02 PID 80 is supported, get Mode 02 PID support [81 -> A0].
+		if '0280' + ThisFreezeIndex in self.ValidFreezePIDs:
+			self.PID0280(FreezeIndex)
+		# If Mode 02 PID A0 is supported, get Mode 02 PID support [A1 -> C0].
+		if '02A0' + ThisFreezeIndex in self.ValidFreezePIDs:
+			self.PID02A0(FreezeIndex)
+		# If Mode 02 PID C0 is supported, get Mode 02 PID support [C1 -> E0].
+		if '02C0' + ThisFreezeIndex in self.ValidFreezePIDs:
+			self.PID02C0(FreezeIndex)
+
+		self.KeepFreezeSupport(FreezeIndex)
+
+
+
+#/******************************************************************/
+#/* Forget the supported PIDs previously found for a freeze frame. */
+#/******************************************************************/
+	def RemoveFreezeSupport(self, FreezeIndex):
+		ThisFreezeIndex = "{:02d}".format(FreezeIndex)
+		for PID in list(self.ValidFreezePIDs):
+			if PID[4:] == ThisFreezeIndex:
+				del self.ValidFreezePIDs[PID]
+
+
+
+#/*******************************************************************/
+#/* Keep the supported PIDs found for a freeze frame, until the     */
+#/* next connection, or until the trouble codes are cleared.        */
+#/*******************************************************************/
+	def KeepFreezeSupport(self, FreezeIndex):
+		ThisFreezeIndex = "{:02d}".format(FreezeIndex)
+		self.FreezeSupport[FreezeIndex] = {}
+		for PID in self.ValidFreezePIDs:
+			if PID[4:] == ThisFreezeIndex:
+				self.FreezeSupport[FreezeIndex][PID] = self.ValidFreezePIDs[PID]
+
+
+
+#/*******************************************************************/
+#/* Forget the PIDs supported by each freeze frame, when the freeze */
+#/* frames may have changed.                                        */
+#/*******************************************************************/
+	def ClearFreezeSupport(self):
+		self.ValidFreezePIDs = {}
+		self.FreezeSupport = {}
+
+
+
 #/**********************************************************************/
 #/* Get and return the information for the specified PID from the ECU. */
+#/* The times the PID was requested and the response received are      */
+#/* kept, see GetPidTimes.                                             */
 #/**********************************************************************/
 	def DoPID(self, PID, FreezeIndex = -1):
+		self.RequestSendTime = 0
+		self.RequestReceiveTime = 0
 		try:
 			if PID in PidFunctions:
 				Result = PidFunctions[PID](self, FreezeIndex)
@@ -479,822 +1121,863 @@ class ELM327:
 		except Exception as Catch:
 			print(STRING_ERROR + " in PID" + str(PID) + " : " + str(Catch))
 			Result = STRING_ERROR
+		self.PidTimes[PID] = (self.RequestSendTime, self.RequestReceiveTime)
 
 		return Result
 
 
 
-#/*************************************************/
-#/* Talk to the ELM327 device over a serial port. */
-#/* Send request data, and wait for the response. */
-#/* The expected response ends with a prompt      */
-#/* character '>', the ELM327 provides promting   */
-#/* for more user requests.                       */
-#/* Otherwise a timeout occurs waiting for a      */
-#/* response.                                     */
-#/*************************************************/
-	def GetResponse(self, Data):
-		Data = Data.replace(b'\r', SERIAL_LINEFEED_TYPE)
+#/******************************************************************/
+#/* Return the monotonic times, in seconds, the last data returned */
+#/* for a PID was requested and the response was received, as a    */
+#/* tuple (SendTime, ReceiveTime). For a PID which needs more than */
+#/* one request, the times are from the first request sent and the */
+#/* last response received. The times are zero when no request was */
+#/* sent.                                                          */
+#/******************************************************************/
+	def GetPidTimes(self, PID):
+		return self.PidTimes.get(PID, (0, 0))
 
-		if DEBUG == "ON":
-			print("DEBUG SENDING [" + str(len(Data)) + "] " + str(Data))
 
-		self.ELM327.write(Data)
-		Response = ""
-		ReadChar = 1
-		while ReadChar != b'>' and ReadChar != b'' and ReadChar != 0:
-			ReadChar = self.ELM327.read()
-			if ReadChar[0] > 127:
-				if DEBUG == "ON":
-					print("REJECTING RECEIVED CHARACTER: " + str(int(ReadChar[0])))
-			elif ReadChar != b'>':
-				Response += str(ReadChar, 'utf-8')
-		Result = Response.replace('\r', '\n').replace('\n\n', '\n').replace('NO DATA', '00000000000000')
-		if Result[-1:] != '\n':
-			Result += '\n'
 
-		if DEBUG == "ON":
-			print("DEBUG RECEIVED [" + str(len(Result)) + "] " + str(Result))
+#/*******************************************************************/
+#/* Get and return the information for a list of PIDs from the ECU. */
+#/* On a CAN BUS up to six Mode 01 PIDs are requested at a time and */
+#/* the combined response is split back into single PID responses,  */
+#/* which are then decoded by the PID functions. Any other PIDs, or */
+#/* PIDs on other protocols, are requested one at a time.           */
+#/*******************************************************************/
+	def DoPIDs(self, PIDs):
+		Result = {}
+
+		try:
+			# Request each batch of PIDs, storing the split responses for the PID functions.
+			for BatchPIDs in self.GetBatches(PIDs):
+				self.RequestPIDs(BatchPIDs)
+			# Decode each PID, any PID missing from a batch response is requested on it's own.
+			for PID in PIDs:
+				if PID not in Result:
+					Result[PID] = self.DoPID(PID)
+		finally:
+			self.PendingResponses = {}
+			self.PendingTimes = {}
 
 		return Result
 
 
 
-#/*****************************************************************/
-#/* Resolve a bitmaped supported PIDs response from the ECU and   */
-#/* add them to the list of currently supported PIDs for the ECU. */
-#/*****************************************************************/
-	def ResolvePidData(self, PidMode, PidData, PidStart, PidDescriptions, FreezeIndex = -1):
-		PidStartValue = int(PidStart, 16)
-		PidValue = int(PidData, 16)
-		Count = PidStartValue + (len(PidData) * 4)
-		while PidValue > 0:
-			if PidValue % 2 > 0:
-				PidIndex = '%2.2X' % Count
-				if PidMode == '02':
-					ThisFreezeIndex = "{:02d}".format(FreezeIndex)
-					if PidIndex in PidDescriptions:
-						self.ValidFreezePIDs[PidMode + PidIndex + ThisFreezeIndex] = PidDescriptions[PidIndex]
-					else:
-						self.ValidFreezePIDs[PidMode + PidIndex + ThisFreezeIndex] = STRING_NO_DESCRIPTION
-				else:
-					if PidIndex in PidDescriptions:
-						self.ValidPIDs[PidMode + PidIndex] = PidDescriptions[PidIndex]
-					else:
-						self.ValidPIDs[PidMode + PidIndex] = STRING_NO_DESCRIPTION
-			PidValue = int(PidValue / 2)
-			Count -= 1
+#/*******************************************************************/
+#/* Group the PIDs which can be requested together, into batches of */
+#/* Mode 01 PIDs, only on a CAN BUS. Only batches of more than one  */
+#/* PID are returned.                                               */
+#/*******************************************************************/
+	def GetBatches(self, PIDs):
+		Result = []
+
+		BatchPIDs = []
+		if self.CanBus == True:
+			for PID in PIDs:
+				if PID[:2] == '01' and PID in PidDataLength and PID in self.ValidPIDs and PID not in BatchPIDs:
+					BatchPIDs.append(PID)
+		for Index in range(0, len(BatchPIDs), MAX_PIDS_PER_REQUEST):
+			if len(BatchPIDs[Index:Index + MAX_PIDS_PER_REQUEST]) > 1:
+				Result.append(BatchPIDs[Index:Index + MAX_PIDS_PER_REQUEST])
+
+		return Result
 
 
 
 #/**********************************************************/
-#/* Convert pairs of data bytes into actual trouble codes, */
-#/* translating the first digit as required, and ignoring  */
-#/* zero value data.                                       */
+#/* Return the single Mode 01 request for a batch of PIDs. */
 #/**********************************************************/
-	def DataToTroubleCodes(self, Data):
-		TroubleCodes = list()
-		while len(Data) > 0:
-			ThisCode = Data[:4]
-			if int(ThisCode) != 0:
-				TroubleCodes.append(self.TroubleCodePrefix[ThisCode[0]] + ThisCode[1:])
-			Data = Data[4:]
-		return TroubleCodes
+	def GetBatchRequest(self, PIDs):
+		Request = "01"
+		for PID in PIDs:
+			Request += PID[2:]
 
+		return bytearray(Request + "\r", 'UTF-8')
 
 
-#/*****************************************************/
-#/* Get the trouble codes from the ECU and lookup the */
-#/* trouble code descriptions. Return the data in a   */
-#/* data array.                                       */
-#/*****************************************************/
-	def GetTroubleCodeData(self, OBDIImode):
-		TroubleCodeData = {}
-		Response = self.GetResponse(OBDIImode + b'\r')
-		Response = self.PruneData(Response, 1)
-		TroubleCodes = self.DataToTroubleCodes(Response)
-		for TroubleCode in TroubleCodes:
-			if TroubleCode in self.TroubleCodeDescriptions:
-				TroubleCodeData[TroubleCode] = self.TroubleCodeDescriptions[TroubleCode]
-			else:
-				TroubleCodeData[TroubleCode] = STRING_NO_DESCRIPTION
-		return TroubleCodeData
 
+#/*******************************************************************/
+#/* Split the response to a batch of PIDs into the response frames  */
+#/* each PID would have given if requested on it's own, keyed by    */
+#/* the request for each PID, ready for the PID functions. Freeze   */
+#/* frame PIDs are requested with the freeze frame number.          */
+#/*******************************************************************/
+	def GetBatchResponses(self, Response, FreezeIndex = -1):
+		Result = {}
 
+		if FreezeIndex == -1:
+			Mode = '01'
+			ThisFreezeIndex = ""
+		else:
+			Mode = '02'
+			ThisFreezeIndex = "{:02d}".format(FreezeIndex)
+		PidData = self.SplitPidData(Response, Mode, FreezeIndex)
+		for PID in PidData:
+			Result[bytes(PID + ThisFreezeIndex + "\r", 'UTF-8')] = [(0, 0x40 + int(Mode, 16), int(PID[2:], 16), PidData[PID])]
 
-#/*******************************************************/
-#/* The OBDII protocol will sometimes prefix a response */
-#/* with confirmation of the request sent or other      */
-#/* unwanted bytes of data. Use this function to remove */
-#/* unwanted bytes from the start of lines, and         */
-#/* concatenate the remainder of the response into a    */
-#/* single line of data, ready for processing.          */
-#/*******************************************************/
-	def PruneData(self, Data, RemoveByteCount):
-		Response = ""
-		for Line in Data.split('\n'):
-			Response += Line[2 * RemoveByteCount:]
-		return Response
+		return Result
 
 
-#/**************************************/
-#/* ODBII MODE 01 - Show current data. */
-#/**************************************/
 
-# PID0100 Supported PIDs for Mode 1 [01 -> 20].
-	def PID0100(self, FreezeIndex = -1):
-		Response = self.GetResponse(b'0100\r')
-		Response = self.PruneData(Response, 2)
-		self.ResolvePidData('01', Response, '00', self.PidDescriptionsMode01)
-	PidFunctions["0100"] = PID0100
+#/****************************************************************/
+#/* Send a single Mode 01 request for a batch of PIDs. Split the */
+#/* response into the response each PID would have given if      */
+#/* requested on it's own, ready for the PID functions.          */
+#/****************************************************************/
+	def RequestPIDs(self, PIDs):
+		try:
+			Response = self.GetResponse(self.GetBatchRequest(PIDs))
+			BatchResponses = self.GetBatchResponses(Response)
+			self.PendingResponses.update(BatchResponses)
+			# Each PID in the batch was requested and received at the same time.
+			for Request in BatchResponses:
+				self.PendingTimes[Request] = self.ResponseTimes
+		except Exception as Catch:
+			print(STRING_ERROR + " in PIDs " + str(PIDs) + " : " + str(Catch))
 
 
-# PID0101 Get Monitor status since DTCs cleared from the ECU.
-	def PID0101(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
-		ResultArray = ()
 
-		if '0101' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'0101\r')
-				Response = self.PruneData(Response, 2)
-			else:
-				Response = self.GetResponse(bytearray("0201" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
+#/*******************************************************************/
+#/* Read a freeze frame from the ECU, returning a snapshot of the   */
+#/* value of each PID the freeze frame supports. On a CAN BUS the   */
+#/* PIDs are requested a few at a time, each with the freeze frame  */
+#/* number, otherwise one at a time. The supported PIDs are only    */
+#/* requested from the ECU again when refreshed, see GetValidPIDs.  */
+#/*******************************************************************/
+	def ReadFreezeFrame(self, FreezeIndex, Refresh = False):
+		Result = FreezeFrame.FreezeFrame(FreezeIndex)
+
+		ValidPIDs = self.GetValidPIDs(FreezeIndex, Refresh)
+		PIDs = self.GetFreezeFramePIDs(ValidPIDs)
+		try:
+			# Request each batch of PIDs, storing the split responses for the PID functions.
+			for BatchPIDs in self.GetFreezeBatches(PIDs):
+				try:
+					Response = self.GetResponse(self.GetFreezeBatchRequest(BatchPIDs))
+					self.PendingResponses.update(self.GetBatchResponses(Response, FreezeIndex))
+				except Exception as Catch:
+					print(STRING_ERROR + " in PIDs " + str(BatchPIDs) + " : " + str(Catch))
+			# Decode each PID, any PID missing from a batch response is requested on it's own.
+			for PID in PIDs:
+				Result.SetValue(PID, ValidPIDs[PID], self.DoPID(PID[:4], FreezeIndex))
+		finally:
+			self.PendingResponses = {}
+			self.PendingTimes = {}
+
+		return Result
 
-			ResultVal1 = int(Response[:2], 16)
-			if (ResultVal1 & 0x80) != 0:
-				self.MilOn = True
-				ResultArray += ("MIL:ON",)
-			else:
-				self.MilOn = False
-				ResultArray += ("MIL:OFF",)
-			self.FreezeFrameCount = ResultVal1 & 0x7F
-			ResultArray += ("STORED TROUBLE CODE COUNT|" + str(self.FreezeFrameCount),)
-
-			ResultVal1 = int(Response[2:4], 16)
-
-			AppendText = ""
-			if (ResultVal1 & 0x01) != 0:
-				AppendText = "MISSFIRE TEST"
-				if (ResultVal1 & 0x10) != 0:
-					AppendText += "|[INCOMPLETE]"
-			ResultArray += (AppendText,)
-
-			AppendText = ""
-			if (ResultVal1 & 0x02) != 0:
-				AppendText = "FUEL SYSTEM TEST"
-				if (ResultVal1 & 0x20) != 0:
-					AppendText += "|[INCOMPLETE]"
-			ResultArray += (AppendText,)
-
-			AppendText = ""
-			if (ResultVal1 & 0x04) != 0:
-				AppendText = "COMPONENTS TEST"
-				if (ResultVal1 & 0x40) != 0:
-					AppendText += "|[INCOMPLETE]"
-			ResultArray += (AppendText,)
-
-			if (ResultVal1 & 0x08) != 0:
-				ResultArray += ("IGNITION|COMPRESSION",)
-
-				ResultVal1 = int(Response[4:6], 16)
-				ResultVal2 = int(Response[6:8], 16)
-
-				AppendText = ""
-				if (ResultVal1 & 0x01) != 0:
-					AppendText = "NMHC CATALYST TEST"
-					if (ResultVal2 & 0x01) != 0:
-						AppendText += "|[INCOMPLETE]"
-				ResultArray += (AppendText,)
-
-				AppendText = ""
-				if (ResultVal1 & 0x02) != 0:
-					AppendText = "NOx/SCR MONITOR TEST"
-					if (ResultVal2 & 0x02) != 0:
-						AppendText += "|[INCOMPLETE]"
-				ResultArray += (AppendText,)
-
-				AppendText = ""
-				if (ResultVal1 & 0x04) != 0:
-					AppendText = "Reserved 1 TEST"
-					if (ResultVal2 & 0x04) != 0:
-						AppendText += "|[INCOMPLETE]"
-				ResultArray += (AppendText,)
-
-				AppendText = ""
-				if (ResultVal1 & 0x08) != 0:
-					AppendText = "BOOST PRESSURE TEST"
-					if (ResultVal2 & 0x08) != 0:
-						AppendText += "|[INCOMPLETE]"
-				ResultArray += (AppendText,)
-
-				AppendText = ""
-				if (ResultVal1 & 0x10) != 0:
-					AppendText = "Reserved 2 TEST"
-					if (ResultVal2 & 0x10) != 0:
-						AppendText += "|[INCOMPLETE]"
-				ResultArray += (AppendText,)
-
-				AppendText = ""
-				if (ResultVal1 & 0x20) != 0:
-					AppendText = "EXHAUST GAS SENSOR TEST"
-					if (ResultVal2 & 0x20) != 0:
-						AppendText += "|[INCOMPLETE]"
-				ResultArray += (AppendText,)
-
-				AppendText = ""
-				if (ResultVal1 & 0x40) != 0:
-					AppendText = "PM FILTER MONITORING TEST"
-					if (ResultVal2 & 0x40) != 0:
-						AppendText += "|[INCOMPLETE]"
-				ResultArray += (AppendText,)
-
-				AppendText = ""
-				if (ResultVal1 & 0x80) != 0:
-					AppendText = "EGR/VVT SYSTEM TEST"
-					if (ResultVal2 & 0x80) != 0:
-						AppendText += "|[INCOMPLETE]"
-				ResultArray += (AppendText,)
-			else:
-				ResultArray += ("IGNITION|SPARK",)
-
-				ResultVal1 = int(Response[4:6], 16)
-				ResultVal2 = int(Response[6:8], 16)
-
-				AppendText = ""
-				if (ResultVal1 & 0x01) != 0:
-					AppendText = "CATALYST TEST"
-					if (ResultVal2 & 0x01) != 0:
-						AppendText += "|[INCOMPLETE]"
-				ResultArray += (AppendText,)
-
-				AppendText = ""
-				if (ResultVal1 & 0x02) != 0:
-					AppendText = "HEATED CATALYST TEST"
-					if (ResultVal2 & 0x02) != 0:
-						AppendText += "|[INCOMPLETE]"
-				ResultArray += (AppendText,)
-
-				AppendText = ""
-				if (ResultVal1 & 0x04) != 0:
-					AppendText = "EVAPORATIVE SYSTEM TEST"
-					if (ResultVal2 & 0x04) != 0:
-						AppendText += "|[INCOMPLETE]"
-				ResultArray += (AppendText,)
-
-				AppendText = ""
-				if (ResultVal1 & 0x08) != 0:
-					AppendText = "SECONDARY AIR SYSTEM TEST"
-					if (ResultVal2 & 0x08) != 0:
-						AppendText += "|[INCOMPLETE]"
-				ResultArray += (AppendText,)
-
-				AppendText = ""
-				if (ResultVal1 & 0x10) != 0:
-					AppendText = "A/C REFRIGERANT TEST"
-					if (ResultVal2 & 0x10) != 0:
-						AppendText += "|[INCOMPLETE]"
-				ResultArray += (AppendText,)
-
-				AppendText = ""
-				if (ResultVal1 & 0x20) != 0:
-					AppendText = "OXYGEN SENSOR TEST"
-					if (ResultVal2 & 0x20) != 0:
-						AppendText += "|[INCOMPLETE]"
-				ResultArray += (AppendText,)
-
-				AppendText = ""
-				if (ResultVal1 & 0x40) != 0:
-					AppendText = "OXYGEN SENSOR HEATER TEST"
-					if (ResultVal2 & 0x40) != 0:
-						AppendText += "|[INCOMPLETE]"
-				ResultArray += (AppendText,)
-
-				AppendText = ""
-				if (ResultVal1 & 0x80) != 0:
-					AppendText = "EGR SYSTEM TEST"
-					if (ResultVal2 & 0x80) != 0:
-						AppendText += "|[INCOMPLETE]"
-				ResultArray += (AppendText,)
 
-			Result = ResultArray
+
+#/*******************************************************************/
+#/* Return the PIDs of a freeze frame's supported PIDs which are    */
+#/* freeze frame data, without the supported PID ranges.            */
+#/*******************************************************************/
+	def GetFreezeFramePIDs(self, ValidPIDs):
+		Result = []
+
+		for PID in sorted(ValidPIDs):
+			if int(PID[2:4], 16) % 0x20 != 0:
+				Result.append(PID)
 
 		return Result
-	PidFunctions["0101"] = PID0101
-	PidFunctions["0201"] = PID0101
 
 
-# PID0102 Freeze DTC.
-	def PID0102(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
 
-		if FreezeIndex == -1:
-			Response = self.GetResponse(b'0102\r')
-			Response = self.PruneData(Response, 2)
-		else:
-			Response = self.GetResponse(bytearray("0202" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-			Response = self.PruneData(Response, 3)
+#/*******************************************************************/
+#/* Group the freeze frame PIDs which can be requested together,    */
+#/* into batches, only on a CAN BUS. Only batches of more than one  */
+#/* PID are returned.                                               */
+#/*******************************************************************/
+	def GetFreezeBatches(self, PIDs):
+		Result = []
+
+		BatchPIDs = []
+		if self.CanBus == True:
+			for PID in PIDs:
+				if '01' + PID[2:4] in PidDataLength and PID not in BatchPIDs:
+					BatchPIDs.append(PID)
+		for Index in range(0, len(BatchPIDs), MAX_FREEZE_PIDS_PER_REQUEST):
+			if len(BatchPIDs[Index:Index + MAX_FREEZE_PIDS_PER_REQUEST]) > 1:
+				Result.append(BatchPIDs[Index:Index + MAX_FREEZE_PIDS_PER_REQUEST])
 
-		TroubleCodes = self.DataToTroubleCodes(Response)
-		if TroubleCodes[0] in self.TroubleCodeDescriptions:
-			Result = TroubleCodes[0] + " " + self.TroubleCodeDescriptions[TroubleCodes[0]]
-		else:
-			Result = STRING_NO_DESCRIPTION
+		return Result
+
+
+
+#/****************************************************************/
+#/* Return the single Mode 02 request for a batch of freeze      */
+#/* frame PIDs, each followed by it's freeze frame number.       */
+#/****************************************************************/
+	def GetFreezeBatchRequest(self, PIDs):
+		Request = "02"
+		for PID in PIDs:
+			Request += PID[2:]
+
+		return bytearray(Request + "\r", 'UTF-8')
+
+
+
+#/*******************************************************************/
+#/* Split a multiple PID Mode 01 or Mode 02 response into the data  */
+#/* bytes for each PID. Each message in the response is split using */
+#/* the known data length of each PID. The data of a Mode 02 PID    */
+#/* starts with the freeze frame number, a message is only split up */
+#/* to any PID which is not for the requested freeze frame, as the  */
+#/* rest of the message can not be split reliably.                  */
+#/*******************************************************************/
+	def SplitPidData(self, Data, Mode = '01', FreezeIndex = -1):
+		Result = {}
+
+		Service = 0x40 + int(Mode, 16)
+		FrameByteCount = 0
+		if Mode == '02':
+			FrameByteCount = 1
+			# The freeze frame number, as it is sent in the request.
+			FrameNumber = int("{:02d}".format(FreezeIndex), 16)
+		for Ecu, FrameService, PidByte, Payload in self.ParseResponse(Data):
+			if FrameService == Service:
+				# The first PID byte is already split from the message.
+				Offset = -1
+				while PidByte is not None:
+					PID = Mode + '%2.2X' % PidByte
+					if '01' + PID[2:] not in PidDataLength:
+						break
+					End = Offset + 1 + FrameByteCount + PidDataLength['01' + PID[2:]]
+					if End > len(Payload):
+						break
+					if Mode == '02' and Payload[Offset + 1] != FrameNumber:
+						break
+					if PID not in Result:
+						Result[PID] = Payload[Offset + 1:End]
+					Offset = End
+					PidByte = None
+					if Offset < len(Payload):
+						PidByte = Payload[Offset]
 
 		return Result
-	PidFunctions["0102"] = PID0102
-	PidFunctions["0202"] = PID0102
 
 
-# PID0103 Get the Fuel system status from the ECU.
-	def PID0103(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
-		ResultArray = ()
 
-		if '0103' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'0103\r')
-				Response = self.PruneData(Response, 2)
-			else:
-				Response = self.GetResponse(bytearray("0203" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
-			if Response[:2] in self.FuelSystemStatus:
-				ResultArray += ("Fuel System 1",)
-				ResultArray += (self.FuelSystemStatus[Response[:2]],)
-			else:
-				ResultArray += ("Fuel System 1",)
-				ResultArray += (STRING_INVALID,)
-			if Response[2:4] in self.FuelSystemStatus:
-				ResultArray += ("Fuel System 2",)
-				ResultArray += (self.FuelSystemStatus[Response[2:4]],)
-			else:
-				ResultArray += ("Fuel System 2",)
-				ResultArray += (STRING_INVALID,)
+#/*******************************************************************/
+#/* Parse a response into it's messages, joining the frames of each */
+#/* multiple frame CAN message. The hex text of all of the messages */
+#/* is converted into bytes at once, and each message is returned   */
+#/* as a tuple (Ecu, Service, PID, Payload), where Payload is a     */
+#/* memoryview of the bytes after the service and PID bytes, and    */
+#/* PID is None for services without a PID. Headers are off, so the */
+#/* ECU is the count of earlier messages for the same service and   */
+#/* PID, which is one message for each ECU other than for the       */
+#/* multiple message data of non CAN protocols. Status lines, such  */
+#/* as NO DATA, are not messages, so no frames are returned for a   */
+#/* missing response, see self.NoData.                              */
+#/*******************************************************************/
+	def ParseResponse(self, Response):
+		Result = []
+
+		# Find the hex text of each message, joining the frames of multiple frame messages.
+		Texts = []
+		Lengths = []
+		for Line in Response.replace(' ', '').split('\n'):
+			if len(Line) == 3 and self.IsHexData(Line):
+				# Multiple frame message, starting with the message byte count.
+				Texts.append([])
+				Lengths.append(int(Line, 16))
+			elif len(Line) > 2 and Line[1] == ':' and len(Texts) > 0 and Lengths[-1] > 0:
+				# Frame of a multiple frame message.
+				Texts[-1].append(Line[2:])
+			elif len(Line) % 2 == 0 and self.IsHexData(Line):
+				# Single frame message.
+				Texts.append([Line])
+				Lengths.append(0)
+		for Index in range(len(Texts)):
+			Texts[Index] = "".join(Texts[Index])
+			if Lengths[Index] > 0:
+				Texts[Index] = Texts[Index][:2 * Lengths[Index]]
+			if len(Texts[Index]) % 2 != 0 or self.IsHexData(Texts[Index]) == False:
+				Texts[Index] = ""
+
+		# Convert all of the messages to bytes at once, then split the bytes into messages.
+		with memoryview(bytes.fromhex("".join(Texts))) as Data:
+			Ecus = {}
+			Offset = 0
+			for Text in Texts:
+				End = Offset + len(Text) // 2
+				if End > Offset:
+					Service = Data[Offset]
+					if Service in SERVICES_WITHOUT_PID or End == Offset + 1:
+						PidByte = None
+						Payload = Data[Offset + 1:End]
+					else:
+						PidByte = Data[Offset + 1]
+						Payload = Data[Offset + 2:End]
+					Ecu = Ecus.get((Service, PidByte), 0)
+					Ecus[(Service, PidByte)] = Ecu + 1
+					Result.append((Ecu, Service, PidByte, Payload))
+				Offset = End
+
+		return Result
+
 
-			Result = ResultArray
+
+#/*******************************************************************/
+#/* Get the response frames for a request, from a response already  */
+#/* received as part of a multiple PID request, otherwise from the  */
+#/* ELM327 device, see ParseResponse.                               */
+#/*******************************************************************/
+	def GetFrames(self, Data):
+		if bytes(Data) in self.PendingResponses:
+			self.SetRequestTimes(*self.PendingTimes.get(bytes(Data), (0, 0)))
+			Result = self.PendingResponses[bytes(Data)]
+		else:
+			Result = self.ParseResponse(self.GetResponse(Data))
 
 		return Result
-	PidFunctions["0103"] = PID0103
-	PidFunctions["0203"] = PID0103
 
 
-# PID0104 Get the current Calculated Engine Load from the ECU.
-	def PID0104(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
 
-		if '0104' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'0104\r')
-				Response = self.PruneData(Response, 2)
-			else:
-				Response = self.GetResponse(bytearray("0204" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
-			Result = 100 * int(Response, 16) / 255
+#/*******************************************************************/
+#/* Return the payload of the response frames for a service and PID */
+#/* after removing the specified number of bytes from each frame,   */
+#/* such as the freeze frame number or the message number. The      */
+#/* payload of the first ECU to respond is returned, or the payload */
+#/* of all of the frames joined when Join is True. Return None when */
+#/* there is no response for the service and PID.                   */
+#/*******************************************************************/
+	def GetPayload(self, Frames, Service, PidByte, RemoveByteCount = 0, Join = False):
+		Result = None
+
+		Payloads = []
+		for Ecu, FrameService, FramePidByte, Payload in Frames:
+			if FrameService == Service and FramePidByte == PidByte:
+				Payloads.append(Payload[RemoveByteCount:])
+				if Join == False:
+					break
+		if len(Payloads) == 1:
+			Result = Payloads[0]
+		elif len(Payloads) > 1:
+			Result = b''.join(Payloads)
 
 		return Result
-	PidFunctions["0104"] = PID0104
-	PidFunctions["0204"] = PID0104
 
 
 
-# PID0105 Get the current Engine Coolant Temperature from the ECU.
-	def PID0105(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
+#/*********************************************************/
+#/* Check a line of response text is entirely hex digits. */
+#/*********************************************************/
+	def IsHexData(self, Data):
+		Result = False
 
-		if '0105' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'0105\r')
-				Response = self.PruneData(Response, 2)
-			else:
-				Response = self.GetResponse(bytearray("0205" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
-			Result = int(Response, 16) - 40
+		if len(Data) > 0:
+			try:
+				int(Data, 16)
+				Result = True
+			except:
+				Result = False
 
 		return Result
-	PidFunctions["0105"] = PID0105
-	PidFunctions["0205"] = PID0105
 
 
-# PID0106 Get the current Short Term Fuel Trim Bank1 from the ECU.
-	def PID0106(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
 
-		if '0106' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'0106\r')
-				Response = self.PruneData(Response, 2)
-			else:
-				Response = self.GetResponse(bytearray("0206" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
-			Result = (100 * int(Response, 16) / 128) - 100
+#/*************************************************/
+#/* Talk to the ELM327 device over a serial port. */
+#/* Send request data, and wait for the response. */
+#/* The expected response ends with a prompt      */
+#/* character '>', the ELM327 provides promting   */
+#/* for more user requests.                       */
+#/* Otherwise a timeout occurs waiting for a      */
+#/* response.                                     */
+#/* A response timeout tuned while processing the */
+#/* last response is set before the next OBDII    */
+#/* request is sent. The times of an OBDII        */
+#/* request are kept before the response is       */
+#/* processed, see self.ResponseTimes.            */
+#/*************************************************/
+	def GetResponse(self, Data):
+		if Data[:2] != b'AT':
+			self.SendTimeout()
+		Data = self.SendRequest(Data)
+		Response = self.ReadResponse()
+		if Data[:2] != b'AT':
+			self.ResponseTimes = (self.SendTime, self.ReceiveTime)
+			self.SetRequestTimes(self.SendTime, self.ReceiveTime)
+
+		return self.ProcessResponse(Data, Response)
+
+
 
-		return Result
-	PidFunctions["0106"] = PID0106
-	PidFunctions["0206"] = PID0106
+#/*******************************************************************/
+#/* Keep the times of the requests made for a PID, from the first   */
+#/* request sent to the last response received.                     */
+#/*******************************************************************/
+	def SetRequestTimes(self, SendTime, ReceiveTime):
+		if self.RequestSendTime == 0:
+			self.RequestSendTime = SendTime
+		self.RequestReceiveTime = ReceiveTime
 
 
-# PID0107 Get the Long term fuel trim—Bank from the ECU.
-	def PID0107(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
 
-		if '0107' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'0107\r')
-				Response = self.PruneData(Response, 2)
-			else:
-				Response = self.GetResponse(bytearray("0207" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
-			Result = (100 * int(Response, 16) / 128) - 100
+#/********************************************************************/
+#/* Send a request to the ELM327 device. Return the request as sent, */
+#/* with the expected number of responses added, so the response can */
+#/* be processed for the request.                                    */
+#/********************************************************************/
+	def SendRequest(self, Data):
+		# Add the number of ECUs expected to respond, so the ELM327 responds without waiting for a timeout.
+		if self.ResponseCountEnabled == True and Data[:2] in RESPONSE_COUNT_MODES:
+			Request = str(Data[:-1], 'utf-8')
+			if Request[:4] in self.ResponseCounts and (len(Request) == 4 or (len(Request) == 6 and Request[:2] == '02')):
+				Data = Data[:-1] + bytes(str(self.ResponseCounts[Request[:4]]), 'utf-8') + b'\r'
 
-		return Result
-	PidFunctions["0107"] = PID0107
-	PidFunctions["0207"] = PID0107
+		Data = Data.replace(b'\r', SERIAL_LINEFEED_TYPE)
 
+		if DEBUG == "ON":
+			print("DEBUG SENDING [" + str(len(Data)) + "] " + str(Data))
 
-# PID0108 Get the Short term fuel trim—Bank 2 from the ECU.
-	def PID0108(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
+		self.FirstByteTime = 0
+		if bytes(Data) == self.LastCommand:
+			# Repeat the last command, by sending only a carriage return.
+			self.ELM327.write(SERIAL_LINEFEED_TYPE)
+		else:
+			self.ELM327.write(Data)
+		self.SendTime = time.monotonic()
 
-		if '0108' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'0108\r')
-				Response = self.PruneData(Response, 2)
-			else:
-				Response = self.GetResponse(bytearray("0208" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
-			Result = (100 * int(Response, 16) / 128) - 100
+		return Data
 
-		return Result
-	PidFunctions["0108"] = PID0108
-	PidFunctions["0208"] = PID0108
 
 
-# PID0109 Get the Long term fuel trim—Bank 2 from the ECU.
-	def PID0109(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
+#/*********************************************************************/
+#/* Process a response read from the ELM327 device for a request,     */
+#/* returning the response as text lines ready for the PID functions. */
+#/*********************************************************************/
+	def ProcessResponse(self, Data, Response):
+		# Only OBDII commands which completed with a prompt can be repeated.
+		if self.PromptReceived == True and Data[:2] != b'AT':
+			self.LastCommand = bytes(Data)
+		else:
+			self.LastCommand = b''
+		self.NoData = (Response.find(b'NO DATA') != -1)
+		# Keep the response timeout tuned to the ECU response times.
+		if self.TimingTuned == True and Data[:2] != b'AT':
+			self.UpdateTiming(Data)
+		Response = Response.replace(b'\r', b'\n').replace(b'\n\n', b'\n')
+		if Response[-1:] != b'\n':
+			Response += b'\n'
+		Result = str(Response, 'utf-8')
 
-		if '0109' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'0109\r')
-				Response = self.PruneData(Response, 2)
-			else:
-				Response = self.GetResponse(bytearray("0209" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
-			Result = (100 * int(Response, 16) / 128) - 100
+		if DEBUG == "ON":
+			print("DEBUG RECEIVED [" + str(len(Result)) + "] " + str(Result))
 
 		return Result
-	PidFunctions["0109"] = PID0109
-	PidFunctions["0209"] = PID0109
 
 
-# PID010A Get the Fuel pressure (gauge pressure) from the ECU.
-	def PID010A(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
 
-		if '010A' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'010A\r')
-				Response = self.PruneData(Response, 2)
+#/********************************************************************/
+#/* Tune the ELM327 response timeout for the connected ECU. Adaptive */
+#/* timing is enabled and the time the ECU takes to respond is       */
+#/* measured for a few requests. The timeout, which is the longest   */
+#/* time the ELM327 waits for an ECU response, is then set to a      */
+#/* margin above the longest measured response time. A timeout       */
+#/* stored from a previous connection to the vehicle is used instead */
+#/* of measuring the response time again.                            */
+#/********************************************************************/
+	def TuneTiming(self, StoredTimeout = ""):
+		self.TimingTuned = False
+		self.Timeout = ELM_TIMEOUT_DEFAULT
+		self.TimeoutPending = None
+		self.TimeoutMin = ELM_TIMEOUT_MIN
+		self.LatencyMax = 0
+		self.LatencyCount = 0
+
+		# Adaptive timing on, the timeout set becomes the maximum time allowed.
+		Response = self.GetResponse(b'AT AT1\r')
+		if Response != 'OK\n':
+			self.InitResult += "FAILED: AT AT1 (Set Adaptive Timing On)\n"
+		else:
+			if self.IsHexData(StoredTimeout) == True:
+				# Always sent, the ELM327 device may still have the timeout of a previous connection.
+				self.TimeoutPending = max(self.TimeoutMin, min(int(StoredTimeout, 16), ELM_TIMEOUT_DEFAULT))
+				self.SendTimeout()
 			else:
-				Response = self.GetResponse(bytearray("020A" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
-			Result = 3 * int(Response, 16)
-
-		return Result
-	PidFunctions["010A"] = PID010A
-	PidFunctions["020A"] = PID010A
+				# Measure the ECU response time.
+				Latency = 0
+				for Count in range(ELM_TIMING_PROBE_COUNT):
+					for ThisProbe in ELM_TIMING_PROBES:
+						self.GetResponse(ThisProbe)
+						if self.NoData == False and self.FirstByteTime != 0:
+							Latency = max(Latency, self.FirstByteTime - self.SendTime)
+				if Latency > 0:
+					self.SetTimeout(self.LatencyToTimeout(Latency))
+					self.SendTimeout()
+			self.TimingTuned = True
+
+
+
+#/********************************************************************/
+#/* After each OBDII request, update the response timeout. A missing */
+#/* response for a supported PID could be a response arriving after  */
+#/* the timeout, so the timeout is increased and never tuned below   */
+#/* that value again. Otherwise the response times are measured and  */
+#/* the timeout is tuned again after a number of responses.          */
+#/********************************************************************/
+	def UpdateTiming(self, Request):
+		if self.NoData == True:
+			if str(Request[:4], 'utf-8') in self.ValidPIDs and self.Timeout < ELM_TIMEOUT_DEFAULT:
+				self.TimeoutMin = min(2 * self.Timeout, ELM_TIMEOUT_DEFAULT)
+				self.SetTimeout(self.TimeoutMin)
+				self.LatencyMax = 0
+				self.LatencyCount = 0
+		elif self.FirstByteTime != 0:
+			self.LatencyMax = max(self.LatencyMax, self.FirstByteTime - self.SendTime)
+			self.LatencyCount += 1
+			if self.LatencyCount >= ELM_TIMING_RETUNE_COUNT:
+				self.SetTimeout(self.LatencyToTimeout(self.LatencyMax))
+				self.LatencyMax = 0
+				self.LatencyCount = 0
+
+
+
+#/******************************************************************/
+#/* Convert an ECU response time in seconds into an ELM327 timeout */
+#/* value, with a safety margin, within the allowed timeout range. */
+#/******************************************************************/
+	def LatencyToTimeout(self, Latency):
+		Timeout = math.ceil(ELM_TIMEOUT_MARGIN * Latency / ELM_TIMEOUT_STEP)
+		return max(self.TimeoutMin, min(Timeout, ELM_TIMEOUT_DEFAULT))
 
 
-# PID010B Get the Intake manifold absolute pressure from the ECU.
-	def PID010B(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
 
-		if '010B' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'010B\r')
-				Response = self.PruneData(Response, 2)
-			else:
-				Response = self.GetResponse(bytearray("020B" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
-			Result = int(Response, 16)
+#/*******************************************************************/
+#/* Set the ELM327 response timeout, if it has changed. The timeout */
+#/* is tuned while a response is processed, so it is only sent to   */
+#/* the ELM327 device once the response has been used, see          */
+#/* SendTimeout, leaving the state of the response untouched.       */
+#/*******************************************************************/
+	def SetTimeout(self, Timeout):
+		if Timeout != self.Timeout:
+			self.TimeoutPending = Timeout
+		else:
+			self.TimeoutPending = None
+
+
+
+#/***********************************************************/
+#/* Send any waiting response timeout to the ELM327 device. */
+#/***********************************************************/
+	def SendTimeout(self):
+		if self.TimeoutPending is not None:
+			Timeout = self.TimeoutPending
+			self.TimeoutPending = None
+			Response = self.GetResponse(bytearray("AT ST " + "{:02X}".format(Timeout) + "\r", 'UTF-8'))
+			if Response == 'OK\n':
+				self.Timeout = Timeout
+
+
+
+#/***********************************************************/
+#/* Read a response from the ELM327 device, up to the '>'   */
+#/* prompt character or a timeout. All waiting characters   */
+#/* are read at once into a preallocated buffer, which is   */
+#/* only scanned for the prompt in the newly read data.     */
+#/* The response is returned as bytes, without the prompt   */
+#/* and without any rejected characters.                    */
+#/***********************************************************/
+	def ReadResponse(self):
+		Length = 0
+		Prompt = -1
+		while Prompt == -1:
+			# Read all waiting characters, or wait for at least one character.
+			ReadCount = max(self.ELM327.in_waiting, 1)
+			if Length + ReadCount > len(self.ReadBuffer):
+				self.ReadBuffer.extend(bytearray(max(Length + ReadCount - len(self.ReadBuffer), SERIAL_READ_BUFFER_SIZE)))
+			with memoryview(self.ReadBuffer) as BufferView:
+				ReadCount = self.ELM327.readinto(BufferView[Length:Length + ReadCount])
+			if ReadCount == 0:
+				# Timeout waiting for a response.
+				break
+			if Length == 0:
+				self.FirstByteTime = time.monotonic()
+			Prompt = self.ReadBuffer.find(b'>', Length, Length + ReadCount)
+			Length += ReadCount
+		self.ReceiveTime = time.monotonic()
+		self.PromptReceived = (Prompt != -1)
+		if Prompt != -1:
+			Length = Prompt
+		with memoryview(self.ReadBuffer) as BufferView:
+			Response = BufferView[:Length].tobytes()
+
+		return self.RejectCharacters(Response)
 
-		return Result
-	PidFunctions["010B"] = PID010B
-	PidFunctions["020B"] = PID010B
 
 
-# PID010C Get the current Engine RPM from the ECU.
-	def PID010C(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
+#/*********************************************************/
+#/* Reject any received characters with the high bit set. */
+#/*********************************************************/
+	def RejectCharacters(self, Response):
+		if Response.isascii() == False:
+			if DEBUG == "ON":
+				for ThisChar in Response:
+					if ThisChar > 127:
+						print("REJECTING RECEIVED CHARACTER: " + str(ThisChar))
+			Response = Response.translate(None, SERIAL_REJECT_CHARACTERS)
 
-		if '010C' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'010C\r')
-				Response = self.PruneData(Response, 2)
-			else:
-				Response = self.GetResponse(bytearray("020C" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
-			Result = (256 * int(Response[:2], 16) + int(Response[2:4], 16)) / 4
+		return Response
 
-		return Result
-	PidFunctions["010C"] = PID010C
-	PidFunctions["020C"] = PID010C
 
 
-# PID010D Get the Vehicle speed from the ECU.
-	def PID010D(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
+#/****************************************************************/
+#/* Count the number of ECUs which respond to each PID, from the */
+#/* bitmaped supported PIDs response of each ECU. Return the     */
+#/* supported PIDs of all of the ECUs combined into one bitmap.  */
+#/****************************************************************/
+	def CountPidResponses(self, PidMode, Response, PidStart, RemoveByteCount):
+		PidStartValue = int(PidStart, 16)
+		PidSupport = 0
+		ResponseCounts = {}
+		for PidValue in self.GetSupportBitmaps(Response, RemoveByteCount):
+			PidSupport |= PidValue
+			for Count in range(32):
+				if PidValue & (0x80000000 >> Count) != 0:
+					PID = PidMode + '%2.2X' % (PidStartValue + Count + 1)
+					if PID not in MULTIPLE_FRAME_PIDS:
+						ResponseCounts[PID] = ResponseCounts.get(PID, 0) + 1
+		self.ResponseCounts.update(ResponseCounts)
 
-		if '010D' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'010D\r')
-				Response = self.PruneData(Response, 2)
-			else:
-				Response = self.GetResponse(bytearray("020D" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
-			Result = int(Response[:2], 16)
+		return '%8.8X' % PidSupport
 
-		return Result
-	PidFunctions["010D"] = PID010D
-	PidFunctions["020D"] = PID010D
 
 
-# PID010E Get the Timing advance from the ECU.
-	def PID010E(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
+#/*******************************************************************/
+#/* Return the bitmap of supported PIDs from each line of a         */
+#/* supported PIDs response, after the specified number of bytes.   */
+#/*******************************************************************/
+	def GetSupportBitmaps(self, Response, RemoveByteCount):
+		Result = []
 
-		if '010E' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'010E\r')
-				Response = self.PruneData(Response, 2)
-			else:
-				Response = self.GetResponse(bytearray("020E" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
-			Result = (int(Response[:2], 16) / 2) - 64
+		for Line in Response.split('\n'):
+			Line = Line[2 * RemoveByteCount:2 * RemoveByteCount + 8]
+			if len(Line) == 8 and self.IsHexData(Line):
+				Result.append(int(Line, 16))
 
 		return Result
-	PidFunctions["010E"] = PID010E
-	PidFunctions["020E"] = PID010E
 
 
-# PID010F Get the Intake air temperature from the ECU.
-	def PID010F(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
 
-		if '010F' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'010F\r')
-				Response = self.PruneData(Response, 2)
-			else:
-				Response = self.GetResponse(bytearray("020F" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
-			Result = int(Response[:2], 16) - 40
+#/*******************************************************************/
+#/* Return the number of bytes before the supported PIDs bitmap in  */
+#/* a Mode 09 supported PIDs response. Other than on a CAN BUS, the */
+#/* PID is followed by a message count byte.                        */
+#/*******************************************************************/
+	def GetMode09ByteCount(self):
+		Result = 3
+
+		if self.CanBus == True:
+			Result = 2
 
 		return Result
-	PidFunctions["010F"] = PID010F
-	PidFunctions["020F"] = PID010F
 
 
-# PID0110 Get the MAF air flow rate from the ECU.
-	def PID0110(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
 
-		if '0110' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'0110\r')
-				Response = self.PruneData(Response, 2)
-			else:
-				Response = self.GetResponse(bytearray("0210" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
-			Result = (256 * int(Response[:2], 16) + int(Response[2:4], 16)) / 100
+#/*****************************************************************/
+#/* Resolve a bitmaped supported PIDs response from the ECU and   */
+#/* add them to the list of currently supported PIDs for the ECU. */
+#/*****************************************************************/
+	def ResolvePidData(self, PidMode, PidData, PidStart, PidDescriptions, FreezeIndex = -1):
+		PidStartValue = int(PidStart, 16)
+		PidValue = int(PidData, 16)
+		Count = PidStartValue + (len(PidData) * 4)
+		while PidValue > 0:
+			if PidValue % 2 > 0:
+				PidIndex = '%2.2X' % Count
+				if PidMode == '02':
+					ThisFreezeIndex = "{:02d}".format(FreezeIndex)
+					if PidIndex in PidDescriptions:
+						self.ValidFreezePIDs[PidMode + PidIndex + ThisFreezeIndex] = PidDescriptions[PidIndex]
+					else:
+						self.ValidFreezePIDs[PidMode + PidIndex + ThisFreezeIndex] = STRING_NO_DESCRIPTION
+				elif PidMode == '06':
+					if PidIndex in PidDescriptions:
+						self.ValidMonitorIDs[PidMode + PidIndex] = PidDescriptions[PidIndex]
+					else:
+						self.ValidMonitorIDs[PidMode + PidIndex] = STRING_NO_DESCRIPTION
+				else:
+					if PidIndex in PidDescriptions:
+						self.ValidPIDs[PidMode + PidIndex] = PidDescriptions[PidIndex]
+					else:
+						self.ValidPIDs[PidMode + PidIndex] = STRING_NO_DESCRIPTION
+			PidValue = int(PidValue / 2)
+			Count -= 1
 
-		return Result
-	PidFunctions["0110"] = PID0110
-	PidFunctions["0210"] = PID0110
 
 
-# PID0111 Get the Throttle position from the ECU.
-	def PID0111(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
+#/**********************************************************/
+#/* Convert pairs of data bytes into actual trouble codes, */
+#/* translating the first digit as required, and ignoring  */
+#/* zero value data.                                       */
+#/**********************************************************/
+	def DataToTroubleCodes(self, Data):
+		TroubleCodes = list()
+		for Index in range(0, len(Data) - 1, 2):
+			ThisCode = 256 * Data[Index] + Data[Index + 1]
+			if ThisCode != 0:
+				TroubleCodes.append(self.TroubleCodePrefix['%X' % (ThisCode >> 12)] + '%3.3X' % (ThisCode & 0x0FFF))
+		return TroubleCodes
 
-		if '0111' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'0111\r')
-				Response = self.PruneData(Response, 2)
-			else:
-				Response = self.GetResponse(bytearray("0211" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
-			Result = 100 * int(Response[:2], 16) / 255
 
-		return Result
-	PidFunctions["0111"] = PID0111
-	PidFunctions["0211"] = PID0111
 
+#/*****************************************************/
+#/* Get the trouble codes from the ECU and lookup the */
+#/* trouble code descriptions. Return the data in a   */
+#/* data array.                                       */
+#/*****************************************************/
+	def GetTroubleCodeData(self, OBDIImode):
+		return self.ReadTroubleCodeData(OBDIImode)
 
-# PID0112 Get the Commanded secondary air status from the ECU.
-	def PID0112(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
 
-		if '0112' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'0112\r')
-				Response = self.PruneData(Response, 2)
-			else:
-				Response = self.GetResponse(bytearray("0212" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
-			if Response in self.CommandedSecondaryAirStatus:
-				Result = self.CommandedSecondaryAirStatus[Response]
-			else:
-				Result = STRING_INVALID
 
-		return Result
-	PidFunctions["0112"] = PID0112
-	PidFunctions["0212"] = PID0112
+#/*****************************************************************/
+#/* Request the trouble codes from the ECU, for the PID functions */
+#/* of the trouble code modes. ELM327Async replaces the public    */
+#/* GetTroubleCodeData, so the PID functions use this instead.    */
+#/*****************************************************************/
+	def ReadTroubleCodeData(self, OBDIImode):
+		return self.DecodeTroubleCodeData(self.GetFrames(OBDIImode + b'\r'), OBDIImode)
 
 
-# PID0113 Get the Oxygen sensors present (in 2 banks) from the ECU.
-	def PID0113(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
 
-		if '0113' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'0113\r')
-				Response = self.PruneData(Response, 2)
+#/*******************************************************************/
+#/* Decode the trouble codes in the response frames of a trouble    */
+#/* code mode, and lookup the trouble code descriptions.            */
+#/*******************************************************************/
+	def DecodeTroubleCodeData(self, Frames, OBDIImode):
+		TroubleCodeData = {}
+		Service = 0x40 + int(OBDIImode, 16)
+		TroubleCodes = list()
+		for Ecu, FrameService, PidByte, Payload in Frames:
+			if FrameService == Service:
+				# On a CAN BUS the trouble codes follow a trouble code count.
+				if self.CanBus == True:
+					Payload = Payload[1:]
+				TroubleCodes += self.DataToTroubleCodes(Payload)
+		for TroubleCode in TroubleCodes:
+			if TroubleCode in self.TroubleCodeDescriptions:
+				TroubleCodeData[TroubleCode] = self.TroubleCodeDescriptions[TroubleCode]
 			else:
-				Response = self.GetResponse(bytearray("0213" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
-			ResultVal = int(Response[:2], 16)
-			Result = ( "BANK1", (ResultVal & 0x0F), "BANK2", (ResultVal & 0xF0) >> 4)
-
-		return Result
-	PidFunctions["0113"] = PID0113
-	PidFunctions["0213"] = PID0113
-
+				TroubleCodeData[TroubleCode] = STRING_NO_DESCRIPTION
+		return TroubleCodeData
 
-# PID0114 Get the current Oxygen Sensor 1 Voltage & Short Term Fuel Trim from the ECU.
-	def PID0114(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
 
-		if '0114' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'0114\r')
-				Response = self.PruneData(Response, 2)
-			else:
-				Response = self.GetResponse(bytearray("0214" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
-			Result = ( int(Response[:2], 16) / 200, (100 * int(Response[2:4], 16) / 128) - 100 )
 
-		return Result
-	PidFunctions["0114"] = PID0114
-	PidFunctions["0214"] = PID0114
+#/**************************************/
+#/* ODBII MODE 01 - Show current data. */
+#/**************************************/
 
+# PID0100 Supported PIDs for Mode 1 [01 -> 20].
+	def PID0100(self, FreezeIndex = -1):
+		Response = self.GetSupportResponse(b'0100\r')
+		Response = self.CountPidResponses('01', Response, '00', 2)
+		self.ResolvePidData('01', Response, '00', self.PidDescriptionsMode01)
+	PidFunctions["0100"] = PID0100
 
-# PID0115 Get the current Oxygen Sensor 2 Voltage & Short Term Fuel Trim from the ECU.
-	def PID0115(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
 
-		if '0115' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'0115\r')
-				Response = self.PruneData(Response, 2)
-			else:
-				Response = self.GetResponse(bytearray("0215" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
-			Result = ( int(Response[:2], 16) / 200, (100 * int(Response[2:4], 16) / 128) - 100 )
+#/*******************************************************************/
+#/* Decoders for the PID definitions, see PID_DEFINITIONS. Each     */
+#/* decoder is given the data bytes of a PID response, without the  */
+#/* mode, PID and frame bytes, and returns the value of the PID.    */
+#/*******************************************************************/
 
-		return Result
-	PidFunctions["0115"] = PID0115
-	PidFunctions["0215"] = PID0115
+# Decode Monitor status since DTCs cleared, PID 0101.
+	def DecodeMonitorStatus(self, Data):
+		Result = ()
 
+		if (Data[0] & 0x80) != 0:
+			self.MilOn = True
+			Result += ("MIL:ON",)
+		else:
+			self.MilOn = False
+			Result += ("MIL:OFF",)
+		self.FreezeFrameCount = Data[0] & 0x7F
+		Result += ("STORED TROUBLE CODE COUNT|" + str(self.FreezeFrameCount),)
 
-# PID0116 Get the current Oxygen Sensor 3 Voltage & Short Term Fuel Trim from the ECU.
-	def PID0116(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
+		for Bit in range(len(MONITOR_TESTS_COMMON)):
+			Result += (self.DecodeMonitorTest(MONITOR_TESTS_COMMON[Bit], Data[1], Data[1] >> 4, Bit),)
 
-		if '0116' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'0116\r')
-				Response = self.PruneData(Response, 2)
-			else:
-				Response = self.GetResponse(bytearray("0216" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
-			Result = ( int(Response[:2], 16) / 200, (100 * int(Response[2:4], 16) / 128) - 100 )
+		if (Data[1] & 0x08) != 0:
+			Result += ("IGNITION|COMPRESSION",)
+			MonitorTests = MONITOR_TESTS_COMPRESSION
+		else:
+			Result += ("IGNITION|SPARK",)
+			MonitorTests = MONITOR_TESTS_SPARK
+		for Bit in range(len(MonitorTests)):
+			Result += (self.DecodeMonitorTest(MonitorTests[Bit], Data[2], Data[3], Bit),)
 
 		return Result
-	PidFunctions["0116"] = PID0116
-	PidFunctions["0216"] = PID0116
 
 
-# PID0117 Get the current Oxygen Sensor 4 Voltage & Short Term Fuel Trim from the ECU.
-	def PID0117(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
+# Decode a single monitor test, an empty string when the test is not available.
+	def DecodeMonitorTest(self, Name, Available, Incomplete, Bit):
+		Result = ""
 
-		if '0117' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'0117\r')
-				Response = self.PruneData(Response, 2)
-			else:
-				Response = self.GetResponse(bytearray("0217" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
-			Result = ( int(Response[:2], 16) / 200, (100 * int(Response[2:4], 16) / 128) - 100 )
+		if (Available & (1 << Bit)) != 0:
+			Result = Name
+			if (Incomplete & (1 << Bit)) != 0:
+				Result += "|[INCOMPLETE]"
 
 		return Result
-	PidFunctions["0117"] = PID0117
-	PidFunctions["0217"] = PID0117
 
 
-# PID0118 Get the current Oxygen Sensor 5 Voltage & Short Term Fuel Trim from the ECU.
-	def PID0118(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
-
-		if '0118' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'0118\r')
-				Response = self.PruneData(Response, 2)
-			else:
-				Response = self.GetResponse(bytearray("0218" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
-			Result = ( int(Response[:2], 16) / 200, (100 * int(Response[2:4], 16) / 128) - 100 )
+# Decode the Freeze DTC, PID 0102.
+	def DecodeFreezeTroubleCode(self, Data):
+		TroubleCodes = self.DataToTroubleCodes(Data)
+		if TroubleCodes[0] in self.TroubleCodeDescriptions:
+			Result = TroubleCodes[0] + " " + self.TroubleCodeDescriptions[TroubleCodes[0]]
+		else:
+			Result = STRING_NO_DESCRIPTION
 
 		return Result
-	PidFunctions["0118"] = PID0118
-	PidFunctions["0218"] = PID0118
 
 
-# PID0119 Get the current Oxygen Sensor 6 Voltage & Short Term Fuel Trim from the ECU.
-	def PID0119(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
+# Decode the Fuel system status, PID 0103.
+	def DecodeFuelSystemStatus(self, Data):
+		Result = ()
 
-		if '0119' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'0119\r')
-				Response = self.PruneData(Response, 2)
-			else:
-				Response = self.GetResponse(bytearray("0219" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
-			Result = ( int(Response[:2], 16) / 200, (100 * int(Response[2:4], 16) / 128) - 100 )
+		for Index in range(2):
+			Result += ("Fuel System " + str(Index + 1),)
+			Result += (self.FuelSystemStatus.get('%2.2X' % Data[Index], STRING_INVALID),)
 
 		return Result
-	PidFunctions["0119"] = PID0119
-	PidFunctions["0219"] = PID0119
 
 
-# PID011A Get the current Oxygen Sensor 7 Voltage & Short Term Fuel Trim from the ECU.
-	def PID011A(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
+# Decode a percentage, such as Calculated engine load or Throttle position.
+	def DecodePercent(self, Data):
+		return 100 * Data[0] / 255
 
-		if '011A' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'011A\r')
-				Response = self.PruneData(Response, 2)
-			else:
-				Response = self.GetResponse(bytearray("021A" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
-			Result = ( int(Response[:2], 16) / 200, (100 * int(Response[2:4], 16) / 128) - 100 )
 
-		return Result
-	PidFunctions["011A"] = PID011A
-	PidFunctions["021A"] = PID011A
+# Decode a temperature, such as Engine coolant temperature or Intake air temperature.
+	def DecodeTemperature(self, Data):
+		return Data[0] - 40
 
 
-# PID011B Get the current Oxygen Sensor 8 Voltage & Short Term Fuel Trim from the ECU.
-	def PID011B(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
+# Decode a fuel trim percentage.
+	def DecodeFuelTrim(self, Data):
+		return (100 * Data[0] / 128) - 100
 
-		if '011B' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'011B\r')
-				Response = self.PruneData(Response, 2)
-			else:
-				Response = self.GetResponse(bytearray("021B" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
-			Result = ( int(Response[:2], 16) / 200, (100 * int(Response[2:4], 16) / 128) - 100 )
 
-		return Result
-	PidFunctions["011B"] = PID011B
-	PidFunctions["021B"] = PID011B
+# Decode the Commanded secondary air status, PID 0112.
+	def DecodeSecondaryAirStatus(self, Data):
+		return self.CommandedSecondaryAirStatus.get('%2.2X' % Data[0], STRING_INVALID)
 
 
-# PID011C Get the OBD standards this vehicle conforms to from the ECU.
-	def PID011C(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
+# Decode an Oxygen Sensor Voltage & Short Term Fuel Trim, PIDs 0114 -> 011B.
+	def DecodeOxygenSensor(self, Data):
+		return ( Data[0] / 200, (100 * Data[1] / 128) - 100 )
 
-		if '011C' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'011C\r')
-				Response = self.PruneData(Response, 2)
-			else:
-				Response = self.GetResponse(bytearray("021C" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
-			if Response in self.VehicleObdStandards:
-				Result = self.VehicleObdStandards[Response]
-			else:
-				Result = STRING_INVALID
 
-		return Result
-	PidFunctions["011C"] = PID011C
-	PidFunctions["021C"] = PID011C
+# Decode the OBD standards this vehicle conforms to, PID 011C.
+	def DecodeObdStandards(self, Data):
+		return self.VehicleObdStandards.get('%2.2X' % Data[0], STRING_INVALID)
 
 
 # PID011D
@@ -1304,30 +1987,12 @@ class ELM327:
 
 # PID0120 Supported PIDs for Mode 1 [21 -> 40].
 	def PID0120(self, FreezeIndex = -1):
-		Response = self.GetResponse(b'0120\r')
-		Response = self.PruneData(Response, 2)
+		Response = self.GetSupportResponse(b'0120\r')
+		Response = self.CountPidResponses('01', Response, '20', 2)
 		self.ResolvePidData('01', Response, '20', self.PidDescriptionsMode01)
 	PidFunctions["0120"] = PID0120
 
 
-# PID0121 Get the Distance traveled with malfunction indicator lamp (MIL) on from the ECU.
-	def PID0121(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
-
-		if '0121' in self.ValidPIDs:
-			if FreezeIndex == -1:
-				Response = self.GetResponse(b'0121\r')
-				Response = self.PruneData(Response, 2)
-			else:
-				Response = self.GetResponse(bytearray("0221" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-				Response = self.PruneData(Response, 3)
-			Result = 256 * int(Response[:2], 16) + int(Response[2:4], 16)
-
-		return Result
-	PidFunctions["0121"] = PID0121
-	PidFunctions["0221"] = PID0121
-
-
 # PID0122
 # PID0123
 # PID0124
@@ -1362,8 +2027,8 @@ class ELM327:
 
 # PID0140 Supported PIDs for Mode 1 [41 -> 60].
 	def PID0140(self, FreezeIndex = -1):
-		Response = self.GetResponse(b'0140\r')
-		Response = self.PruneData(Response, 2)
+		Response = self.GetSupportResponse(b'0140\r')
+		Response = self.CountPidResponses('01', Response, '40', 2)
 		self.ResolvePidData('01', Response, '40', self.PidDescriptionsMode01)
 	PidFunctions["0140"] = PID0140
 
@@ -1403,8 +2068,8 @@ class ELM327:
 
 # PID0160 Supported PIDs for Mode 1 [61 -> 80].
 	def PID0160(self, FreezeIndex = -1):
-		Response = self.GetResponse(b'0160\r')
-		Response = self.PruneData(Response, 2)
+		Response = self.GetSupportResponse(b'0160\r')
+		Response = self.CountPidResponses('01', Response, '60', 2)
 		self.ResolvePidData('01', Response, '60', self.PidDescriptionsMode01)
 	PidFunctions["0160"] = PID0160
 
@@ -1444,8 +2109,8 @@ class ELM327:
 
 # PID0180 Supported PIDs for Mode 1 [81 -> A0].
 	def PID0180(self, FreezeIndex = -1):
-		Response = self.GetResponse(b'0180\r')
-		Response = self.PruneData(Response, 2)
+		Response = self.GetSupportResponse(b'0180\r')
+		Response = self.CountPidResponses('01', Response, '80', 2)
 		self.ResolvePidData('01', Response, '80', self.PidDescriptionsMode01)
 	PidFunctions["0180"] = PID0180
 
@@ -1485,8 +2150,8 @@ class ELM327:
 
 # PID01A0 Supported PIDs for Mode 1 [A1 -> C0].
 	def PID01A0(self, FreezeIndex = -1):
-		Response = self.GetResponse(b'01A0\r')
-		Response = self.PruneData(Response, 2)
+		Response = self.GetSupportResponse(b'01A0\r')
+		Response = self.CountPidResponses('01', Response, 'A0', 2)
 		self.ResolvePidData('01', Response, 'A0', self.PidDescriptionsMode01)
 	PidFunctions["01A0"] = PID01A0
 
@@ -1526,8 +2191,8 @@ class ELM327:
 
 # PID01C0 Supported PIDs for Mode 1 [C1 -> E0].
 	def PID01C0(self, FreezeIndex = -1):
-		Response = self.GetResponse(b'01C0\r')
-		Response = self.PruneData(Response, 2)
+		Response = self.GetSupportResponse(b'01C0\r')
+		Response = self.CountPidResponses('01', Response, 'C0', 2)
 		self.ResolvePidData('01', Response, 'C0', self.PidDescriptionsMode01)
 	PidFunctions["01C0"] = PID01C0
 
@@ -1572,7 +2237,7 @@ class ELM327:
 # PID0200 Supported PIDs for Mode 2 [01 -> 20].
 	def PID0200(self, FreezeIndex = -1):
 		Response = self.GetResponse(bytearray("0200" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-		Response = self.PruneData(Response, 3)
+		Response = self.CountPidResponses('02', Response, '00', 3)
 		self.ResolvePidData('02', Response, '00', self.PidDescriptionsMode01, FreezeIndex)
 	PidFunctions["0200"] = PID0200
 
@@ -1580,7 +2245,7 @@ class ELM327:
 # PID0220 Supported PIDs for Mode 2 [21 -> 40].
 	def PID0220(self, FreezeIndex = -1):
 		Response = self.GetResponse(bytearray("0220" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-		Response = self.PruneData(Response, 3)
+		Response = self.CountPidResponses('02', Response, '20', 3)
 		self.ResolvePidData('02', Response, '20', self.PidDescriptionsMode01, FreezeIndex)
 	PidFunctions["0220"] = PID0220
 
@@ -1588,7 +2253,7 @@ class ELM327:
 # PID0240 Supported PIDs for Mode 2 [41 -> 60].
 	def PID0240(self, FreezeIndex = -1):
 		Response = self.GetResponse(bytearray("0240" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-		Response = self.PruneData(Response, 3)
+		Response = self.CountPidResponses('02', Response, '40', 3)
 		self.ResolvePidData('02', Response, '40', self.PidDescriptionsMode01, FreezeIndex)
 	PidFunctions["0240"] = PID0240
 
@@ -1596,7 +2261,7 @@ class ELM327:
 # PID0260 Supported PIDs for Mode 2 [61 -> 80].
 	def PID0260(self, FreezeIndex = -1):
 		Response = self.GetResponse(bytearray("0260" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-		Response = self.PruneData(Response, 3)
+		Response = self.CountPidResponses('02', Response, '60', 3)
 		self.ResolvePidData('02', Response, '60', self.PidDescriptionsMode01, FreezeIndex)
 	PidFunctions["0260"] = PID0260
 
@@ -1604,7 +2269,7 @@ class ELM327:
 # PID0280 Supported PIDs for Mode 2 [81 -> A0].
 	def PID0280(self, FreezeIndex = -1):
 		Response = self.GetResponse(bytearray("0280" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-		Response = self.PruneData(Response, 3)
+		Response = self.CountPidResponses('02', Response, '80', 3)
 		self.ResolvePidData('02', Response, '80', self.PidDescriptionsMode01, FreezeIndex)
 	PidFunctions["0280"] = PID0280
 
@@ -1612,7 +2277,7 @@ class ELM327:
 # PID02A0 Supported PIDs for Mode 2 [A1 -> C0].
 	def PID02A0(self, FreezeIndex = -1):
 		Response = self.GetResponse(bytearray("02A0" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-		Response = self.PruneData(Response, 3)
+		Response = self.CountPidResponses('02', Response, 'A0', 3)
 		self.ResolvePidData('02', Response, 'A0', self.PidDescriptionsMode01, FreezeIndex)
 	PidFunctions["02A0"] = PID02A0
 
@@ -1620,8 +2285,8 @@ class ELM327:
 # PID02C0 Supported PIDs for Mode 2 [C1 -> E0].
 	def PID02C0(self, FreezeIndex = -1):
 		Response = self.GetResponse(bytearray("02C0" + "{:02d}".format(FreezeIndex) + "\r", 'UTF-8'))
-		Response = self.PruneData(Response, 3)
-		self.ResolvePidData('02', Response, 'C0', self.PidDescriptionsMode01)
+		Response = self.CountPidResponses('02', Response, 'C0', 3)
+		self.ResolvePidData('02', Response, 'C0', self.PidDescriptionsMode01, FreezeIndex)
 	PidFunctions["02C0"] = PID02C0
 
 
@@ -1631,7 +2296,7 @@ class ELM327:
 
 # PID03 Get the Stored Trouble Codes from the ECU.
 	def PID03(self, FreezeIndex = -1):
-		return self.GetTroubleCodeData(b'03')
+		return self.ReadTroubleCodeData(b'03')
 	PidFunctions["03"] = PID03
 
 
@@ -1641,7 +2306,11 @@ class ELM327:
 
 # PID04 Erase all Pending/Stored Trouble Codes and Data from the ECU.
 	def PID04(self, FreezeIndex = -1):
-		return self.GetResponse(b'04\r')
+		Result = self.GetResponse(b'04\r')
+		# The freeze frames are also erased.
+		self.ClearFreezeSupport()
+
+		return Result
 	PidFunctions["04"] = PID04
 
 
@@ -1651,8 +2320,8 @@ class ELM327:
 
 # PID050100 Supported PIDs for Mode 0501 [01 -> 20].
 	def PID050100(self, FreezeIndex = -1):
-		Response = self.GetResponse(b'050100\r')
-		Response = self.PruneData(Response, 3)
+		Response = self.GetSupportResponse(b'050100\r')
+		Response = self.CountPidResponses('05', Response, '00', 3)
 		self.ResolvePidData('05', Response, '00', self.PidDescriptionsMode05)
 	PidFunctions["050100"] = PID050100
 
@@ -1695,188 +2364,452 @@ class ELM327:
 #/*               (Test results, oxygen sensor monitoring for CAN only) */
 #/***********************************************************************/
 
+#/*******************************************************************/
+#/* Find the monitor IDs the ECU supports, on a CAN BUS, or the     */
+#/* test IDs on other protocols. Each range of IDs is only          */
+#/* requested when the last ID of the previous range is supported.  */
+#/*******************************************************************/
+	def LoadMonitorSupport(self):
+		self.ValidMonitorIDs = {}
+		if self.CanBus == True:
+			Descriptions = self.PidDescriptionsMode06
+		else:
+			Descriptions = self.TestDescriptionsMode06
+
+		for Range in range(0x00, 0x100, 0x20):
+			PidStart = '%2.2X' % Range
+			if Range == 0x00 or '06' + PidStart in self.ValidMonitorIDs:
+				Response = self.GetSupportResponse(bytearray('06' + PidStart + '\r', 'UTF-8'))
+				Response = self.CountPidResponses('06', Response, PidStart, 2)
+				self.ResolvePidData('06', Response, PidStart, Descriptions)
+
+
 
 #/*******************************************************************/
-#/* ODBII MODE 07 - Show pending diagnostic trouble codes.          */
-#/*                 (detected during current or last driving cycle) */
+#/* Return the Mode 06 PIDs of the monitors the ECU supports,       */
+#/* without the supported monitor ID ranges.                        */
 #/*******************************************************************/
+	def GetMonitorIDs(self):
+		Result = []
+
+		for MonitorId in sorted(self.ValidMonitorIDs):
+			if int(MonitorId[2:4], 16) % 0x20 != 0:
+				Result.append(MonitorId)
+
+		return Result
 
-# Get the Pending Trouble Codes from the ECU.
-	def PID07(self, FreezeIndex = -1):
-		return self.GetTroubleCodeData(b'07')
-	PidFunctions["07"] = PID07
 
 
 #/*******************************************************************/
-#/* ODBII MODE 08 - Control operation of on-board component/system. */
+#/* Read the results of all of the on-board monitor tests from the  */
+#/* ECU. Each monitor is requested once, the ECU returns the        */
+#/* results of all of the monitor's tests in one multiple frame     */
+#/* response. Return a list of MonitorTest results.                 */
 #/*******************************************************************/
+	def ReadMonitorTests(self):
+		Result = []
 
+		for MonitorId in self.GetMonitorIDs():
+			try:
+				Result += self.ReadMonitorId(MonitorId)
+			except Exception as Catch:
+				print(STRING_ERROR + " in PID" + MonitorId + " : " + str(Catch))
 
-#/************************************************/
-#/* ODBII MODE 09 - Request vehicle information. */
-#/************************************************/
+		return Result
 
-# PID0900 Supported PIDs for Mode 09 [01 -> 20].
-	def PID0900(self, FreezeIndex = -1):
-		Response = self.GetResponse(b'0900\r')
-		Response = self.PruneData(Response, 3)
-		self.ResolvePidData('09', Response, '00', self.PidDescriptionsMode09)
-	PidFunctions["0900"] = PID0900
 
 
-	def PID0901(self, FreezeIndex = -1):
-		return STRING_TODO
-	PidFunctions["0901"] = PID0901
+#/*******************************************************************/
+#/* Request the results of the tests of one monitor from the ECU.   */
+#/*******************************************************************/
+	def ReadMonitorId(self, MonitorId):
+		return self.DecodeMonitorId(self.GetFrames(bytearray(MonitorId + '\r', 'UTF-8')), MonitorId)
 
 
-# PID0901 Get the VIN Message Count in PID 02.
-	def PID0901(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
 
-		if '0901' in self.ValidPIDs:
-			Response = self.GetResponse(b'0901\r')
-			Response = self.PruneData(Response, 2)
-			Result = int(Response, 16)
+#/*******************************************************************/
+#/* Decode the response frames of a monitor's test results.         */
+#/*******************************************************************/
+	def DecodeMonitorId(self, Frames, MonitorId):
+		if self.CanBus == True:
+			Result = self.DecodeMonitorTests(Frames, MonitorId)
+		else:
+			Result = self.DecodeComponentTests(Frames, MonitorId)
 
 		return Result
-	PidFunctions["0901"] = PID0901
 
 
-# PID0902 Get the current Vehicle VIN Number from the ECU.
-	def PID0902(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
 
-		if '0902' in self.ValidPIDs:
-			Response = self.GetResponse(b'0902\r')
-			Response = self.PruneData(Response, 3)
-			Result = str(bytearray.fromhex(Response).replace(bytes([0x00]), b' '), 'UTF-8')
+#/*******************************************************************/
+#/* Decode the CAN BUS test results of a monitor. Each test result  */
+#/* is the monitor ID, test ID, unit and scaling ID, then the test  */
+#/* value, minimum limit and maximum limit of two bytes each. The   */
+#/* monitor ID of the first test result is already split from the   */
+#/* message as the PID.                                             */
+#/*******************************************************************/
+	def DecodeMonitorTests(self, Frames, MonitorId):
+		Result = []
+
+		MonitorByte = int(MonitorId[2:4], 16)
+		for Ecu, Service, PidByte, Payload in Frames:
+			if Service == 0x46 and PidByte == MonitorByte:
+				for Offset in range(0, len(Payload) - 7, 9):
+					TestId = '%2.2X' % Payload[Offset]
+					UnitId = Payload[Offset + 1]
+					Value, Unit = self.ScaleMonitorValue(UnitId, Payload[Offset + 2:Offset + 4])
+					Minimum = self.ScaleMonitorValue(UnitId, Payload[Offset + 4:Offset + 6])[0]
+					Maximum = self.ScaleMonitorValue(UnitId, Payload[Offset + 6:Offset + 8])[0]
+					Result.append(MonitorTest.MonitorTest(MonitorId, self.ValidMonitorIDs[MonitorId], TestId, self.TestDescriptionsMode06.get(TestId, STRING_NO_DESCRIPTION), Value, Minimum, Maximum, Unit))
 
 		return Result
-	PidFunctions["0902"] = PID0902
 
 
-	def PID0903(self, FreezeIndex = -1):
-		return STRING_TODO
-	PidFunctions["0903"] = PID0903
 
+#/*******************************************************************/
+#/* Decode the test results of a test ID, on protocols other than   */
+#/* CAN BUS. Each message is the component ID, then the test value  */
+#/* and test limit of two bytes each, which are not scaled. When    */
+#/* the top bit of the component ID is set the limit is a minimum,  */
+#/* otherwise it is a maximum.                                      */
+#/*******************************************************************/
+	def DecodeComponentTests(self, Frames, MonitorId):
+		Result = []
+
+		TestByte = int(MonitorId[2:4], 16)
+		for Ecu, Service, PidByte, Payload in Frames:
+			if Service == 0x46 and PidByte == TestByte and len(Payload) >= 5:
+				ComponentId = '%2.2X' % (Payload[0] & 0x7F)
+				Value = 256 * Payload[1] + Payload[2]
+				Limit = 256 * Payload[3] + Payload[4]
+				if (Payload[0] & 0x80) != 0:
+					Minimum, Maximum = Limit, None
+				else:
+					Minimum, Maximum = None, Limit
+				Result.append(MonitorTest.MonitorTest(MonitorId, self.ValidMonitorIDs[MonitorId], ComponentId, "Component " + ComponentId, Value, Minimum, Maximum, ""))
 
-# PID0903 Get the Calibration ID message count for PID 04.
-	def PID0903(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
+		return Result
 
-		if '0903' in self.ValidPIDs:
-			Response = self.GetResponse(b'0903\r')
-			Response = self.PruneData(Response, 2)
-			Result = int(Response, 16)
 
-		return Result
-	PidFunctions["0903"] = PID0903
 
+#/*******************************************************************/
+#/* Scale a two byte test value using it's unit and scaling ID.     */
+#/* Unit and scaling IDs from 0x80 are signed values. Return the    */
+#/* scaled value and it's units, an unknown unit and scaling ID     */
+#/* returns the value unscaled.                                     */
+#/*******************************************************************/
+	def ScaleMonitorValue(self, UnitId, Data):
+		Scale, Offset, Unit = MONITOR_UNIT_SCALING.get(UnitId, (1, 0, ""))
+		Value = 256 * Data[0] + Data[1]
+		if (UnitId & 0x80) != 0 and Value >= 0x8000:
+			Value -= 0x10000
 
-# PID0904 Get the current Calibration ID from the ECU.
-	def PID0904(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
+		return Scale * Value + Offset, Unit
 
-		if '0904' in self.ValidPIDs:
-			Response = self.GetResponse(b'0904\r')
-			Response = self.PruneData(Response, 3)
-			Result = str(bytearray.fromhex(Response).replace(bytes([0x00]), b' '), 'UTF-8')
 
-		return Result
-	PidFunctions["0904"] = PID0904
+#/*******************************************************************/
+#/* ODBII MODE 07 - Show pending diagnostic trouble codes.          */
+#/*                 (detected during current or last driving cycle) */
+#/*******************************************************************/
+
+# Get the Pending Trouble Codes from the ECU.
+	def PID07(self, FreezeIndex = -1):
+		return self.ReadTroubleCodeData(b'07')
+	PidFunctions["07"] = PID07
 
 
-	def PID0905(self, FreezeIndex = -1):
-		return STRING_TODO
-	PidFunctions["0905"] = PID0905
+#/*******************************************************************/
+#/* ODBII MODE 08 - Control operation of on-board component/system. */
+#/*******************************************************************/
 
 
-# PID0905 Get Calibration verification numbers (CVN) message count for PID 06.
-	def PID0905(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
+#/************************************************/
+#/* ODBII MODE 09 - Request vehicle information. */
+#/************************************************/
 
-		if '0905' in self.ValidPIDs:
-			Response = self.GetResponse(b'0905\r')
-			Response = self.PruneData(Response, 2)
-			Result = int(Response, 16)
+# PID0900 Supported PIDs for Mode 09 [01 -> 20].
+	def PID0900(self, FreezeIndex = -1):
+		Response = self.GetSupportResponse(b'0900\r')
+		Response = self.CountPidResponses('09', Response, '00', self.GetMode09ByteCount())
+		self.ResolvePidData('09', Response, '00', self.PidDescriptionsMode09)
+	PidFunctions["0900"] = PID0900
 
-		return Result
-	PidFunctions["0905"] = PID0905
 
+# Decode a text value, such as the VIN, Calibration ID or ECU name.
+	def DecodeText(self, Data):
+		return str(bytes(Data).replace(bytes([0x00]), b' '), 'UTF-8')
 
-# PID0906 Get the current Calibration Verification Numbers from the ECU.
-	def PID0906(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
 
-		if '0906' in self.ValidPIDs:
-			Response = self.GetResponse(b'0906\r')
-			Result = self.PruneData(Response, 3)
+# PID0908
 
-		return Result
-	PidFunctions["0906"] = PID0906
 
+# PID090B
 
-	def PID0907(self, FreezeIndex = -1):
-		return STRING_TODO
-	PidFunctions["0907"] = PID0907
 
+#/****************************************************************************/
+#/* ODBII MODE 0A - Permanent diagnostic trouble codes (DTCs, Cleared DTCs). */
+#/****************************************************************************/
 
-	def PID0908(self, FreezeIndex = -1):
-		return STRING_TODO
-	PidFunctions["0908"] = PID0908
 
 
-	def PID0909(self, FreezeIndex = -1):
-		return STRING_TODO
-	PidFunctions["0909"] = PID0909
+#/*******************************************************************/
+#/* PID definitions, for the PIDs which return data. Each PID is    */
+#/* defined by it's PID number, the number of data bytes returned,  */
+#/* or None for multiple message data, and the decoder for the data */
+#/* bytes. Mode 01 PIDs are also defined as the equivalent Mode 02  */
+#/* freeze frame PIDs. A new PID only needs adding to this table.   */
+#/*******************************************************************/
+PID_DEFINITIONS = (
+	# Monitor status since DTCs cleared.
+	("0101", 4, ELM327.DecodeMonitorStatus),
+	# Freeze DTC.
+	("0102", 2, ELM327.DecodeFreezeTroubleCode),
+	# Fuel system status.
+	("0103", 2, ELM327.DecodeFuelSystemStatus),
+	# Calculated Engine Load.
+	("0104", 1, ELM327.DecodePercent),
+	# Engine Coolant Temperature.
+	("0105", 1, ELM327.DecodeTemperature),
+	# Short term fuel trim - Bank 1.
+	("0106", 1, ELM327.DecodeFuelTrim),
+	# Long term fuel trim - Bank 1.
+	("0107", 1, ELM327.DecodeFuelTrim),
+	# Short term fuel trim - Bank 2.
+	("0108", 1, ELM327.DecodeFuelTrim),
+	# Long term fuel trim - Bank 2.
+	("0109", 1, ELM327.DecodeFuelTrim),
+	# Fuel pressure (gauge pressure).
+	("010A", 1, lambda self, Data: 3 * Data[0]),
+	# Intake manifold absolute pressure.
+	("010B", 1, lambda self, Data: Data[0]),
+	# Engine RPM.
+	("010C", 2, lambda self, Data: (256 * Data[0] + Data[1]) / 4),
+	# Vehicle speed.
+	("010D", 1, lambda self, Data: Data[0]),
+	# Timing advance.
+	("010E", 1, lambda self, Data: (Data[0] / 2) - 64),
+	# Intake air temperature.
+	("010F", 1, ELM327.DecodeTemperature),
+	# MAF air flow rate.
+	("0110", 2, lambda self, Data: (256 * Data[0] + Data[1]) / 100),
+	# Throttle position.
+	("0111", 1, ELM327.DecodePercent),
+	# Commanded secondary air status.
+	("0112", 1, ELM327.DecodeSecondaryAirStatus),
+	# Oxygen sensors present (in 2 banks).
+	("0113", 1, lambda self, Data: ( "BANK1", (Data[0] & 0x0F), "BANK2", (Data[0] & 0xF0) >> 4)),
+	# Oxygen Sensor 1 -> 8 Voltage & Short Term Fuel Trim.
+	("0114", 2, ELM327.DecodeOxygenSensor),
+	("0115", 2, ELM327.DecodeOxygenSensor),
+	("0116", 2, ELM327.DecodeOxygenSensor),
+	("0117", 2, ELM327.DecodeOxygenSensor),
+	("0118", 2, ELM327.DecodeOxygenSensor),
+	("0119", 2, ELM327.DecodeOxygenSensor),
+	("011A", 2, ELM327.DecodeOxygenSensor),
+	("011B", 2, ELM327.DecodeOxygenSensor),
+	# OBD standards this vehicle conforms to.
+	("011C", 1, ELM327.DecodeObdStandards),
+	# Distance traveled with malfunction indicator lamp (MIL) on.
+	("0121", 2, lambda self, Data: 256 * Data[0] + Data[1]),
+
+	# VIN Message Count in PID 02.
+	("0901", 1, lambda self, Data: Data[0]),
+	# Vehicle VIN Number.
+	("0902", None, ELM327.DecodeText),
+	# Calibration ID message count for PID 04.
+	("0903", 1, lambda self, Data: Data[0]),
+	# Calibration ID.
+	("0904", None, ELM327.DecodeText),
+	# Calibration verification numbers (CVN) message count for PID 06.
+	("0905", 1, lambda self, Data: Data[0]),
+	# Calibration Verification Numbers.
+	("0906", None, lambda self, Data: Data.hex().upper()),
+	# In-use performance tracking message count for PID 08 and 0B.
+	("0907", 1, lambda self, Data: Data[0]),
+	# ECU name message count for PID 0A.
+	("0909", 1, lambda self, Data: Data[0]),
+	# ECU Name.
+	("090A", None, ELM327.DecodeText),
+)
 
 
-# PID0907 Get In-use performance tracking message count for PID 08 and 0B.
-	def PID0907(self, FreezeIndex = -1):
-		Result = STRING_NO_DATA
 
-		if '0907' in self.ValidPIDs:
-			Response = self.GetResponse(b'0907\r')
-			Response = self.PruneData(Response, 2)
-			Result = int(Response, 16)
+#/*******************************************************************/
+#/* Mode 06 unit and scaling IDs, the scale and offset applied to a */
+#/* test value, and the units of the scaled value. Unit and scaling */
+#/* IDs from 0x80 are the signed equivalents of the IDs below 0x80. */
+#/*******************************************************************/
+MONITOR_UNIT_SCALING = {
+	0x01: (1, 0, ""),
+	0x02: (0.1, 0, ""),
+	0x03: (0.01, 0, ""),
+	0x04: (0.001, 0, ""),
+	0x05: (0.0000305, 0, ""),
+	0x06: (0.000305, 0, ""),
+	0x07: (0.25, 0, "rpm"),
+	0x08: (0.01, 0, "km/h"),
+	0x09: (1, 0, "km/h"),
+	0x0A: (0.122, 0, "mV"),
+	0x0B: (0.001, 0, "V"),
+	0x0C: (0.01, 0, "V"),
+	0x0D: (0.00390625, 0, "mA"),
+	0x0E: (0.001, 0, "A"),
+	0x0F: (0.01, 0, "A"),
+	0x10: (1, 0, "ms"),
+	0x11: (100, 0, "ms"),
+	0x12: (1, 0, "s"),
+	0x13: (1, 0, "mOhm"),
+	0x14: (1, 0, "Ohm"),
+	0x15: (1, 0, "kOhm"),
+	0x16: (0.1, -40, "C"),
+	0x17: (0.01, 0, "kPa"),
+	0x18: (0.0117, 0, "kPa"),
+	0x19: (0.079, 0, "kPa"),
+	0x1A: (1, 0, "kPa"),
+	0x1B: (10, 0, "kPa"),
+	0x1C: (0.01, 0, "deg"),
+	0x1D: (0.5, 0, "deg"),
+	0x1E: (0.0000305, 0, "ratio"),
+	0x1F: (0.05, 0, "ratio"),
+	0x20: (0.00390625, 0, "ratio"),
+	0x21: (1, 0, "mHz"),
+	0x22: (1, 0, "Hz"),
+	0x23: (1, 0, "kHz"),
+	0x24: (1, 0, "counts"),
+	0x25: (1, 0, "km"),
+	0x26: (0.1, 0, "mV/ms"),
+	0x27: (0.01, 0, "g/s"),
+	0x28: (1, 0, "g/s"),
+	0x29: (0.25, 0, "Pa/s"),
+	0x2A: (0.001, 0, "kg/h"),
+	0x2B: (1, 0, "switches"),
+	0x2C: (0.01, 0, "g/cyl"),
+	0x2D: (0.01, 0, "mg/stroke"),
+	0x2E: (1, 0, ""),
+	0x2F: (0.01, 0, "%"),
+	0x30: (0.001526, 0, "%"),
+	0x31: (0.001, 0, "L"),
+	0x32: (0.0000305, 0, "inch"),
+	0x33: (0.00024414, 0, "ratio"),
+	0x34: (1, 0, "min"),
+	0x35: (10, 0, "ms"),
+	0x36: (0.01, 0, "g"),
+	0x37: (0.1, 0, "g"),
+	0x38: (1, 0, "g"),
+	0x39: (0.01, -327.68, "%"),
+	0x3A: (0.001, 0, "g"),
+	0x3B: (0.0001, 0, "g"),
+	0x3C: (0.1, 0, "us"),
+	0x3D: (0.01, 0, "mA"),
+	0x3E: (0.00006103516, 0, "mm2"),
+	0x3F: (0.01, 0, "L"),
+	0x40: (1, 0, "ppm"),
+	0x41: (0.01, 0, "uA"),
+	0x81: (1, 0, ""),
+	0x82: (0.1, 0, ""),
+	0x83: (0.01, 0, ""),
+	0x84: (0.001, 0, ""),
+	0x85: (0.0000305, 0, ""),
+	0x86: (0.000305, 0, ""),
+	0x8A: (0.122, 0, "mV"),
+	0x8B: (0.001, 0, "V"),
+	0x8C: (0.01, 0, "V"),
+	0x8D: (0.00390625, 0, "mA"),
+	0x8E: (0.001, 0, "A"),
+	0x90: (1, 0, "ms"),
+	0x96: (0.1, 0, "C"),
+	0x9C: (0.01, 0, "deg"),
+	0x9D: (0.5, 0, "deg"),
+	0xA8: (1, 0, "g/s"),
+	0xA9: (0.25, 0, "Pa/s"),
+	0xAD: (0.01, 0, "mg/stroke"),
+	0xAE: (0.1, 0, "mg/stroke"),
+	0xAF: (0.01, 0, "%"),
+	0xB0: (0.003052, 0, "%"),
+	0xB1: (2, 0, "mV/s"),
+	0xFC: (0.01, 0, "kPa"),
+	0xFD: (0.001, 0, "kPa"),
+	0xFE: (0.25, 0, "Pa"),
+}
 
-		return Result
-	PidFunctions["0907"] = PID0907
 
 
-# PID0908
+#/*******************************************************************/
+#/* Compile a PID definition into a PID function, which requests    */
+#/* the PID, or the equivalent freeze frame PID, and decodes the    */
+#/* response. The request and the number of bytes to remove from    */
+#/* each response line are worked out once, when compiled. Return   */
+#/* the PID function, with the functions it uses to get the request */
+#/* and to decode the response frames, so ELM327Async can await the */
+#/* request itself.                                                 */
+#/*******************************************************************/
+def CompilePidFunction(PID, DataLength, Decode):
+	Request = bytes(PID + "\r", 'UTF-8')
+	Service = 0x40 + int(PID[:2], 16)
+	PidByte = int(PID[2:], 16)
+	# Only Mode 01 PIDs are available from freeze frames.
+	FreezePID = None
+	if PID[:2] == '01':
+		FreezePID = "02" + PID[2:]
+	# Multiple message data starts with the message number byte, and is joined.
+	Join = (DataLength is None)
+	RemoveByteCount = 0
+	if Join == True:
+		RemoveByteCount = 1
+
+	# Return the request for the PID, or None when the ECU does not support the PID.
+	def PidRequest(self, FreezeIndex = -1):
+		Result = None
+
+		if FreezeIndex == -1 or FreezePID is None:
+			if PID in self.ValidPIDs:
+				Result = Request
+		else:
+			ThisFreezePID = FreezePID + "{:02d}".format(FreezeIndex)
+			if ThisFreezePID in self.ValidFreezePIDs:
+				Result = bytes(ThisFreezePID + "\r", 'UTF-8')
 
+		return Result
 
-# PID0909 Get ECU name message count for PID 0A.
-	def PID0909(self, FreezeIndex = -1):
+	# Decode the response frames for the PID.
+	def PidDecode(self, Frames, FreezeIndex = -1):
 		Result = STRING_NO_DATA
 
-		if '0909' in self.ValidPIDs:
-			Response = self.GetResponse(b'0909\r')
-			Response = self.PruneData(Response, 2)
-			Result = int(Response, 16)
+		if FreezeIndex == -1 or FreezePID is None:
+			Payload = self.GetPayload(Frames, Service, PidByte, RemoveByteCount, Join)
+		else:
+			# Freeze frame responses also contain the frame number byte.
+			Payload = self.GetPayload(Frames, 0x42, PidByte, RemoveByteCount + 1, Join)
+		if Payload is not None:
+			Result = Decode(self, Payload)
 
 		return Result
-	PidFunctions["0909"] = PID0909
-
 
-# PID090A Get the current ECU Name from the ECU.
-	def PID090A(self, FreezeIndex = -1):
+	def PidFunction(self, FreezeIndex = -1):
 		Result = STRING_NO_DATA
 
-		if '090A' in self.ValidPIDs:
-			Response = self.GetResponse(b'090A\r')
-			Response = self.PruneData(Response, 3)
-			Result = str(bytearray.fromhex(Response).replace(bytes([0x00]), b' '), 'UTF-8')
+		ThisRequest = PidRequest(self, FreezeIndex)
+		if ThisRequest is not None:
+			Result = PidDecode(self, self.GetFrames(ThisRequest), FreezeIndex)
 
 		return Result
-	PidFunctions["090A"] = PID090A
 
+	return PidRequest, PidDecode, PidFunction
 
-# PID090B
 
 
-#/****************************************************************************/
-#/* ODBII MODE 0A - Permanent diagnostic trouble codes (DTCs, Cleared DTCs). */
-#/****************************************************************************/
+#/******************************************************************/
+#/* Compile the PID definitions into the PID functions, with their */
+#/* request and decode functions, and keep the number of data      */
+#/* bytes returned by each PID.                                    */
+#/******************************************************************/
+def CompilePidDefinitions():
+	for PID, DataLength, Decode in PID_DEFINITIONS:
+		PidRequests[PID], PidDecoders[PID], PidFunctions[PID] = CompilePidFunction(PID, DataLength, Decode)
+		if PID[:2] == '01':
+			PidRequests["02" + PID[2:]] = PidRequests[PID]
+			PidDecoders["02" + PID[2:]] = PidDecoders[PID]
+			PidFunctions["02" + PID[2:]] = PidFunctions[PID]
+		if DataLength is not None:
+			PidDataLength[PID] = DataLength
 
+CompilePidDefinitions()
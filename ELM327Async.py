@@ -0,0 +1,378 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#/***************************************************************************/
+#/* Raspberry Pi ELM327 OBBII CAN BUS Diagnostic Software.                  */
+#/*                                                                         */
+#/* Class: ELM327Async                                                      */
+#/* Handle communications with an ELM327 device using asyncio, so requests  */
+#/* can be awaited, given a deadline and cancelled. The serial port is      */
+#/* read from the event loop as data arrives, and the PID functions of the  */
+#/* ELM327 class decode the responses.                                      */
+#/***************************************************************************/
+
+
+
+import time
+import asyncio
+import ELM327
+import FreezeFrame
+
+
+
+# Longest time to wait for the ELM327 device to return to the prompt after a cancelled request.
+ELM_RESYNC_TIME_OUT = 1
+
+
+
+class ELM327Async(ELM327.ELM327):
+	def __init__(self):
+		ELM327.ELM327.__init__(self)
+
+		self.Lock = asyncio.Lock()
+		self.ReadFuture = None
+		self.ReadLength = 0
+		self.Resync = False
+
+
+
+#/********************************************************************/
+#/* Connect the ELM327 device to the CAN BUS on the ECU. The connect */
+#/* sequence is run by the ELM327 class in an executor thread, so    */
+#/* the event loop keeps running while the device initializes.       */
+#/********************************************************************/
+	async def Connect(self):
+		async with self.Lock:
+			self.Resync = False
+			Result = await asyncio.get_running_loop().run_in_executor(None, ELM327.ELM327.Connect, self)
+
+		return Result
+
+
+
+#/******************************************************************/
+#/* Get and return the information for the specified PID from the  */
+#/* ECU. A timeout in seconds can be given as a deadline for all   */
+#/* of the requests the PID needs, asyncio.TimeoutError is raised  */
+#/* when the deadline is exceeded.                                 */
+#/******************************************************************/
+	async def DoPID(self, PID, FreezeIndex = -1, Timeout = None):
+		return await asyncio.wait_for(self.RunPID(PID, FreezeIndex, {}), Timeout)
+
+
+
+#/*******************************************************************/
+#/* Get and return the information for a list of PIDs from the ECU, */
+#/* requesting batches of PIDs together as the ELM327 class does.   */
+#/* A timeout in seconds can be given as a deadline for all of the  */
+#/* PIDs.                                                           */
+#/*******************************************************************/
+	async def DoPIDs(self, PIDs, Timeout = None):
+		return await asyncio.wait_for(self.RunPIDs(PIDs), Timeout)
+
+
+
+#/*******************************************************************/
+#/* Read a freeze frame from the ECU, returning a snapshot of the   */
+#/* value of each PID the freeze frame supports, requesting batches */
+#/* of PIDs together as the ELM327 class does. A timeout in seconds */
+#/* can be given as a deadline for the whole freeze frame.          */
+#/*******************************************************************/
+	async def ReadFreezeFrame(self, FreezeIndex, Refresh = False, Timeout = None):
+		return await asyncio.wait_for(self.RunFreezeFrame(FreezeIndex, Refresh), Timeout)
+
+
+
+#/*******************************************************************/
+#/* Read the results of all of the on-board monitor tests from the  */
+#/* ECU, requesting each monitor once. A timeout in seconds can be  */
+#/* given as a deadline for all of the monitors.                    */
+#/*******************************************************************/
+	async def ReadMonitorTests(self, Timeout = None):
+		return await asyncio.wait_for(self.RunMonitorTests(), Timeout)
+
+
+
+#/*******************************************************************/
+#/* Get the trouble codes for the specified OBDII mode, with their  */
+#/* descriptions. A timeout in seconds can be given as a deadline.  */
+#/*******************************************************************/
+	async def GetTroubleCodeData(self, OBDIImode, Timeout = None):
+		Response = await asyncio.wait_for(self.Request(OBDIImode + b'\r'), Timeout)
+
+		return self.DecodeTroubleCodeData(self.ParseResponse(Response), OBDIImode)
+
+
+
+#/*******************************************************************/
+#/* Return a list of PIDs the currently connected ECU supports, or  */
+#/* the PIDs a freeze frame supports, requesting the PIDs a freeze  */
+#/* frame supports as the ELM327 class does.                        */
+#/*******************************************************************/
+	async def GetValidPIDs(self, FreezeIndex = -1, Refresh = False):
+		Result = self.ValidPIDs
+
+		if FreezeIndex != -1:
+			if Refresh == True or FreezeIndex not in self.FreezeSupport:
+				await self.LoadFreezeSupport(FreezeIndex)
+			Result = self.FreezeSupport[FreezeIndex]
+
+		return Result
+
+
+
+#/********************************************************************/
+#/* Request the PIDs a freeze frame supports from the ECU, replacing */
+#/* any PIDs previously found for the freeze frame. Each range of    */
+#/* PIDs is only requested when the last PID of the previous range   */
+#/* is supported.                                                    */
+#/********************************************************************/
+	async def LoadFreezeSupport(self, FreezeIndex):
+		ThisFreezeIndex = "{:02d}".format(FreezeIndex)
+		self.RemoveFreezeSupport(FreezeIndex)
+
+		for Range in range(0x00, 0xE0, 0x20):
+			PidStart = '%2.2X' % Range
+			if Range == 0x00 or '02' + PidStart + ThisFreezeIndex in self.ValidFreezePIDs:
+				Response = await self.Request(bytearray('02' + PidStart + ThisFreezeIndex + '\r', 'UTF-8'))
+				Response = self.CountPidResponses('02', Response, PidStart, 3)
+				self.ResolvePidData('02', Response, PidStart, self.PidDescriptionsMode01, FreezeIndex)
+
+		self.KeepFreezeSupport(FreezeIndex)
+
+
+
+#/****************************************************************/
+#/* Send a request to the ELM327 device and await the response.  */
+#/* Requests are sent one at a time, in the order they are made. */
+#/* When a request is cancelled, or it's deadline is exceeded,   */
+#/* the ELM327 device is brought back to the prompt before the   */
+#/* next request is sent. A response timeout tuned while         */
+#/* processing the last response is set before the next OBDII    */
+#/* request is sent.                                             */
+#/****************************************************************/
+	async def Request(self, Data, Timeout = ELM327.SERIAL_PORT_TIME_OUT):
+		async with self.Lock:
+			if self.Resync == True:
+				await self.ResyncDevice()
+			if self.TimeoutPending is not None and Data[:2] != b'AT':
+				PendingTimeout = self.TimeoutPending
+				self.TimeoutPending = None
+				Response = await self.Exchange(bytearray("AT ST " + "{:02X}".format(PendingTimeout) + "\r", 'UTF-8'), ELM327.SERIAL_PORT_TIME_OUT)
+				if Response == 'OK\n':
+					self.Timeout = PendingTimeout
+			Result = await self.Exchange(Data, Timeout)
+
+		return Result
+
+
+
+#/******************************************************************/
+#/* Send a request and await the response, while holding the lock. */
+#/******************************************************************/
+	async def Exchange(self, Data, Timeout):
+		try:
+			Data = self.SendRequest(Data)
+			Response = await asyncio.wait_for(self.ReadResponseAsync(), Timeout)
+		except BaseException:
+			# The response is abandoned, and the ELM327 device may still be sending it.
+			self.Resync = True
+			raise
+
+		return self.ProcessResponse(Data, Response)
+
+
+
+#/*****************************************************************/
+#/* Read a response from the ELM327 device, up to the '>' prompt  */
+#/* character. The serial port is read by the event loop whenever */
+#/* data is waiting.                                              */
+#/*****************************************************************/
+	async def ReadResponseAsync(self):
+		Loop = asyncio.get_running_loop()
+		self.ReadFuture = Loop.create_future()
+		self.ReadLength = 0
+		self.PromptReceived = False
+		Loop.add_reader(self.ELM327.fileno(), self.DataReceived)
+		try:
+			Result = await self.ReadFuture
+		finally:
+			Loop.remove_reader(self.ELM327.fileno())
+			self.ReadFuture = None
+
+		return Result
+
+
+
+#/**************************************************************/
+#/* Read the waiting data into the preallocated read buffer,   */
+#/* completing the response when the prompt character arrives. */
+#/**************************************************************/
+	def DataReceived(self):
+		if self.ReadFuture is None or self.ReadFuture.done() == True:
+			return
+
+		try:
+			Data = self.ELM327.read(max(self.ELM327.in_waiting, 1))
+		except Exception as Catch:
+			self.ReadFuture.set_exception(Catch)
+			return
+
+		if len(Data) > 0:
+			if self.ReadLength == 0:
+				self.FirstByteTime = time.monotonic()
+			if self.ReadLength + len(Data) > len(self.ReadBuffer):
+				self.ReadBuffer.extend(bytearray(max(self.ReadLength + len(Data) - len(self.ReadBuffer), ELM327.SERIAL_READ_BUFFER_SIZE)))
+			self.ReadBuffer[self.ReadLength:self.ReadLength + len(Data)] = Data
+			Prompt = self.ReadBuffer.find(b'>', self.ReadLength, self.ReadLength + len(Data))
+			self.ReadLength += len(Data)
+			if Prompt != -1:
+				self.ReceiveTime = time.monotonic()
+				self.PromptReceived = True
+				self.ReadFuture.set_result(self.RejectCharacters(bytes(self.ReadBuffer[:Prompt])))
+
+
+
+#/********************************************************************/
+#/* Bring the ELM327 device back to the prompt after an abandoned    */
+#/* request. Wait for the prompt which ends the abandoned response,  */
+#/* otherwise any request still in progress is interrupted by        */
+#/* sending an identification request, which is answered with the    */
+#/* identification, or with '?' when the first character was used to */
+#/* interrupt the request.                                           */
+#/********************************************************************/
+	async def ResyncDevice(self):
+		self.LastCommand = b''
+		try:
+			await asyncio.wait_for(self.ReadResponseAsync(), ELM_RESYNC_TIME_OUT)
+		except asyncio.TimeoutError:
+			self.ELM327.write(bytearray("AT I", 'UTF-8') + ELM327.SERIAL_LINEFEED_TYPE)
+			# All of the data read is checked, as more than one prompt can be read at once.
+			Found = False
+			while Found == False:
+				await asyncio.wait_for(self.ReadResponseAsync(), ELM_RESYNC_TIME_OUT)
+				Found = (self.ReadBuffer.find(b'ELM', 0, self.ReadLength) != -1 or self.ReadBuffer.find(b'?', 0, self.ReadLength) != -1)
+		self.Resync = False
+
+
+
+#/*******************************************************************/
+#/* Get the information for a PID. A PID which returns data is      */
+#/* requested, unless it's response frames were already received as */
+#/* part of a multiple PID request, and the frames are decoded. The */
+#/* supported PID functions, which update the supported PIDs, are   */
+#/* run by the ELM327 class in an executor thread, as Connect is.   */
+#/*******************************************************************/
+	async def RunPID(self, PID, FreezeIndex, Frames):
+		try:
+			if PID in ELM327.PidDecoders:
+				Result = ELM327.STRING_NO_DATA
+				Request = ELM327.PidRequests[PID](self, FreezeIndex)
+				if Request is not None:
+					if Request in Frames:
+						PidFrames = Frames[Request]
+					else:
+						PidFrames = self.ParseResponse(await self.Request(Request))
+					Result = ELM327.PidDecoders[PID](self, PidFrames, FreezeIndex)
+			elif PID == "03" or PID == "07":
+				Result = await self.GetTroubleCodeData(bytes(PID, 'UTF-8'))
+			elif PID == "04":
+				Result = await self.Request(b'04\r')
+				# The freeze frames are also erased.
+				self.ClearFreezeSupport()
+			elif PID in ELM327.PidFunctions:
+				async with self.Lock:
+					if self.Resync == True:
+						await self.ResyncDevice()
+					Result = await asyncio.get_running_loop().run_in_executor(None, ELM327.PidFunctions[PID], self, FreezeIndex)
+			else:
+				Result = ELM327.STRING_NOT_IMPLEMENTED
+		except asyncio.TimeoutError:
+			raise
+		except Exception as Catch:
+			print(ELM327.STRING_ERROR + " in PID" + str(PID) + " : " + str(Catch))
+			Result = ELM327.STRING_ERROR
+
+		return Result
+
+
+
+#/*************************************************************/
+#/* Request each batch of PIDs, then run the PID function for */
+#/* each PID with the split response frames. Any PID missing  */
+#/* from a batch response is requested on it's own.           */
+#/*************************************************************/
+	async def RunPIDs(self, PIDs):
+		Result = {}
+
+		Frames = {}
+		for BatchPIDs in self.GetBatches(PIDs):
+			try:
+				Response = await self.Request(self.GetBatchRequest(BatchPIDs))
+				Frames.update(self.GetBatchResponses(Response))
+			except asyncio.TimeoutError:
+				raise
+			except Exception as Catch:
+				print(ELM327.STRING_ERROR + " in PIDs " + str(BatchPIDs) + " : " + str(Catch))
+		for PID in PIDs:
+			if PID not in Result:
+				Result[PID] = await self.RunPID(PID, -1, Frames)
+
+		return Result
+
+
+
+#/*******************************************************************/
+#/* Find the PIDs a freeze frame supports, request each batch of    */
+#/* PIDs, then run the PID function for each PID with the split     */
+#/* response frames. Any PID missing from a batch response is       */
+#/* requested on it's own.                                          */
+#/*******************************************************************/
+	async def RunFreezeFrame(self, FreezeIndex, Refresh):
+		Result = FreezeFrame.FreezeFrame(FreezeIndex)
+
+		ValidPIDs = await self.GetValidPIDs(FreezeIndex, Refresh)
+		PIDs = self.GetFreezeFramePIDs(ValidPIDs)
+		Frames = {}
+		for BatchPIDs in self.GetFreezeBatches(PIDs):
+			try:
+				Response = await self.Request(self.GetFreezeBatchRequest(BatchPIDs))
+				Frames.update(self.GetBatchResponses(Response, FreezeIndex))
+			except asyncio.TimeoutError:
+				raise
+			except Exception as Catch:
+				print(ELM327.STRING_ERROR + " in PIDs " + str(BatchPIDs) + " : " + str(Catch))
+		for PID in PIDs:
+			Result.SetValue(PID, ValidPIDs[PID], await self.RunPID(PID[:4], FreezeIndex, Frames))
+
+		return Result
+
+
+
+#/******************************************************************/
+#/* Request the test results of each monitor the ECU supports. Any */
+#/* monitor which fails is reported and left out of the results.   */
+#/******************************************************************/
+	async def RunMonitorTests(self):
+		Result = []
+
+		for MonitorId in self.GetMonitorIDs():
+			try:
+				Response = await self.Request(bytearray(MonitorId + '\r', 'UTF-8'))
+				Result += self.DecodeMonitorId(self.ParseResponse(Response), MonitorId)
+			except asyncio.TimeoutError:
+				raise
+			except Exception as Catch:
+				print(ELM327.STRING_ERROR + " in PID" + MonitorId + " : " + str(Catch))
+
+		return Result
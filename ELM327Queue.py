@@ -0,0 +1,142 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#/***************************************************************************/
+#/* Raspberry Pi ELM327 OBBII CAN BUS Diagnostic Software.                  */
+#/*                                                                         */
+#/* Class: ELM327Queue                                                      */
+#/* A single long-lived thread which owns the ELM327 device, running queued */
+#/* named requests one at a time in order of priority. Each request returns */
+#/* a future for it's result, so requests made while the ELM327 device is   */
+#/* busy are queued rather than ignored, and no thread is created for each  */
+#/* request. The thread is restarted if it stops unexpectedly.              */
+#/***************************************************************************/
+
+
+
+import queue
+import ELM327
+import itertools
+import threading
+import concurrent.futures
+
+
+
+# Request priorities, lower values are run first.
+PRIORITY_HIGH = 0
+PRIORITY_MEDIUM = 1
+PRIORITY_LOW = 2
+
+# Priority of the request which stops the thread, after all other requests.
+PRIORITY_STOP = 99
+
+
+
+class ELM327Queue:
+	def __init__(self):
+		self.Requests = queue.PriorityQueue()
+		# Requests of the same priority are run in the order they are made.
+		self.Sequence = itertools.count()
+		self.Busy = False
+		self.TaskName = ""
+		self.Closed = False
+		self.Thread = None
+		self.StartThread()
+
+
+
+#/********************************************************************/
+#/* Start the ELM327 thread, or restart it if it has stopped without */
+#/* being closed.                                                    */
+#/********************************************************************/
+	def StartThread(self):
+		if self.Closed == False and (self.Thread is None or self.Thread.is_alive() == False):
+			if self.Thread is not None:
+				print(ELM327.STRING_ERROR + " ELM327 THREAD STOPPED, RESTARTING")
+			self.Busy = False
+			self.Thread = threading.Thread(target = self.RequestLoop, name = "ELM327", daemon = True)
+			self.Thread.start()
+
+
+
+#/*******************************************************************/
+#/* Queue a function to be run by the ELM327 thread, with the       */
+#/* specified priority. The name identifies the request in any      */
+#/* error reported. Return a future for the function's result, once */
+#/* closed the future returned is already cancelled.                */
+#/*******************************************************************/
+	def Submit(self, Priority, Name, Function, *Arguments):
+		Future = concurrent.futures.Future()
+		if self.Closed == True:
+			Future.cancel()
+		else:
+			self.StartThread()
+			self.Requests.put((Priority, next(self.Sequence), Future, Name, Function, Arguments))
+
+		return Future
+
+
+
+#/*********************************************************************/
+#/* Check if the ELM327 thread is running a request, or has requests  */
+#/* waiting to be run.                                                */
+#/*********************************************************************/
+	def IsBusy(self):
+		return self.Busy == True or self.Requests.empty() == False
+
+
+
+#/*************************************************************/
+#/* Return the name of the request currently being run, or an */
+#/* empty string when no request is being run.                */
+#/*************************************************************/
+	def GetTaskName(self):
+		return self.TaskName
+
+
+
+#/*******************************************************************/
+#/* Stop the ELM327 thread once the request currently being run is  */
+#/* complete, waiting up to the specified time for it to finish.    */
+#/* Requests still waiting to be run are cancelled.                 */
+#/*******************************************************************/
+	def Close(self, Timeout = None):
+		self.Closed = True
+		self.Requests.put((PRIORITY_STOP, next(self.Sequence), None, "", None, None))
+		self.Thread.join(Timeout)
+
+
+
+#/**************************************************************/
+#/* Run the queued requests in order of priority, until a stop */
+#/* request is received. Any exception raised by a request is  */
+#/* reported with the request name, and returned in it's       */
+#/* future. Once closed, waiting requests are cancelled.       */
+#/**************************************************************/
+	def RequestLoop(self):
+		while True:
+			Priority, Sequence, Future, Name, Function, Arguments = self.Requests.get()
+			if Future is None:
+				break
+			if self.Closed == True:
+				Future.cancel()
+			elif Future.set_running_or_notify_cancel() == True:
+				self.Busy = True
+				self.TaskName = Name
+				try:
+					Future.set_result(Function(*Arguments))
+				except BaseException as Catch:
+					print(ELM327.STRING_ERROR + " in " + Name + " : " + str(Catch))
+					Future.set_exception(Catch)
+				self.TaskName = ""
+				self.Busy = False
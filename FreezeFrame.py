@@ -0,0 +1,107 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#/***************************************************************************/
+#/* Raspberry Pi ELM327 OBBII CAN BUS Diagnostic Software.                  */
+#/*                                                                         */
+#/* Class: FreezeFrame                                                      */
+#/* A snapshot of a freeze frame read from the ECU. The data the ECU stored */
+#/* when a trouble code was set, with the description and value of each     */
+#/* PID the freeze frame supports, and the trouble code which caused the    */
+#/* freeze frame to be stored.                                              */
+#/***************************************************************************/
+
+
+
+import time
+
+
+
+# PID of the trouble code which caused the freeze frame to be stored.
+FREEZE_TROUBLE_CODE_PID = "0202"
+
+
+
+class FreezeFrame:
+	def __init__(self, FreezeIndex):
+		self.FreezeIndex = FreezeIndex
+		self.ReadTime = time.time()
+		self.Descriptions = {}
+		self.Values = {}
+
+
+
+#/***********************************************************/
+#/* Add the description and value of a PID to the snapshot. */
+#/***********************************************************/
+	def SetValue(self, PID, Description, Value):
+		self.Descriptions[PID] = Description
+		self.Values[PID] = Value
+
+
+
+#/****************************************************/
+#/* Return the index of the freeze frame on the ECU. */
+#/****************************************************/
+	def GetFreezeIndex(self):
+		return self.FreezeIndex
+
+
+
+#/******************************************************/
+#/* Return the time the freeze frame was read from the */
+#/* ECU, in seconds since the epoch.                   */
+#/******************************************************/
+	def GetReadTime(self):
+		return self.ReadTime
+
+
+
+#/**********************************************/
+#/* Return the PIDs in the snapshot, in order. */
+#/**********************************************/
+	def GetPIDs(self):
+		return sorted(self.Values)
+
+
+
+#/*********************************************/
+#/* Return the description of a PID, or None  */
+#/* when the PID is not in the snapshot.      */
+#/*********************************************/
+	def GetDescription(self, PID):
+		return self.Descriptions.get(PID)
+
+
+
+#/****************************************/
+#/* Return the value of a PID, or None   */
+#/* when the PID is not in the snapshot. */
+#/****************************************/
+	def GetValue(self, PID):
+		return self.Values.get(PID)
+
+
+
+#/*******************************************************************/
+#/* Return the trouble code which caused the freeze frame to be     */
+#/* stored, with it's description, or None when it was not read.    */
+#/*******************************************************************/
+	def GetTroubleCode(self):
+		Result = None
+
+		for PID in self.Values:
+			if PID[:4] == FREEZE_TROUBLE_CODE_PID:
+				Result = self.Values[PID]
+
+		return Result
@@ -0,0 +1,116 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#/***************************************************************************/
+#/* Raspberry Pi ELM327 OBBII CAN BUS Diagnostic Software.                  */
+#/*                                                                         */
+#/* Class: MonitorTest                                                      */
+#/* The result of one Mode 06 on-board monitor test read from the ECU. The  */
+#/* test value with it's minimum and maximum limits, scaled to the units of */
+#/* the test. On a CAN BUS the test is identified by the monitor ID and the */
+#/* test ID, on other protocols by the test ID and the component ID, and    */
+#/* only one of the limits is given.                                        */
+#/***************************************************************************/
+
+
+
+class MonitorTest:
+	def __init__(self, MonitorId, MonitorDescription, TestId, TestDescription, Value, Minimum, Maximum, Unit):
+		self.MonitorId = MonitorId
+		self.MonitorDescription = MonitorDescription
+		self.TestId = TestId
+		self.TestDescription = TestDescription
+		self.Value = Value
+		self.Minimum = Minimum
+		self.Maximum = Maximum
+		self.Unit = Unit
+
+
+
+#/**********************************************************/
+#/* Return the Mode 06 PID of the monitor, such as "0621". */
+#/**********************************************************/
+	def GetMonitorId(self):
+		return self.MonitorId
+
+
+
+#/******************************************/
+#/* Return the description of the monitor. */
+#/******************************************/
+	def GetMonitorDescription(self):
+		return self.MonitorDescription
+
+
+
+#/********************************************************/
+#/* Return the test ID, or the component ID on protocols */
+#/* other than CAN BUS, as a two digit hex string.       */
+#/********************************************************/
+	def GetTestId(self):
+		return self.TestId
+
+
+
+#/***************************************/
+#/* Return the description of the test. */
+#/***************************************/
+	def GetTestDescription(self):
+		return self.TestDescription
+
+
+
+#/*********************************/
+#/* Return the scaled test value. */
+#/*********************************/
+	def GetValue(self):
+		return self.Value
+
+
+
+#/************************************************************/
+#/* Return the scaled minimum limit, or None when not given. */
+#/************************************************************/
+	def GetMinimum(self):
+		return self.Minimum
+
+
+
+#/************************************************************/
+#/* Return the scaled maximum limit, or None when not given. */
+#/************************************************************/
+	def GetMaximum(self):
+		return self.Maximum
+
+
+
+#/******************************************************/
+#/* Return the units of the test value and the limits. */
+#/******************************************************/
+	def GetUnit(self):
+		return self.Unit
+
+
+
+#/******************************************************************/
+#/* Check the test value is within the minimum and maximum limits. */
+#/******************************************************************/
+	def IsPassed(self):
+		Result = True
+
+		if self.Minimum is not None and self.Value < self.Minimum:
+			Result = False
+		if self.Maximum is not None and self.Value > self.Maximum:
+			Result = False
+
+		return Result
@@ -63,16 +63,22 @@
 #/***************************************************************************/
 
 
+import sys
+import time
 import subprocess
 import datetime
 import random
-import _thread
+import threading
 import pygame
 import ELM327
+import ELM327Queue
 import Visual
 import Button
 import Gadgit
 import Plot
+import Acquisition
+import TripLogger
+import TripReplay
 import Config
 import Select
 import Confirm
@@ -83,24 +89,43 @@ import PDF
 
 DISPLAY_PERIOD = 100
 TIMER_PERIOD = 500
+# Longest period to wait between aquisition checks, while no PIDs are due to be refreshed.
+AQUISITION_WAIT_PERIOD = 0.1
+# Period in seconds to move a trip log replay backward or forward.
+REPLAY_SEEK_PERIOD = 10
 
 
 # Start value for pygame user events.
 EVENT_TIMER = pygame.USEREVENT + 1
 
-# Lock to prevent ELM327 communications occuring when an existing one still running.
-LockELM327 = _thread.allocate_lock()
-
-# Lock to prevent multiple aquisition threads of execution.
-LockAquisition = _thread.allocate_lock()
+# Set while data aquisition is on, the aquisition thread waits for it while stopped.
+AquisitionGo = threading.Event()
+# Flag to finish the aquisition thread.
+AquisitionExit = False
 
 # List of visual class instances to be flashed.
 FlashVisuals = {}
 
+# Position in the aquisition sample buffer the display has read up to.
+SamplePosition = 0
+
+# Report currently being created, and the message to display once created.
+ReportFuture = None
+ReportMessage = ""
+
 #  /***************************************/
 # /* Create application class instances. */
 #/***************************************/
 ThisELM327 = ELM327.ELM327()
+ThisELM327Queue = ELM327Queue.ELM327Queue()
+# Replay a trip log in place of the ECU, when a trip log file name is given on the command line.
+ThisTripReplay = None
+if len(sys.argv) > 1:
+	ThisTripReplay = TripReplay.TripReplay(sys.argv[1], ThisELM327)
+	ThisAcquisition = Acquisition.Acquisition(ThisTripReplay)
+else:
+	ThisAcquisition = Acquisition.Acquisition(ThisELM327)
+ThisTripLogger = TripLogger.TripLogger(ThisAcquisition.Samples)
 ThisDisplay = Display.Display()
 ThisPDF = PDF.PDF()
 
@@ -127,6 +152,11 @@ def ApplyConfig():
 	ThisDisplay.DEBUG = Config.ConfigValues["Debug"]
 	ThisELM327.LoadVehicle(Config.ConfigValues["Vehicle"])
 	Visual.VisualZOrder[0].SetFont(Config.ConfigValues["FontName"])
+	# Log the aquired data to disk while trip logging is on, a trip log being replayed is not logged again.
+	if Config.ConfigValues["TripLog"] == "ON" and ThisTripReplay is None:
+		ThisTripLogger.Start()
+	else:
+		ThisTripLogger.Stop()
 
 
 
@@ -154,20 +184,15 @@ def PrintPdfReport():
 def SavePdfReport(FileName):
 	ThisDisplay.Buttons["BUSY"].SetVisible(True)
 	ThisDisplay.Buttons["BUSY"].SetDown(True)
-	ThisDisplay.Display()
 	try:
 		# Get OBDII vehicle data.
-		if LockELM327.acquire(0):
-			VehicleData(ThisDisplay)
+		VehicleData(ThisDisplay)
 		# Get OBDII trouble data.
-		if LockELM327.acquire(0):
-			TroubleInfo(ThisDisplay)
+		TroubleInfo(ThisDisplay)
 		# Get OBDII data frame.
-		if LockELM327.acquire(0):
-			FrameData(ThisDisplay)
+		FrameData(ThisDisplay)
 		# Get OBDII freeze frame.
-		if LockELM327.acquire(0):
-			FreezeFrameData(ThisDisplay)
+		FreezeFrameData(ThisDisplay)
 		# Add data to the PDF report.
 		Now = datetime.datetime.now()
 		NowTime = Now.strftime("%H:%M")
@@ -189,6 +214,23 @@ def SavePdfReport(FileName):
 
 
 
+#/***********************************************************/
+#/* Save OBDII report as a PDF file, named with the current */
+#/* date and time and the vehicle VIN.                      */
+#/***********************************************************/
+def SaveDatedPdfReport():
+	# Get the date and time for the report filename.
+	Now = datetime.datetime.now()
+	FileName = "SAVE/"
+	FileName += Now.strftime("%Y-%m-%d_%H-%M-%S_")
+	# Get Vehicle VIN for report filename.
+	FileName += ThisELM327.DoPID("0902").replace(' ', '') + ".pdf"
+
+	# Save PDF Report.
+	return SavePdfReport(FileName)
+
+
+
 #/***************************************************/
 #/* Perform a connection to the CAN BUS of the ECU. */
 #/***************************************************/
@@ -218,8 +260,6 @@ def ConnectELM327(ThisDisplay):
 	# Stop flashing connect button after connection attempt.
 	FlashVisuals.pop("CONNECT", None)
 	ThisDisplay.ELM327Info["CONNECT"].SetDown(False)
-	# Allow another ELM327 communication now this one is complete.
-	LockELM327.release()
 	# Check for MIL status after connection attempt.
 	if ThisELM327.GetMilOn() == True:
 		FlashVisuals["MIL"] = ThisDisplay.Buttons["MIL"]
@@ -232,6 +272,42 @@ def ConnectELM327(ThisDisplay):
 
 
 
+#/*******************************************************************/
+#/* Start replaying a trip log, loading the meters and plots with   */
+#/* the PIDs in the log.                                            */
+#/*******************************************************************/
+def ReplayTrip(ThisDisplay):
+	try:
+		StartTime, EndTime = ThisTripReplay.GetTimeRange()
+		ThisDisplay.SetVisualText(ThisDisplay.ELM327Info, "INFO", "REPLAYING TRIP LOG: " + sys.argv[1] + "\n", False)
+		ThisDisplay.SetVisualText(ThisDisplay.ELM327Info, "INFO", "STARTED: " + datetime.datetime.fromtimestamp(StartTime).strftime("%Y-%m-%d %H:%M:%S") + "\n", True)
+		ThisDisplay.SetVisualText(ThisDisplay.ELM327Info, "INFO", "LENGTH: " + str(datetime.timedelta(seconds = int(EndTime))) + "\n", True)
+		ThisDisplay.SetVisualText(ThisDisplay.ELM327Info, "INFO", "SPACE: PAUSE/RESUME, RETURN: STEP, LEFT/RIGHT: -/+" + str(REPLAY_SEEK_PERIOD) + "s, UP/DOWN: SPEED\n", True)
+	except Exception as Catch:
+		print(str(Catch))
+	# Get a list of the PIDs in the trip log.
+	ValidPIDs = ThisTripReplay.GetValidPIDs()
+	# Resume the state of the meters tab where last saved.
+	ThisDisplay.LoadMetersTab(ValidPIDs)
+	# Load the config for the plot series.
+	ThisDisplay.Plots["PLOT"].LoadSeriesConfig(ValidPIDs)
+
+
+
+#/*******************************************************************/
+#/* Return a list of PIDs supported by the ECU, or the PIDs in the  */
+#/* trip log while replaying a trip log.                            */
+#/*******************************************************************/
+def GetValidPIDs():
+	if ThisTripReplay is not None:
+		Result = ThisTripReplay.GetValidPIDs()
+	else:
+		Result = ThisELM327.GetValidPIDs()
+
+	return Result
+
+
+
 #/**********************************************/
 #/* Get a frame of all valid PIDs for Mode 01. */
 #/**********************************************/
@@ -249,28 +325,25 @@ def FrameData(ThisDisplay):
 					ThisDisplay.SetVisualText(ThisDisplay.FrameData, "INFO", "[" + PID + "] " + ValidPIDs[PID] + "\n", True, PidData)
 	except Exception as Catch:
 		print(str(Catch))
-	# Allow another ELM327 communication now this one is complete.
-	LockELM327.release()
 
 
 
-#/*****************************************************/
-#/* Get a freeze frame of all valid PIDs for Mode 02. */
-#/*****************************************************/
-def FreezeFrameData(ThisDisplay):
+#/*******************************************************************/
+#/* Get a freeze frame of all valid PIDs for Mode 02. The PIDs each */
+#/* freeze frame supports are only requested from the ECU again     */
+#/* when refreshed.                                                 */
+#/*******************************************************************/
+def FreezeFrameData(ThisDisplay, Refresh = False):
 	try:
+		ThisDisplay.SetVisualText(ThisDisplay.FreezeFrameData, "INFO", "", False)
 		for FreezeIndex in range(ThisELM327.GetFreezeFrameCount()):
-			# Get a list of all valid PIDs the connected ECU supports.
-			ValidPIDs = ThisELM327.GetValidPIDs(FreezeIndex)
-			# Get the information available for each of the supported PIDs.
-			ThisDisplay.SetVisualText(ThisDisplay.FreezeFrameData, "INFO", "", False)
-			for PID in sorted(ValidPIDs):
-				PidData = ThisELM327.DoPID(PID[:4], FreezeIndex)
-				ThisDisplay.SetVisualText(ThisDisplay.FreezeFrameData, "INFO", "[" + PID + "] " + ValidPIDs[PID] + "\n", True, PidData)
+			# Read a snapshot of all of the PIDs the freeze frame supports.
+			ThisFreezeFrame = ThisELM327.ReadFreezeFrame(FreezeIndex, Refresh)
+			# Display the information returned for each of the supported PIDs.
+			for PID in ThisFreezeFrame.GetPIDs():
+				ThisDisplay.SetVisualText(ThisDisplay.FreezeFrameData, "INFO", "[" + PID + "] " + ThisFreezeFrame.GetDescription(PID) + "\n", True, ThisFreezeFrame.GetValue(PID))
 	except Exception as Catch:
 		print(str(Catch))
-	# Allow another ELM327 communication now this one is complete.
-	LockELM327.release()
 
 
 
@@ -291,8 +364,6 @@ def VehicleData(ThisDisplay):
 					ThisDisplay.SetVisualText(ThisDisplay.VehicleInfo, "INFO", "[" + PID + "] " + ValidPIDs[PID] + "\n", True, PidData)
 	except Exception as Catch:
 		print(str(Catch))
-	# Allow another ELM327 communication now this one is complete.
-	LockELM327.release()
 
 
 
@@ -320,10 +391,24 @@ def TroubleInfo(ThisDisplay):
 		if TroubleCodes != ELM327.STRING_ERROR:
 			for TroubleCode in sorted(TroubleCodes):
 				ThisDisplay.SetVisualText(ThisDisplay.TroubleInfo, "INFO", str(TroubleCode) + " " + str(TroubleCodes[TroubleCode]) + "\n", True)
+
+		# Display the results of all of the on-board monitor tests, with their limits.
+		MonitorTests = ThisELM327.ReadMonitorTests()
+		ThisDisplay.SetVisualText(ThisDisplay.TroubleInfo, "INFO", "\nMONITOR TEST RESULTS [" + str(len(MonitorTests)) + "]:\n", True)
+		for ThisTest in MonitorTests:
+			TestText = "{:.3f} {:s} [".format(ThisTest.GetValue(), ThisTest.GetUnit())
+			if ThisTest.GetMinimum() is not None:
+				TestText += "MIN {:.3f} ".format(ThisTest.GetMinimum())
+			if ThisTest.GetMaximum() is not None:
+				TestText += "MAX {:.3f} ".format(ThisTest.GetMaximum())
+			if ThisTest.IsPassed() == True:
+				TestText += "PASS]"
+			else:
+				TestText += "FAIL]"
+			ThisDisplay.SetVisualText(ThisDisplay.TroubleInfo, "INFO", "[" + ThisTest.GetMonitorId() + ":" + ThisTest.GetTestId() + "] " + ThisTest.GetMonitorDescription() + " - " + ThisTest.GetTestDescription() + "\n", True)
+			ThisDisplay.SetVisualText(ThisDisplay.TroubleInfo, "INFO", TestText + "\n", True)
 	except Exception as Catch:
 		print(str(Catch))
-	# Allow another ELM327 communication now this one is complete.
-	LockELM327.release()
 
 
 
@@ -335,79 +420,141 @@ def ClearTroubleInfo(ThisDisplay):
 		TroubleCodes = ThisELM327.DoPID("04")
 	except Exception as Catch:
 		print(str(Catch))
-	# Allow another ELM327 communication now this one is complete.
-	LockELM327.release()
-	if LockELM327.acquire(0):
-		_thread.start_new_thread(TroubleInfo, (ThisDisplay, ))
+	TroubleInfo(ThisDisplay)
 
 
 
-#/*********************************************************/
-#/* Update the data for the created gadgits from the ECU. */
-#/*********************************************************/
-def MeterData(ThisDisplay):
-	ThisDisplay.Buttons["BUSY"].SetVisible(True)
-	FlashVisuals["BUSY"] = ThisDisplay.Buttons["BUSY"]
-	try:
-		# Get the information available for each of the meter related PIDs.
+#/********************************************************************/
+#/* Return the PIDs needed by the meters, while the meters are being */
+#/* aquired, whichever tab is currently displayed.                   */
+#/********************************************************************/
+def GetMeterPIDs():
+	PIDs = []
+	if ThisDisplay.Meters["LOCK"].GetDown() == True and ThisDisplay.Meters["GO_STOP"].GetDown() == True:
 		for ThisGadgit in ThisDisplay.Meters:
 			if type(ThisDisplay.Meters[ThisGadgit]) is Gadgit.Gadgit:
-				PID = ThisDisplay.Meters[ThisGadgit].GetPID()
-				if PID != "":
-					# Store the information returned for the current PID on the related meter.
-					PidData = ThisELM327.DoPID(PID)
-					ThisDisplay.Meters[ThisGadgit].SetData(PidData)
-	except Exception as Catch:
-		print(str(Catch))
-	# Allow another ELM327 communication now this one is complete.
-	LockELM327.release()
-	FlashVisuals.pop("BUSY", None)
-	ThisDisplay.Buttons["BUSY"].SetVisible(False)
+				PIDs.append(ThisDisplay.Meters[ThisGadgit].GetPID())
+
+	return PIDs
 
 
 
-#/*********************************************************/
-#/* Update the data for the created gadgits from the ECU. */
-#/*********************************************************/
-def PlotData(ThisDisplay):
+#/*******************************************************************/
+#/* Store the information returned for a PID on each related meter. */
+#/*******************************************************************/
+def SetMeterData(PID, PidData):
+	for ThisGadgit in ThisDisplay.Meters:
+		if type(ThisDisplay.Meters[ThisGadgit]) is Gadgit.Gadgit and ThisDisplay.Meters[ThisGadgit].GetPID() == PID:
+			ThisDisplay.Meters[ThisGadgit].SetData(PidData)
+
+
+
+#/******************************************************************/
+#/* Return the PIDs needed by the plot series, while the plots are */
+#/* being aquired, whichever tab is currently displayed.           */
+#/******************************************************************/
+def GetPlotPIDs():
+	PIDs = []
+	if ThisDisplay.Plots["GO_STOP"].GetDown() == True:
+		for Index in range(Plot.PLOT_COUNT):
+			if ThisDisplay.Plots["PLOT"].IsDataEnd(Index) == False:
+				PIDs.append(ThisDisplay.Plots["PLOT"].GetPID(Index))
+
+	return PIDs
+
+
+
+#/*******************************************************************/
+#/* Plot the information returned for a PID on each related series, */
+#/* at the time the information was sampled.                        */
+#/*******************************************************************/
+def SetPlotData(PID, PidData, SampleTime):
+	for Index in range(Plot.PLOT_COUNT):
+		if ThisDisplay.Plots["PLOT"].IsDataEnd(Index) == False and ThisDisplay.Plots["PLOT"].GetPID(Index) == PID:
+			ThisDisplay.Plots["PLOT"].SetData(Index, PidData, SampleTime)
+
+
+
+#/*******************************************************************/
+#/* Update the meters and plots with the samples aquired since they */
+#/* were last updated. The samples are read once for each display   */
+#/* update, so the meters and plots are only changed by the thread  */
+#/* which displays them. Meters show the latest value of each PID,  */
+#/* and plots add a point for each sample, at the time mid way      */
+#/* between the request and the response. Return the position read  */
+#/* up to in the sample buffer.                                     */
+#/*******************************************************************/
+def DisplaySamples(SamplePosition):
+	SamplePosition, Samples = ThisAcquisition.Samples.Read(SamplePosition)
+	if len(Samples) > 0:
+		MeterPIDs = GetMeterPIDs()
+		PlotPIDs = GetPlotPIDs()
+		MeterData = {}
+		for SendTime, ReceiveTime, PID, PidData in Samples:
+			if PID in MeterPIDs:
+				MeterData[PID] = PidData
+			if PID in PlotPIDs:
+				SetPlotData(PID, PidData, (SendTime + ReceiveTime) / 2)
+		for PID in MeterData:
+			SetMeterData(PID, MeterData[PID])
+
+	return SamplePosition
+
+
+
+#/*******************************************************************/
+#/* Aquire the data for the meters and plots from the ECU into the  */
+#/* sample buffer. Return the time until the next PID is due to be  */
+#/* refreshed.                                                      */
+#/*******************************************************************/
+def AquireData(ThisDisplay):
 	ThisDisplay.Buttons["BUSY"].SetVisible(True)
 	FlashVisuals["BUSY"] = ThisDisplay.Buttons["BUSY"]
 	try:
-		# Get the information available for each of the plot related PIDs.
-		for Index in range(Plot.PLOT_COUNT):
-			if ThisDisplay.Plots["PLOT"].IsDataEnd(Index) == False:
-				PID = ThisDisplay.Plots["PLOT"].GetPID(Index)
-				if PID != "":
-					# Plot the information returned for the current PID.
-					PidData = ThisELM327.DoPID(PID)
-					ThisDisplay.Plots["PLOT"].SetData(Index, PidData)
+		Result = ThisAcquisition.Poll()
 	except Exception as Catch:
 		print(str(Catch))
-	# Allow another ELM327 communication now this one is complete.
-	LockELM327.release()
+		Result = -1
 	FlashVisuals.pop("BUSY", None)
 	ThisDisplay.Buttons["BUSY"].SetVisible(False)
 
+	return Result
+
 
 
-#/*********************************************************/
-#/* Aquire data as fast as possible for plots and meters. */
-#/*********************************************************/
+#/*******************************************************************/
+#/* Aquire data for plots and meters in the background, whichever   */
+#/* tab is currently displayed. The thread runs for the life of the */
+#/* application, aquiring data while data aquisition is on, and     */
+#/* waiting without using the CPU while data aquisition is stopped. */
+#/*******************************************************************/
 def AquisitionLoop(ThisDisplay):
-	try:
-		while (ThisDisplay.Meters["GO_STOP"].GetDown() == True or ThisDisplay.Plots["GO_STOP"].GetDown() == True):
-			# Update the gadgit data from the ECU.
-			if ThisDisplay.CurrentTab == ThisDisplay.Meters and ThisDisplay.Meters["LOCK"].GetDown() == True and ThisDisplay.Meters["GO_STOP"].GetDown() == True:
-				if LockELM327.acquire(0):
-					_thread.start_new_thread(MeterData, (ThisDisplay, ))
-			# Update the plot data from the ECU.
-			if ThisDisplay.CurrentTab == ThisDisplay.Plots and ThisDisplay.Plots["GO_STOP"].GetDown() == True:
-				if LockELM327.acquire(0):
-					_thread.start_new_thread(PlotData, (ThisDisplay, ))
-	except Exception as Catch:
-		print(str(Catch))
-	# Allow this function to be called again if required.
-	LockAquisition.release()
+	while AquisitionExit == False:
+		AquisitionGo.wait()
+		if AquisitionExit == False:
+			try:
+				# Update the meter and plot data from the ECU.
+				WaitTime = ThisELM327Queue.Submit(ELM327Queue.PRIORITY_HIGH, "AQUIRE", AquireData, ThisDisplay).result()
+				# Wait until the next PID is due to be refreshed.
+				if WaitTime < 0:
+					time.sleep(AQUISITION_WAIT_PERIOD)
+				elif WaitTime > 0:
+					time.sleep(min(WaitTime, AQUISITION_WAIT_PERIOD))
+			except Exception as Catch:
+				print(str(Catch))
+				time.sleep(AQUISITION_WAIT_PERIOD)
+
+
+
+#/********************************************************************/
+#/* Start data aquisition while either GO/STOP button is down, and   */
+#/* stop data aquisition when both GO/STOP buttons are up.           */
+#/********************************************************************/
+def SetAquisition(ThisDisplay):
+	if ThisDisplay.Meters["GO_STOP"].GetDown() == True or ThisDisplay.Plots["GO_STOP"].GetDown() == True:
+		AquisitionGo.set()
+	else:
+		AquisitionGo.clear()
 
 
 
@@ -415,12 +562,22 @@ def AquisitionLoop(ThisDisplay):
 # Set the configuration before start.
 ApplyConfig()
 
+# Aquire the data for the meters and the plots, the plot series share a time axis.
+ThisAcquisition.Subscribe("METERS", GetMeterPIDs)
+ThisAcquisition.Subscribe("PLOTS", GetPlotPIDs, True)
+
+# Start the aquisition thread, which waits until data aquisition is started.
+AquisitionThread = threading.Thread(target = AquisitionLoop, args = (ThisDisplay, ), name = "AQUISITION", daemon = True)
+AquisitionThread.start()
+
 # Create a timer for updating the displayed time/date and updating gadgit data from the ECU.
 pygame.time.set_timer(EVENT_TIMER, TIMER_PERIOD)
 
-# Aquire a lock for use when communicating with the ELM327 device.
-if LockELM327.acquire(0):
-	_thread.start_new_thread(ConnectELM327, (ThisDisplay, ))
+# Connect to the ELM327 device, or start replaying a trip log.
+if ThisTripReplay is not None:
+	ThisELM327Queue.Submit(ELM327Queue.PRIORITY_HIGH, "REPLAY", ReplayTrip, ThisDisplay)
+else:
+	ThisELM327Queue.Submit(ELM327Queue.PRIORITY_HIGH, "CONNECT", ConnectELM327, ThisDisplay)
 
 # Application message loop.
 ExitFlag = False
@@ -437,6 +594,20 @@ while ExitFlag == False:
 			# If the ESC key is pressed, finish the application.
 			if KeysPressed[pygame.K_ESCAPE]:
 				ExitFlag = True
+			# Keys to control the replay of a trip log.
+			elif ThisTripReplay is not None:
+				if KeysPressed[pygame.K_SPACE]:
+					ThisELM327Queue.Submit(ELM327Queue.PRIORITY_HIGH, "REPLAY", ThisTripReplay.SetPaused, not ThisTripReplay.IsPaused())
+				elif KeysPressed[pygame.K_RETURN]:
+					ThisELM327Queue.Submit(ELM327Queue.PRIORITY_HIGH, "REPLAY", ThisTripReplay.Step)
+				elif KeysPressed[pygame.K_LEFT]:
+					ThisELM327Queue.Submit(ELM327Queue.PRIORITY_HIGH, "REPLAY", ThisTripReplay.Seek, ThisTripReplay.GetReplayTime() - REPLAY_SEEK_PERIOD)
+				elif KeysPressed[pygame.K_RIGHT]:
+					ThisELM327Queue.Submit(ELM327Queue.PRIORITY_HIGH, "REPLAY", ThisTripReplay.Seek, ThisTripReplay.GetReplayTime() + REPLAY_SEEK_PERIOD)
+				elif KeysPressed[pygame.K_UP]:
+					ThisELM327Queue.Submit(ELM327Queue.PRIORITY_HIGH, "REPLAY", ThisTripReplay.SetSpeed, 2 * ThisTripReplay.GetSpeed())
+				elif KeysPressed[pygame.K_DOWN]:
+					ThisELM327Queue.Submit(ELM327Queue.PRIORITY_HIGH, "REPLAY", ThisTripReplay.SetSpeed, ThisTripReplay.GetSpeed() / 2)
 		elif ThisEvent.type == EVENT_TIMER:
 			try:
 				# Update the displayed date and time.
@@ -457,19 +628,21 @@ while ExitFlag == False:
 						FlashVisuals[ThisVisual].SetDown(True)
 					else:
 						FlashVisuals[ThisVisual].SetDown(False)
+
+				# Display the report message once the report has been created.
+				if ReportFuture is not None and ReportFuture.done() == True:
+					if ReportFuture.cancelled() == True:
+						Result = "CANCELLED"
+					elif ReportFuture.exception() is not None:
+						Result = str(ReportFuture.exception())
+					else:
+						Result = ReportFuture.result()
+					ReportFuture = None
+					ThisDisplay.CurrentTab["CONFIRM"] = Confirm.Confirm(ThisDisplay.ThisSurface, "CONFIRM_REPORT", ReportMessage + Result, ThisDisplay.GetDisplayWidth()/1.5, True)
 			except Exception as Catch:
 				print(str(Catch))
-		# Only process the following events if the ELM327 device is currently communicating.
-		elif LockELM327.locked() == True:
-			if ThisEvent.type == pygame.MOUSEBUTTONDOWN:
-				# Allow GO/STOP button to be toggled while ELM327 communications are occuring.
-				if ThisDisplay.CurrentTab == ThisDisplay.Meters:
-					ThisDisplay.Meters["GO_STOP"].IsEvent(Visual.EVENT_MOUSE_DOWN, ThisEvent.pos[0], ThisEvent.pos[1], ThisEvent.button)
-				elif ThisDisplay.CurrentTab == ThisDisplay.Plots:
-					ThisDisplay.Plots["GO_STOP"].IsEvent(Visual.EVENT_MOUSE_DOWN, ThisEvent.pos[0], ThisEvent.pos[1], ThisEvent.button)
-
-		# Only process the following events if the ELM327 device is not currently communicating.
-		elif LockELM327.locked() == False:
+		# ELM327 communications are queued, so events are processed while the ELM327 device is communicating.
+		else:
 			if ThisEvent.type == pygame.MOUSEBUTTONDOWN:
 				# Pass button down events to all buttons and gadgits.
 				ButtonGadgit = ThisDisplay.IsEvent(Visual.EVENT_MOUSE_DOWN, ThisEvent.pos[0], ThisEvent.pos[1], ThisEvent.button)
@@ -486,8 +659,7 @@ while ExitFlag == False:
 						if ButtonGadgit["GADGIT"] == "CONFIRM_EXIT":
 							ExitFlag = True
 						elif ButtonGadgit["GADGIT"] == "CONFIRM_CLEAR_ECU":
-							if LockELM327.acquire(0):
-								_thread.start_new_thread(ClearTroubleInfo, (ThisDisplay, ))
+							ThisELM327Queue.Submit(ELM327Queue.PRIORITY_MEDIUM, "CLEAR", ClearTroubleInfo, ThisDisplay)
 					# If confirm dialog button no is pressed, close the dialog.
 					elif ButtonGadgit["BUTTON"] == "NO":
 						ThisDisplay.CurrentTab.pop("CONFIRM", None)
@@ -500,7 +672,7 @@ while ExitFlag == False:
 							if ButtonGadgit["GADGIT"] == "SELECT_PID":
 								ThisPID = SelectedLine[SelectedLine.find("[") + 1:SelectedLine.find("]")]
 								# Get a list of all valid PIDs the connected ECU supports.
-								ValidPIDs = ThisELM327.GetValidPIDs()
+								ValidPIDs = GetValidPIDs()
 								if ThisPID in ValidPIDs:
 									if SelectGadgit[:5] != "PLOT_":
 										ThisDisplay.Meters[SelectGadgit].SetPID(ThisPID, ValidPIDs[ThisPID])
@@ -519,22 +691,16 @@ while ExitFlag == False:
 								Config.ConfigValues["Vehicle"] = SelectedLine
 					# If print button is pressed.
 					elif ButtonGadgit["BUTTON"] == "PRINT":
-						# Print PDF Report.
-						Result = PrintPdfReport()
-						# Display print report message.
-						ThisDisplay.CurrentTab["CONFIRM"] = Confirm.Confirm(ThisDisplay.ThisSurface, "CONFIRM_PRINT", "OBDII Report Sent To Default Printer\n" + Result, ThisDisplay.GetDisplayWidth()/1.5, True)
+						if ReportFuture is None:
+							# Print PDF Report, the message is displayed once printed.
+							ReportFuture = ThisELM327Queue.Submit(ELM327Queue.PRIORITY_LOW, "PRINT", PrintPdfReport)
+							ReportMessage = "OBDII Report Sent To Default Printer\n"
 					# If save button is pressed.
 					elif ButtonGadgit["BUTTON"] == "SAVE":
-						# Get the date and time for the report filename.
-						Now = datetime.datetime.now()
-						FileName = "SAVE/"
-						FileName += Now.strftime("%Y-%m-%d_%H-%M-%S_")
-						# Get Vehicle VIN for report filename.
-						FileName += ThisELM327.DoPID("0902").replace(' ', '') + ".pdf"
-						# Save PDF Report.
-						Result = SavePdfReport(FileName)
-						# Display PDF saved message.
-						ThisDisplay.CurrentTab["CONFIRM"] = Confirm.Confirm(ThisDisplay.ThisSurface, "CONFIRM_PDF", "OBDII Report Saved:\n" + Result, ThisDisplay.GetDisplayWidth()/1.5, True)
+						if ReportFuture is None:
+							# Save PDF Report, the message is displayed once saved.
+							ReportFuture = ThisELM327Queue.Submit(ELM327Queue.PRIORITY_LOW, "SAVE", SaveDatedPdfReport)
+							ReportMessage = "OBDII Report Saved:\n"
 					# If reset plot button is pressed.
 					elif ButtonGadgit["BUTTON"] == "RESET":
 						ThisDisplay.Plots["PLOT"].ClearData()
@@ -569,8 +735,10 @@ while ExitFlag == False:
 						ThisDisplay.CurrentTab["SELECT"] = Select.Select(ThisDisplay.ThisSurface, "SELECT_SERIAL_PORT_NAME", SelectText)
 					# If connect button is pressed, connect to the CAN BUS.
 					elif ButtonGadgit["BUTTON"] == "CONNECT":
-						if LockELM327.acquire(0):
-							_thread.start_new_thread(ConnectELM327, (ThisDisplay, ))
+						if ThisTripReplay is not None:
+							ThisELM327Queue.Submit(ELM327Queue.PRIORITY_HIGH, "REPLAY", ReplayTrip, ThisDisplay)
+						else:
+							ThisELM327Queue.Submit(ELM327Queue.PRIORITY_HIGH, "CONNECT", ConnectELM327, ThisDisplay)
 					# If select button is pressed, select a PID for the specific gadgit.
 					elif ButtonGadgit["BUTTON"] == "SELECT" or ButtonGadgit["BUTTON"][:5] == "PLOT_":
 						# Remember which gadgit the select is for.
@@ -579,7 +747,7 @@ while ExitFlag == False:
 						else:
 							SelectGadgit = ButtonGadgit["BUTTON"]
 						# Get a list of all valid PIDs the connected ECU supports.
-						ValidPIDs = ThisELM327.GetValidPIDs()
+						ValidPIDs = GetValidPIDs()
 						# Get the information available for each of the supported PIDs.
 						SelectText = "NONE\n"
 						for PID in sorted(ValidPIDs):
@@ -596,39 +764,34 @@ while ExitFlag == False:
 							ThisDisplay.CurrentTab.pop("CONFIGURE", None)
 					# If vehicle button is pressed, get the vehicle data from the ECU.
 					elif ButtonGadgit["BUTTON"] == "VEHICLE":
-						if LockELM327.acquire(0):
-							_thread.start_new_thread(VehicleData, (ThisDisplay, ))
+						ThisELM327Queue.Submit(ELM327Queue.PRIORITY_MEDIUM, "VEHICLE", VehicleData, ThisDisplay)
 					# If trouble or refresh button is pressed, get the trobule related data from the ECU.
 					elif ButtonGadgit["BUTTON"] == "TROUBLE" or ButtonGadgit["BUTTON"] == "MIL" or ButtonGadgit["BUTTON"] == "REFRESH":
-						if LockELM327.acquire(0):
-							_thread.start_new_thread(TroubleInfo, (ThisDisplay, ))
-							# Check for MIL status after reading trouble data.
-							FlashVisuals.pop("MIL", None)
-							ThisDisplay.Buttons["MIL"].SetDown(False)
-							if ThisELM327.GetMilOn() == True:
-								FlashVisuals["MIL"] = ThisDisplay.Buttons["MIL"]
+						ThisELM327Queue.Submit(ELM327Queue.PRIORITY_MEDIUM, "TROUBLE", TroubleInfo, ThisDisplay)
+						# Check for MIL status after reading trouble data.
+						FlashVisuals.pop("MIL", None)
+						ThisDisplay.Buttons["MIL"].SetDown(False)
+						if ThisELM327.GetMilOn() == True:
+							FlashVisuals["MIL"] = ThisDisplay.Buttons["MIL"]
 					# If clear button is pressed, clear the trouble and related data on the ECU.
 					elif ButtonGadgit["BUTTON"] == "CLEAR":
 						# Display a confirmation to clear ECU trouble codes.
 						ThisDisplay.CurrentTab["CONFIRM"] = Confirm.Confirm(ThisDisplay.ThisSurface, "CONFIRM_CLEAR_ECU", "Clear all trouble codes\nand related data\non the ECU?")
 					# If freeze button is pressed.
 					elif ButtonGadgit["BUTTON"] == "FREEZE" or ButtonGadgit["BUTTON"] == "RELOAD_FREEZE":
-						if LockELM327.acquire(0):
-							_thread.start_new_thread(FreezeFrameData, (ThisDisplay, ))
+						ThisELM327Queue.Submit(ELM327Queue.PRIORITY_MEDIUM, "FREEZE", FreezeFrameData, ThisDisplay, ButtonGadgit["BUTTON"] == "RELOAD_FREEZE")
 					# If frame button is pressed, get a frame of data from the ECU.
 					elif ButtonGadgit["BUTTON"] == "FRAME" or ButtonGadgit["BUTTON"] == "RELOAD":
-						if LockELM327.acquire(0):
-							_thread.start_new_thread(FrameData, (ThisDisplay, ))
+						ThisELM327Queue.Submit(ELM327Queue.PRIORITY_MEDIUM, "FRAME", FrameData, ThisDisplay)
 					# If add button is pressed, add a new gadgit to the meters tab.
 					elif ButtonGadgit["BUTTON"] == "ADD":
 						if ThisDisplay.CurrentTab == ThisDisplay.Meters:
 							NewName = "{:X}".format(random.getrandbits(128))
 							ThisDisplay.Meters[NewName] = Gadgit.Gadgit(ThisDisplay.ThisSurface, NewName, Visual.PRESS_NONE, 0, 2 * Visual.BUTTON_HEIGHT, ThisDisplay.GadgitWidth, ThisDisplay.GadgitHeight, "NEW")
-					# If GO/STOP button is pressed, start data aquisition.
+					# If GO/STOP button is pressed, start or stop data aquisition.
 					elif ButtonGadgit["BUTTON"] == "GO_STOP":
 						if ThisDisplay.CurrentTab == ThisDisplay.Meters or ThisDisplay.CurrentTab == ThisDisplay.Plots:
-							if LockAquisition.acquire(0):
-								_thread.start_new_thread(AquisitionLoop, (ThisDisplay, ))
+							SetAquisition(ThisDisplay)
 					# If add button is pressed, add a new gadgit to the meters tab.
 					elif ButtonGadgit["BUTTON"] == "LOCK":
 						if ThisDisplay.Meters["LOCK"].GetDown() == False:
@@ -652,7 +815,8 @@ while ExitFlag == False:
 				else:
 					ButtonGadgit = ThisDisplay.IsEvent(Visual.EVENT_MOUSE_HOVER, ThisEvent.pos[0], ThisEvent.pos[1], ThisEvent.buttons[0])
 
-	# Update the display.
+	# Update the meters and plots with the data aquired since the last update, then update the display.
+	SamplePosition = DisplaySamples(SamplePosition)
 	ThisDisplay.Display()
 
 
@@ -661,6 +825,17 @@ while ExitFlag == False:
 ThisDisplay.SaveMetersTab()
 # Save the config for the plot series.
 ThisDisplay.Plots["PLOT"].SaveSeriesConfig()
+# Stop the aquisition thread.
+AquisitionExit = True
+AquisitionGo.set()
+AquisitionThread.join(ELM327.SERIAL_PORT_TIME_OUT)
+# Stop the trip logger, writing any remaining data to disk.
+ThisTripLogger.Stop()
+# Stop the ELM327 thread once the current communication is complete.
+ThisELM327Queue.Close(ELM327.SERIAL_PORT_TIME_OUT)
+# Close the trip log being replayed.
+if ThisTripReplay is not None:
+	ThisTripReplay.Close()
 
 # Terminate application.
 pygame.time.set_timer(EVENT_TIMER, 0)
@@ -0,0 +1,175 @@
+#!/usr/bin/python3
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+#/***************************************************************************/
+#/* Raspberry Pi ELM327 OBBII CAN BUS Diagnostic Software.                  */
+#/*                                                                         */
+#/* Aquire data from the ECU without a display, for unattended data logging */
+#/* on a vehicle with no screen. pygame is not used, so the application     */
+#/* starts quickly. The PIDs of the meters and plot series are aquired,     */
+#/* unless PIDs are given on the command line, and are logged to disk as a  */
+#/* trip log and/or streamed to a TCP socket as text lines:                 */
+#/*                                                                         */
+#/*    SEND_TIME RECEIVE_TIME PID VALUE                                     */
+#/*                                                                         */
+#/* Run from the application directory:                                     */
+#/*                                                                         */
+#/*    python3 PiOBDIIHeadless.py --log                                     */
+#/*    python3 PiOBDIIHeadless.py --stream 192.168.1.2:3500 010C 010D       */
+#/***************************************************************************/
+
+
+
+import time
+import socket
+import argparse
+import ELM327
+import ConfigFile
+import Acquisition
+import TripLogger
+
+
+
+# Files the PIDs to aquire are read from, when no PIDs are given.
+HEADLESS_PID_FILES = ["CONFIG/METERS.CFG", "CONFIG/PLOT_SERIES.CFG"]
+# Period to wait before trying to connect to the ECU, or the stream socket, again.
+HEADLESS_CONNECT_PERIOD = 5
+# Longest period to wait between aquisition checks, while no PIDs are due to be refreshed.
+HEADLESS_WAIT_PERIOD = 0.1
+# Longest time to wait when connecting or sending to the stream socket.
+HEADLESS_STREAM_TIME_OUT = 1
+
+
+
+#/*******************************************************************/
+#/* Return the PIDs of the meters and plot series, as saved by the  */
+#/* application with a display.                                     */
+#/*******************************************************************/
+def LoadPIDs():
+	PIDs = []
+
+	for FileName in HEADLESS_PID_FILES:
+		try:
+			File = open(FileName, 'r')
+			for TextLine in File:
+				for ThisElement in TextLine.replace("\n", "").split('|'):
+					if ThisElement[:4] == "PID=" and ThisElement[4:] != "" and ThisElement[4:] not in PIDs:
+						PIDs.append(ThisElement[4:])
+			File.close()
+		except Exception as Catch:
+			print(ELM327.STRING_ERROR + " " + FileName + " : " + str(Catch))
+
+	return PIDs
+
+
+
+#/*******************************************************************/
+#/* Connect to a TCP socket, given as HOST:PORT, to stream the      */
+#/* samples to. Return the socket, or None when not connected.      */
+#/*******************************************************************/
+def ConnectStream(Address):
+	Result = None
+
+	try:
+		Host, Port = Address.rsplit(":", 1)
+		Result = socket.create_connection((Host, int(Port)), HEADLESS_STREAM_TIME_OUT)
+	except Exception as Catch:
+		print(ELM327.STRING_ERROR + " STREAM " + Address + " : " + str(Catch))
+
+	return Result
+
+
+
+#/*******************************************************************/
+#/* Send samples to the stream socket, one text line per sample.    */
+#/* Return the socket, or None when the socket has failed.          */
+#/*******************************************************************/
+def StreamSamples(Stream, Samples):
+	Lines = ""
+	for SendTime, ReceiveTime, PID, Value in Samples:
+		Lines += "{:.6f} {:.6f} {} {}\n".format(SendTime, ReceiveTime, PID, Value)
+	try:
+		Stream.sendall(bytes(Lines, 'UTF-8'))
+	except Exception as Catch:
+		print(ELM327.STRING_ERROR + " STREAM : " + str(Catch))
+		Stream.close()
+		Stream = None
+
+	return Stream
+
+
+
+# Command line options.
+Parser = argparse.ArgumentParser(description = "Aquire data from the ECU without a display.")
+Parser.add_argument("PIDs", nargs = "*", help = "PIDs to aquire, default the PIDs of the meters and plot series.")
+Parser.add_argument("--log", action = "store_true", help = "Log the data to a trip log in the SAVE directory.")
+Parser.add_argument("--stream", metavar = "HOST:PORT", help = "Stream the data to a TCP socket.")
+Arguments = Parser.parse_args()
+
+# Apply the application configuration.
+ConfigFile.LoadConfig()
+ELM327.DEBUG = ConfigFile.ConfigValues["Debug"]
+ELM327.SERIAL_PORT_NAME = ConfigFile.ConfigValues["SerialPort"]
+
+#  /***************************************/
+# /* Create application class instances. */
+#/***************************************/
+ThisELM327 = ELM327.ELM327()
+ThisELM327.LoadVehicle(ConfigFile.ConfigValues["Vehicle"])
+ThisAcquisition = Acquisition.Acquisition(ThisELM327)
+ThisTripLogger = TripLogger.TripLogger(ThisAcquisition.Samples)
+
+PIDs = Arguments.PIDs
+if len(PIDs) == 0:
+	PIDs = LoadPIDs()
+ThisAcquisition.Subscribe("HEADLESS", lambda: PIDs)
+print("AQUIRING PIDS: " + " ".join(PIDs))
+
+try:
+	# Keep trying to connect, the vehicle may not be running yet.
+	while ThisELM327.Connect() != ELM327.CONNECT_SUCCESS:
+		print(ThisELM327.GetInitResult())
+		time.sleep(HEADLESS_CONNECT_PERIOD)
+	print(ThisELM327.GetInfo())
+
+	if Arguments.log == True or ConfigFile.ConfigValues["TripLog"] == "ON":
+		ThisTripLogger.Start()
+	Stream = None
+	StreamConnectTime = 0
+	SamplePosition = ThisAcquisition.Samples.GetPosition()
+
+	# Aquire data until interrupted.
+	while True:
+		WaitTime = ThisAcquisition.Poll()
+		# Stream the new samples, connecting again periodically whenever the socket has failed.
+		if Arguments.stream is not None:
+			SamplePosition, Samples = ThisAcquisition.Samples.Read(SamplePosition)
+			if Stream is None and time.monotonic() - StreamConnectTime >= HEADLESS_CONNECT_PERIOD:
+				StreamConnectTime = time.monotonic()
+				Stream = ConnectStream(Arguments.stream)
+			if Stream is not None and len(Samples) > 0:
+				Stream = StreamSamples(Stream, Samples)
+		# Wait until the next PID is due to be refreshed.
+		if WaitTime < 0:
+			time.sleep(HEADLESS_WAIT_PERIOD)
+		elif WaitTime > 0:
+			time.sleep(min(WaitTime, HEADLESS_WAIT_PERIOD))
+except KeyboardInterrupt:
+	pass
+
+# Stop the trip logger, writing any remaining data to disk.
+ThisTripLogger.Stop()
+ThisELM327.Close()
@@ -23,6 +23,7 @@
 
 
 import os
+import time
 import datetime
 import pygame
 import Visual
@@ -34,6 +35,8 @@ import ELM327
 PLOT_COUNT = 3
 PLOT_POINTS = 512
 PLOT_WIDTH = 2
+# Shortest time period, in seconds, shown across the X axis.
+PLOT_MIN_PERIOD = 1
 
 
 
@@ -75,16 +78,21 @@ class Plot(Visual.Visual):
 
 
 
-#/***********************************/
-#/* Set the data value of a series. */
-#/***********************************/
-	def SetData(self, Index, PidData):
+#/*******************************************************************/
+#/* Set the data value of a series, at the monotonic time in        */
+#/* seconds the value was sampled, or the current time when no time */
+#/* is provided. Values are plotted at the time they were sampled.  */
+#/*******************************************************************/
+	def SetData(self, Index, PidData, SampleTime = None):
+		if SampleTime is None:
+			SampleTime = time.monotonic()
 		# Check for X axis label conditions and create X axis label when met.
-		ThisAxisTime = datetime.datetime.now()
+		ThisAxisTime = datetime.datetime.now() - datetime.timedelta(seconds = time.monotonic() - SampleTime)
 		if int(self.LastAxisTime.minute/2) != int(ThisAxisTime.minute/2):
 			self.LastAxisTime = ThisAxisTime
-			self.xAxisLabels[self.PlotIndex[Index]] = ThisAxisTime.strftime("%H:%M")
+			self.xAxisLabels[SampleTime] = ThisAxisTime.strftime("%H:%M")
 		# Store provided data.
+		self.PlotTimes[Index][self.PlotIndex[Index]] = SampleTime
 		if type(PidData) is not str and type(PidData) is not tuple:
 			self.PlotPoints[Index][self.PlotIndex[Index]] = PidData
 		else:
@@ -131,6 +139,24 @@ class Plot(Visual.Visual):
 		self.xAxisLabels = {}
 		self.PlotIndex = [ 0, 0, 0 ]
 		self.PlotPoints = [ [0] * PLOT_POINTS, [0] * PLOT_POINTS, [0] * PLOT_POINTS ]
+		self.PlotTimes = [ [0] * PLOT_POINTS, [0] * PLOT_POINTS, [0] * PLOT_POINTS ]
+
+
+
+#/*******************************************************************/
+#/* Return the time of the first and the last value of all series,  */
+#/* the time period shown across the X axis.                        */
+#/*******************************************************************/
+	def GetTimeRange(self):
+		TimeStart = 0
+		TimeEnd = 0
+		for Index in range(PLOT_COUNT):
+			if self.PlotIndex[Index] > 0:
+				if TimeStart == 0 or self.PlotTimes[Index][0] < TimeStart:
+					TimeStart = self.PlotTimes[Index][0]
+				TimeEnd = max(TimeEnd, self.PlotTimes[Index][self.PlotIndex[Index] - 1])
+
+		return TimeStart, TimeEnd
 
 
 
@@ -199,12 +225,14 @@ class Plot(Visual.Visual):
 		yAxisStep = int(yAxisScale / 10)
 		for yOffset in range(0, yAxisScale, yAxisStep):
 			pygame.draw.line(ThisSurface, self.ColourGrey, (self.xPos + Visual.X_MARGIN, self.yPos + self.yLen - yOffset), (self.xPos + self.xLen - 2*Visual.X_MARGIN, self.yPos + self.yLen - yOffset), 1)
+		# The X axis is a time axis, from the first value to the last value of all series.
+		TimeStart, TimeEnd = self.GetTimeRange()
+		xScale = (self.xLen - 2*Visual.X_MARGIN) / max(TimeEnd - TimeStart, PLOT_MIN_PERIOD)
 		# Display data scale.
-		xStep = (self.xLen - 2*Visual.X_MARGIN) / PLOT_POINTS
-		for Index in self.xAxisLabels:
-			ThisText = self.xAxisLabels[Index]
+		for LabelTime in self.xAxisLabels:
+			ThisText = self.xAxisLabels[LabelTime]
 			TextHeight = Visual.Fonts["NormalFont"].get_rect(ThisText)[3]
-			TextXPos = self.xPos + Index * xStep
+			TextXPos = self.xPos + (LabelTime - TimeStart) * xScale
 			TextYPos = self.yPos + self.yLen - TextHeight - Visual.Y_MARGIN
 			RenderText = Visual.Fonts["NormalFont"].render(ThisText, self.ColourBlack)
 			ThisSurface.blit(RenderText[0], (Visual.X_MARGIN + TextXPos, TextYPos))
@@ -227,7 +255,6 @@ class Plot(Visual.Visual):
 
 				# Plot series scale.
 				yScale = (self.yLen - 2*Visual.Y_MARGIN) / (self.PlotAttrib[Index]["ValueMax"] - self.PlotAttrib[Index]["ValueMin"])
-				xStep = (self.xLen - 2*Visual.X_MARGIN) / PLOT_POINTS
 				# Display Y axis scale values.
 				for yOffset in range(0, yAxisScale - yAxisStep, yAxisStep):
 					ThisText = TextLabels[ELM327.FIELD_PID_FORMAT_1].format(yOffset / yScale + self.PlotAttrib[Index]["ValueMin"])
@@ -237,13 +264,11 @@ class Plot(Visual.Visual):
 					TextYPos = self.yPos + self.yLen - yOffset - (3 - Index) * (TextHeight + 2)
 					RenderText = Visual.Fonts["NormalFont"].render(ThisText, self.PlotAttrib[Index]["Colour"])
 					ThisSurface.blit(RenderText[0], (TextXPos, TextYPos))
-				# Plot series.
-				xOffset = 0
+				# Plot series, each value at the time it was sampled.
 				for PlotIndex in range(self.PlotIndex[Index] - 1):
-					PlotX1 = Visual.X_MARGIN + xOffset
+					PlotX1 = Visual.X_MARGIN + xScale * (self.PlotTimes[Index][PlotIndex] - TimeStart)
 					PlotY1 = self.yPos + self.yLen - Visual.Y_MARGIN - yScale * (self.PlotPoints[Index][PlotIndex] - self.PlotAttrib[Index]["ValueMin"])
-					PlotX2 = Visual.X_MARGIN + xOffset + xStep
+					PlotX2 = Visual.X_MARGIN + xScale * (self.PlotTimes[Index][PlotIndex+1] - TimeStart)
 					PlotY2 = self.yPos + self.yLen - Visual.Y_MARGIN - yScale * (self.PlotPoints[Index][PlotIndex+1] - self.PlotAttrib[Index]["ValueMin"])
 					pygame.draw.line(ThisSurface, self.PlotAttrib[Index]["Colour"], (PlotX1, PlotY1), (PlotX2, PlotY2), PLOT_WIDTH)
-					xOffset += xStep
 
@@ -0,0 +1,94 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+#/***************************************************************************/
+#/* Raspberry Pi ELM327 OBBII CAN BUS Diagnostic Software.                  */
+#/*                                                                         */
+#/* Class: SampleBuffer                                                     */
+#/* A preallocated ring buffer of timestamped PID samples, handing the data */
+#/* aquired from the ECU to the display, loggers and any other readers.     */
+#/* There is one writer and any number of readers, each reader keeping      */
+#/* it's own position in the buffer, so no locks are needed. The oldest     */
+#/* samples are overwritten once the buffer is full.                        */
+#/***************************************************************************/
+
+
+
+import array
+
+
+
+# Number of samples held in the buffer.
+SAMPLE_BUFFER_SIZE = 4096
+
+
+
+class SampleBuffer:
+	def __init__(self, Size = SAMPLE_BUFFER_SIZE):
+		self.Size = Size
+		self.SendTimes = array.array('d', [0.0]) * Size
+		self.ReceiveTimes = array.array('d', [0.0]) * Size
+		self.PIDs = [""] * Size
+		self.Values = [0] * Size
+		# Total number of samples written, a sample is only read once counted.
+		self.Count = 0
+
+
+
+#/*******************************************************************/
+#/* Add a sample to the buffer, with the monotonic times the PID    */
+#/* was requested and the response was received, overwriting the    */
+#/* oldest sample once the buffer is full. Only one thread may      */
+#/* write to the buffer.                                            */
+#/*******************************************************************/
+	def Write(self, SendTime, ReceiveTime, PID, Value):
+		Index = self.Count % self.Size
+		self.SendTimes[Index] = SendTime
+		self.ReceiveTimes[Index] = ReceiveTime
+		self.PIDs[Index] = PID
+		self.Values[Index] = Value
+		self.Count += 1
+
+
+
+#/*******************************************************************/
+#/* Return the position after the last sample written, for a reader */
+#/* to only read the samples written from now on.                   */
+#/*******************************************************************/
+	def GetPosition(self):
+		return self.Count
+
+
+
+#/*******************************************************************/
+#/* Return the position after the last sample written, and a list   */
+#/* of the (SendTime, ReceiveTime, PID, Value) samples written      */
+#/* since the specified position. When a reader has fallen behind   */
+#/* the writer, the samples overwritten before they were read are   */
+#/* skipped.                                                        */
+#/*******************************************************************/
+	def Read(self, Position):
+		Count = self.Count
+		Start = max(Position, Count - self.Size)
+		Samples = []
+		for Sample in range(Start, Count):
+			Index = Sample % self.Size
+			Samples.append((self.SendTimes[Index], self.ReceiveTimes[Index], self.PIDs[Index], self.Values[Index]))
+
+		# Drop any samples the writer started to overwrite while they were being read.
+		Oldest = self.Count - self.Size + 1
+		if Oldest > Start:
+			Samples = Samples[Oldest - Start:]
+
+		return Count, Samples
@@ -0,0 +1,143 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#/***************************************************************************/
+#/* Raspberry Pi ELM327 OBBII CAN BUS Diagnostic Software.                  */
+#/*                                                                         */
+#/* Class: Scheduler                                                        */
+#/* Schedule PID requests so each PID is refreshed at it's own rate. The    */
+#/* PIDs whose refresh is due the soonest are requested first, so fast      */
+#/* changing values get most of the CAN BUS bandwidth, and slow changing    */
+#/* values are only requested as often as they need to be.                  */
+#/***************************************************************************/
+
+
+
+import os
+import time
+import ELM327
+
+
+
+# Default refresh rate, per second, for each Mode 01 PID.
+SCHEDULE_RATES_FILE = "DATA/PidRatesMode01.txt"
+# User refresh rate, per second, for any PID, used instead of the default.
+SCHEDULE_USER_RATES_FILE = "CONFIG/PID_RATES.CFG"
+# Refresh rate, per second, for PIDs without a default or user refresh rate.
+SCHEDULE_DEFAULT_RATE = 1
+# Highest refresh rate, per second, any PID can be given.
+SCHEDULE_MAX_RATE = 100
+
+
+
+class Scheduler:
+	def __init__(self):
+		self.Rates = {}
+		self.Deadlines = {}
+		self.LoadRates()
+
+
+
+#/*******************************************************************/
+#/* Load the default refresh rate for each Mode 01 PID, followed by */
+#/* the user refresh rates which replace the default refresh rates. */
+#/*******************************************************************/
+	def LoadRates(self):
+		self.Rates = {}
+		try:
+			with open(SCHEDULE_RATES_FILE) as ThisFile:
+				for ThisLine in ThisFile:
+					Digit, Rate = ThisLine.partition(" ")[::2]
+					self.Rates["01" + Digit] = float(Rate)
+		except Exception as Catch:
+			print(ELM327.STRING_ERROR + " " + SCHEDULE_RATES_FILE + " : " + str(Catch))
+
+		try:
+			if os.path.isfile(SCHEDULE_USER_RATES_FILE):
+				File = open(SCHEDULE_USER_RATES_FILE, 'r')
+				for TextLine in File:
+					TextElements = TextLine.replace("\n", "").split('|')
+					if len(TextElements) == 2 and TextElements[0][:4] == "PID=" and TextElements[1][:5] == "Rate=":
+						self.Rates[TextElements[0][4:]] = float(TextElements[1][5:])
+				File.close()
+		except Exception as Catch:
+			print(ELM327.STRING_ERROR + " " + SCHEDULE_USER_RATES_FILE + " : " + str(Catch))
+
+
+
+#/**********************************************/
+#/* Return the refresh rate, per second, for a */
+#/* PID, within the allowed refresh rates.     */
+#/**********************************************/
+	def GetRate(self, PID):
+		Rate = self.Rates.get(PID, SCHEDULE_DEFAULT_RATE)
+		if Rate <= 0:
+			Rate = SCHEDULE_DEFAULT_RATE
+
+		return min(Rate, SCHEDULE_MAX_RATE)
+
+
+
+#/*******************************************************************/
+#/* Set the PIDs to be scheduled. New PIDs are due immediately, and */
+#/* PIDs already scheduled keep their current refresh deadline.     */
+#/*******************************************************************/
+	def SetPIDs(self, PIDs):
+		Deadlines = {}
+		for PID in PIDs:
+			Deadlines[PID] = self.Deadlines.get(PID, 0)
+		self.Deadlines = Deadlines
+
+
+
+#/*******************************************************************/
+#/* Return up to the specified number of PIDs which are due to be   */
+#/* refreshed, earliest refresh deadline first.                     */
+#/*******************************************************************/
+	def GetDuePIDs(self, Count = ELM327.MAX_PIDS_PER_REQUEST):
+		Now = time.monotonic()
+		DuePIDs = []
+		for PID in self.Deadlines:
+			if self.Deadlines[PID] <= Now:
+				DuePIDs.append(PID)
+		DuePIDs.sort(key = lambda PID: self.Deadlines[PID])
+
+		return DuePIDs[:Count]
+
+
+
+#/*******************************************************************/
+#/* Set the next refresh deadline for PIDs which have been          */
+#/* refreshed. The deadline is from the time of the refresh, so a   */
+#/* PID which has fallen behind is not then refreshed repeatedly to */
+#/* catch up.                                                       */
+#/*******************************************************************/
+	def SetRefreshed(self, PIDs):
+		Now = time.monotonic()
+		for PID in PIDs:
+			if PID in self.Deadlines:
+				self.Deadlines[PID] = Now + 1 / self.GetRate(PID)
+
+
+
+#/*******************************************************************/
+#/* Return the time in seconds until the next PID is due, zero when */
+#/* a PID is already due, or -1 when no PIDs are scheduled.         */
+#/*******************************************************************/
+	def GetWaitTime(self):
+		Result = -1
+
+		if len(self.Deadlines) > 0:
+			Result = max(min(self.Deadlines.values()) - time.monotonic(), 0)
+
+		return Result
@@ -0,0 +1,293 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+#/**************************************************************************/
+#/* Raspberry Pi ELM327 OBBII CAN BUS Diagnostic Software.                 */
+#/*                                                                        */
+#/* Class: TripLogger                                                      */
+#/* Log the samples aquired from the ECU to disk, as compact fixed size    */
+#/* binary records appended to a trip log file in the SAVE directory. The  */
+#/* samples are read from the sample buffer on the logger's own thread, so */
+#/* the aquisition is never held up by the disk. Records are written in    */
+#/* large batches and synced to disk periodically, to limit the wear on an */
+#/* SD card, and a new log file is started after a size or time limit. A   */
+#/* small index file holds the offset of a record every few seconds, for   */
+#/* seeking to a time in the log, and a small PID file lists the PIDs in   */
+#/* the log, so the log need not be read to find them.                     */
+#/*                                                                        */
+#/* Log file:   LOG_HEADER, followed by LOG_RECORD for each sample.        */
+#/* Index file: LOG_INDEX_RECORD for every LOG_INDEX_PERIOD seconds.       */
+#/* PID file:   LOG_PID_RECORD for each PID, when first in the log file.   */
+#/**************************************************************************/
+
+
+
+import os
+import math
+import time
+import struct
+import datetime
+import threading
+import ELM327
+
+
+
+# Directory and file names of the trip log files.
+LOG_PATH = "SAVE/"
+LOG_FILE_PREFIX = "TRIP_"
+LOG_FILE_EXTENSION = ".LOG"
+LOG_INDEX_EXTENSION = ".IDX"
+LOG_PID_EXTENSION = ".PID"
+
+# Log file header: file ID, version, start time (seconds since the epoch) and start time (monotonic).
+LOG_FILE_ID = b'PIOBDLOG'
+LOG_FILE_VERSION = 1
+LOG_HEADER = struct.Struct("<8sHdd")
+# Log record: seconds from the start time to the response, response latency, PID and value.
+LOG_RECORD = struct.Struct("<dfHf")
+# Index record: seconds from the start time, log file offset of the record.
+LOG_INDEX_RECORD = struct.Struct("<dQ")
+# PID record: PID.
+LOG_PID_RECORD = struct.Struct("<H")
+
+# Period in seconds between reading samples from the sample buffer.
+LOG_READ_PERIOD = 0.5
+# Size in bytes of waiting records which are written at once.
+LOG_WRITE_SIZE = 65536
+# Longest period in seconds records wait to be written.
+LOG_WRITE_PERIOD = 5
+# Period in seconds between syncing the written records to disk.
+LOG_SYNC_PERIOD = 30
+# Period in seconds between index records.
+LOG_INDEX_PERIOD = 10
+# Size in bytes and period in seconds after which a new log file is started.
+LOG_FILE_SIZE = 16 * 1024 * 1024
+LOG_FILE_PERIOD = 3600
+
+
+
+class TripLogger:
+	def __init__(self, Samples):
+		self.Samples = Samples
+		self.Position = 0
+		self.Thread = None
+		self.StopEvent = threading.Event()
+		self.File = None
+		self.IndexFile = None
+		self.PidFile = None
+		self.FileName = ""
+		self.FileSize = 0
+		self.StartMonotonic = 0
+		self.LastIndexTime = 0
+		self.LastWriteTime = 0
+		self.LastSyncTime = 0
+		self.WriteBuffer = bytearray()
+		self.IndexBuffer = bytearray()
+		self.IndexPending = bytearray()
+		self.PidBuffer = bytearray()
+		self.PidPending = bytearray()
+		self.LogPIDs = set()
+
+
+
+#/*******************************************************************/
+#/* Start logging the samples aquired from now on, on the logger's  */
+#/* own thread.                                                     */
+#/*******************************************************************/
+	def Start(self):
+		if self.IsLogging() == False:
+			self.Position = self.Samples.GetPosition()
+			self.StopEvent.clear()
+			self.Thread = threading.Thread(target = self.LogLoop, name = "TRIP_LOG", daemon = True)
+			self.Thread.start()
+
+
+
+#/*******************************************************************/
+#/* Stop logging, writing any waiting records and closing the log   */
+#/* file, waiting up to the specified time for the logger to stop.  */
+#/*******************************************************************/
+	def Stop(self, Timeout = None):
+		if self.IsLogging() == True:
+			self.StopEvent.set()
+			self.Thread.join(Timeout)
+
+
+
+#/***********************************/
+#/* Check if the logger is logging. */
+#/***********************************/
+	def IsLogging(self):
+		return self.Thread is not None and self.Thread.is_alive() == True
+
+
+
+#/********************************************/
+#/* Return the name of the current log file. */
+#/********************************************/
+	def GetFileName(self):
+		return self.FileName
+
+
+
+#/*******************************************************************/
+#/* Log the new samples in the sample buffer periodically, until    */
+#/* stopped.                                                        */
+#/*******************************************************************/
+	def LogLoop(self):
+		try:
+			while self.StopEvent.wait(LOG_READ_PERIOD) == False:
+				self.LogSamples()
+			self.LogSamples()
+		except Exception as Catch:
+			print(ELM327.STRING_ERROR + " " + self.FileName + " : " + str(Catch))
+		try:
+			self.CloseFile()
+		except Exception as Catch:
+			print(ELM327.STRING_ERROR + " " + self.FileName + " : " + str(Catch))
+
+
+
+#/*******************************************************************/
+#/* Add a record for each new sample in the sample buffer, writing  */
+#/* the waiting records when enough are waiting or they have waited */
+#/* long enough. Only PIDs with four hex digits are logged, a PID   */
+#/* record is added for each PID when first in the log file.        */
+#/*******************************************************************/
+	def LogSamples(self):
+		self.Position, Samples = self.Samples.Read(self.Position)
+		for SendTime, ReceiveTime, PID, Value in Samples:
+			if len(PID) == 4:
+				# Start a new log file after the size or time limit.
+				if self.File is None or self.FileSize >= LOG_FILE_SIZE or ReceiveTime - self.StartMonotonic >= LOG_FILE_PERIOD:
+					self.CloseFile()
+					self.OpenFile(ReceiveTime)
+				Time = ReceiveTime - self.StartMonotonic
+				if Time - self.LastIndexTime >= LOG_INDEX_PERIOD:
+					self.LastIndexTime = Time
+					self.IndexBuffer += LOG_INDEX_RECORD.pack(Time, self.FileSize)
+				if PID not in self.LogPIDs:
+					self.LogPIDs.add(PID)
+					self.PidBuffer += LOG_PID_RECORD.pack(int(PID, 16))
+				self.WriteBuffer += LOG_RECORD.pack(Time, ReceiveTime - SendTime, int(PID, 16), self.GetNumber(Value))
+				self.FileSize += LOG_RECORD.size
+
+		Now = time.monotonic()
+		if len(self.WriteBuffer) >= LOG_WRITE_SIZE or (len(self.WriteBuffer) > 0 and Now - self.LastWriteTime >= LOG_WRITE_PERIOD):
+			self.WriteFile()
+		if self.File is not None and Now - self.LastSyncTime >= LOG_SYNC_PERIOD:
+			self.SyncFile()
+
+
+
+#/*******************************************************************/
+#/* Return a sample value as a number, the first value of a tuple,  */
+#/* or NaN for a value which is not a number.                       */
+#/*******************************************************************/
+	def GetNumber(self, Value):
+		try:
+			if type(Value) is tuple:
+				Value = Value[0]
+			Result = float(Value)
+		except:
+			Result = math.nan
+
+		return Result
+
+
+
+#/*******************************************************************/
+#/* Open a new log file, index file and PID file, named with the    */
+#/* current date and time, and add the log file header. The log     */
+#/* file starts at the monotonic time of the first sample in the    */
+#/* file.                                                           */
+#/*******************************************************************/
+	def OpenFile(self, StartMonotonic):
+		Now = datetime.datetime.now()
+		self.FileName = LOG_PATH + LOG_FILE_PREFIX + Now.strftime("%Y-%m-%d_%H-%M-%S")
+		# Never append to an existing log file, started within the same second.
+		Count = 1
+		while os.path.isfile(self.FileName + LOG_FILE_EXTENSION):
+			Count += 1
+			self.FileName = LOG_PATH + LOG_FILE_PREFIX + Now.strftime("%Y-%m-%d_%H-%M-%S") + "_" + str(Count)
+		self.File = open(self.FileName + LOG_FILE_EXTENSION, 'ab')
+		self.IndexFile = open(self.FileName + LOG_INDEX_EXTENSION, 'ab')
+		self.PidFile = open(self.FileName + LOG_PID_EXTENSION, 'ab')
+		self.StartMonotonic = StartMonotonic
+		StartTime = Now.timestamp() - (time.monotonic() - StartMonotonic)
+		# The first record is always indexed.
+		self.LastIndexTime = -LOG_INDEX_PERIOD
+		self.LastWriteTime = time.monotonic()
+		self.LastSyncTime = self.LastWriteTime
+		self.WriteBuffer = bytearray(LOG_HEADER.pack(LOG_FILE_ID, LOG_FILE_VERSION, StartTime, self.StartMonotonic))
+		self.IndexBuffer = bytearray()
+		self.IndexPending = bytearray()
+		self.PidBuffer = bytearray()
+		self.PidPending = bytearray()
+		self.LogPIDs = set()
+		self.FileSize = LOG_HEADER.size
+
+
+
+#/*******************************************************************/
+#/* Write the waiting records to the log file. The index records    */
+#/* and PID records for the written records are kept until the log  */
+#/* file is synced.                                                 */
+#/*******************************************************************/
+	def WriteFile(self):
+		if self.File is not None:
+			self.File.write(self.WriteBuffer)
+			self.File.flush()
+			self.IndexPending += self.IndexBuffer
+			self.PidPending += self.PidBuffer
+			self.WriteBuffer = bytearray()
+			self.IndexBuffer = bytearray()
+			self.PidBuffer = bytearray()
+			self.LastWriteTime = time.monotonic()
+
+
+
+#/*******************************************************************/
+#/* Make sure the written records are stored on the disk, then      */
+#/* write the index records and PID records for them, so after a    */
+#/* power cut an index record never refers past the end of the log  */
+#/* file, and the PID file only lists PIDs in the log file.         */
+#/*******************************************************************/
+	def SyncFile(self):
+		os.fsync(self.File.fileno())
+		self.IndexFile.write(self.IndexPending)
+		self.IndexFile.flush()
+		os.fsync(self.IndexFile.fileno())
+		self.PidFile.write(self.PidPending)
+		self.PidFile.flush()
+		os.fsync(self.PidFile.fileno())
+		self.IndexPending = bytearray()
+		self.PidPending = bytearray()
+		self.LastSyncTime = time.monotonic()
+
+
+
+#/*******************************************************/
+#/* Write any waiting records, then close the log file. */
+#/*******************************************************/
+	def CloseFile(self):
+		if self.File is not None:
+			self.WriteFile()
+			self.SyncFile()
+			self.File.close()
+			self.IndexFile.close()
+			self.PidFile.close()
+			self.File = None
+			self.IndexFile = None
+			self.PidFile = None
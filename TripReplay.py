@@ -0,0 +1,366 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+#/**************************************************************************/
+#/* Raspberry Pi ELM327 OBBII CAN BUS Diagnostic Software.                 */
+#/*                                                                        */
+#/* Class: TripReplay                                                      */
+#/* Replay a trip log written by the trip logger, in place of the ELM327   */
+#/* device, so the meters and plots show a logged drive as if it came from */
+#/* a live ECU. The log is memory mapped and read one record at a time, so */
+#/* memory use is the same for any length of log. The replay can be run at */
+#/* real time, faster or slower, paused, stepped a response at a time, and */
+#/* moved to any time in the log using the log index.                      */
+#/**************************************************************************/
+
+
+
+import os
+import mmap
+import math
+import time
+import ELM327
+import TripLogger
+
+
+
+# Longest period to wait for the next logged response, while no new data is due.
+REPLAY_WAIT_PERIOD = 0.1
+# Slowest and fastest replay speeds, as a multiple of real time.
+REPLAY_MIN_SPEED = 0.25
+REPLAY_MAX_SPEED = 64
+
+
+
+class TripReplay:
+	def __init__(self, FileName, ThisELM327):
+		self.ThisELM327 = ThisELM327
+		self.FileName = FileName
+		if self.FileName[-len(TripLogger.LOG_FILE_EXTENSION):] == TripLogger.LOG_FILE_EXTENSION:
+			self.FileName = self.FileName[:-len(TripLogger.LOG_FILE_EXTENSION)]
+		self.File = None
+		self.Map = None
+		self.IndexFile = None
+		self.IndexMap = None
+		self.RecordCount = 0
+		self.IndexCount = 0
+		self.StartTime = 0
+		self.EndTime = 0
+		self.Speed = 1
+		self.Paused = False
+		self.ReplayTime = 0
+		self.ClockMonotonic = time.monotonic()
+		self.RecordNumber = 0
+		self.NewData = {}
+		self.PidTimes = {}
+		self.ValidPIDs = {}
+
+		self.Open()
+
+
+
+#/*******************************************************************/
+#/* Memory map the log file and the index file, and check the log   */
+#/* file header. Any incomplete record at the end of the log, from  */
+#/* a log file which was not closed, is ignored.                    */
+#/*******************************************************************/
+	def Open(self):
+		self.File = open(self.FileName + TripLogger.LOG_FILE_EXTENSION, 'rb')
+		self.Map = mmap.mmap(self.File.fileno(), 0, access = mmap.ACCESS_READ)
+		if len(self.Map) < TripLogger.LOG_HEADER.size:
+			raise Exception("INVALID TRIP LOG: " + self.FileName)
+		FileId, Version, self.StartTime, StartMonotonic = TripLogger.LOG_HEADER.unpack_from(self.Map)
+		if FileId != TripLogger.LOG_FILE_ID or Version != TripLogger.LOG_FILE_VERSION:
+			raise Exception("INVALID TRIP LOG: " + self.FileName)
+		self.RecordCount = int((len(self.Map) - TripLogger.LOG_HEADER.size) / TripLogger.LOG_RECORD.size)
+		if self.RecordCount > 0:
+			self.EndTime = self.GetRecord(self.RecordCount - 1)[0]
+
+		# The log can still be replayed without an index, seeking is then slower.
+		if os.path.isfile(self.FileName + TripLogger.LOG_INDEX_EXTENSION) and os.path.getsize(self.FileName + TripLogger.LOG_INDEX_EXTENSION) >= TripLogger.LOG_INDEX_RECORD.size:
+			self.IndexFile = open(self.FileName + TripLogger.LOG_INDEX_EXTENSION, 'rb')
+			self.IndexMap = mmap.mmap(self.IndexFile.fileno(), 0, access = mmap.ACCESS_READ)
+			self.IndexCount = int(len(self.IndexMap) / TripLogger.LOG_INDEX_RECORD.size)
+
+		self.LoadValidPIDs()
+
+
+
+#/****************************************************/
+#/* Close the memory mapped log file and index file. */
+#/****************************************************/
+	def Close(self):
+		if self.IndexMap is not None:
+			self.IndexMap.close()
+			self.IndexFile.close()
+			self.IndexMap = None
+		if self.Map is not None:
+			self.Map.close()
+			self.File.close()
+			self.Map = None
+
+
+
+#/*******************************************************************/
+#/* Load the PIDs in the log, with their descriptions, as the PIDs  */
+#/* supported by the replay. The PIDs are read from the PID file,   */
+#/* only the records after the last index record, which may not     */
+#/* have been synced to the PID file, are read for any other PIDs.  */
+#/* The whole log is read when there is no PID file.                */
+#/*******************************************************************/
+	def LoadValidPIDs(self):
+		self.ValidPIDs = {}
+		First = 0
+
+		if os.path.isfile(self.FileName + TripLogger.LOG_PID_EXTENSION):
+			with open(self.FileName + TripLogger.LOG_PID_EXTENSION, 'rb') as PidFile:
+				Data = PidFile.read()
+			# Any incomplete PID record, from a log file which was not closed, is ignored.
+			for PID, in TripLogger.LOG_PID_RECORD.iter_unpack(Data[:len(Data) - len(Data) % TripLogger.LOG_PID_RECORD.size]):
+				self.AddValidPID(PID)
+			if self.IndexMap is not None:
+				Offset = TripLogger.LOG_INDEX_RECORD.unpack_from(self.IndexMap, (self.IndexCount - 1) * TripLogger.LOG_INDEX_RECORD.size)[1]
+				First = min(int((Offset - TripLogger.LOG_HEADER.size) / TripLogger.LOG_RECORD.size), self.RecordCount)
+		for Number in range(First, self.RecordCount):
+			self.AddValidPID(self.GetRecord(Number)[2])
+
+
+
+#/*******************************************************************/
+#/* Add a PID found in the log to the PIDs supported by the replay, */
+#/* with it's description.                                          */
+#/*******************************************************************/
+	def AddValidPID(self, Value):
+		PID = "{:04X}".format(Value)
+		if PID not in self.ValidPIDs:
+			if PID[:2] == "01" and PID[2:] in self.ThisELM327.PidDescriptionsMode01:
+				self.ValidPIDs[PID] = self.ThisELM327.PidDescriptionsMode01[PID[2:]]
+			else:
+				self.ValidPIDs[PID] = ELM327.STRING_NO_DESCRIPTION
+
+
+
+#/*******************************************************************/
+#/* Return the PIDs in the log. Freeze frames are not logged, so no */
+#/* PIDs are returned for a freeze frame.                           */
+#/*******************************************************************/
+	def GetValidPIDs(self, FreezeIndex = -1, Refresh = False):
+		Result = self.ValidPIDs
+
+		if FreezeIndex != -1:
+			Result = {}
+
+		return Result
+
+
+
+#/***************************************************************/
+#/* Return a log record as a tuple (Time, Latency, PID, Value). */
+#/***************************************************************/
+	def GetRecord(self, Number):
+		return TripLogger.LOG_RECORD.unpack_from(self.Map, TripLogger.LOG_HEADER.size + Number * TripLogger.LOG_RECORD.size)
+
+
+
+#/*******************************************************************/
+#/* Return the number of the first record at or after a time in the */
+#/* log. The index gives the last indexed record before the time,   */
+#/* the records are then read from there. An index record past the  */
+#/* end of the log, from a log which was not closed, is limited to  */
+#/* the end of the log.                                             */
+#/*******************************************************************/
+	def FindRecord(self, Time):
+		Number = 0
+
+		if self.IndexMap is not None:
+			First = 0
+			Last = self.IndexCount - 1
+			while First <= Last:
+				Middle = int((First + Last) / 2)
+				IndexTime, Offset = TripLogger.LOG_INDEX_RECORD.unpack_from(self.IndexMap, Middle * TripLogger.LOG_INDEX_RECORD.size)
+				if IndexTime < Time:
+					Number = min(int((Offset - TripLogger.LOG_HEADER.size) / TripLogger.LOG_RECORD.size), self.RecordCount)
+					First = Middle + 1
+				else:
+					Last = Middle - 1
+		while Number < self.RecordCount and self.GetRecord(Number)[0] < Time:
+			Number += 1
+
+		return Number
+
+
+
+#/*******************************************************************/
+#/* Return the current time in the log, in seconds from the start   */
+#/* of the log.                                                     */
+#/*******************************************************************/
+	def GetReplayTime(self):
+		Result = self.ReplayTime
+
+		if self.Paused == False:
+			Result += (time.monotonic() - self.ClockMonotonic) * self.Speed
+
+		return Result
+
+
+
+#/*******************************************************************/
+#/* Return the time of the start of the log, in seconds since the   */
+#/* epoch, and the length of the log in seconds.                    */
+#/*******************************************************************/
+	def GetTimeRange(self):
+		return self.StartTime, self.EndTime
+
+
+
+#/*******************************************************************/
+#/* Continue the replay from a time in the log, in seconds from the */
+#/* start of the log.                                               */
+#/*******************************************************************/
+	def SetReplayTime(self, Time):
+		self.ReplayTime = min(max(Time, 0), self.EndTime)
+		self.ClockMonotonic = time.monotonic()
+
+
+
+#/*******************************************************************/
+#/* Move the replay to a time in the log, in seconds from the start */
+#/* of the log. Data logged before the time is not replayed.        */
+#/*******************************************************************/
+	def Seek(self, Time):
+		self.SetReplayTime(Time)
+		self.RecordNumber = self.FindRecord(self.ReplayTime)
+		self.NewData = {}
+
+
+
+#/*******************************************************************/
+#/* Set the replay speed, as a multiple of real time, within the    */
+#/* allowed replay speeds.                                          */
+#/*******************************************************************/
+	def SetSpeed(self, Speed):
+		self.SetReplayTime(self.GetReplayTime())
+		self.Speed = min(max(Speed, REPLAY_MIN_SPEED), REPLAY_MAX_SPEED)
+
+
+
+#/********************************************************/
+#/* Return the replay speed, as a multiple of real time. */
+#/********************************************************/
+	def GetSpeed(self):
+		return self.Speed
+
+
+
+#/*******************************************************************/
+#/* Pause or resume the replay. Resuming at the end of the log      */
+#/* starts the replay again from the start of the log.              */
+#/*******************************************************************/
+	def SetPaused(self, Paused):
+		self.SetReplayTime(self.GetReplayTime())
+		self.Paused = Paused
+		if self.Paused == False and self.RecordNumber >= self.RecordCount:
+			self.Seek(0)
+
+
+
+#/**********************************/
+#/* Check if the replay is paused. */
+#/**********************************/
+	def IsPaused(self):
+		return self.Paused
+
+
+
+#/*******************************************************************/
+#/* Pause the replay, and step forward to the next logged response, */
+#/* all of the PIDs of a multiple PID response are logged with the  */
+#/* same time, and are replayed together.                           */
+#/*******************************************************************/
+	def Step(self):
+		self.SetPaused(True)
+		if self.RecordNumber < self.RecordCount:
+			self.SetReplayTime(self.GetRecord(self.RecordNumber)[0])
+
+
+
+#/*******************************************************************/
+#/* Read the records logged up to the current replay time, keeping  */
+#/* the latest data for each PID until it is requested. The replay  */
+#/* is paused at the end of the log.                                */
+#/*******************************************************************/
+	def Update(self):
+		ReplayTime = self.GetReplayTime()
+		while self.RecordNumber < self.RecordCount:
+			Time, Latency, PID, Value = self.GetRecord(self.RecordNumber)
+			if Time > ReplayTime:
+				break
+			self.NewData["{:04X}".format(PID)] = (Time, Latency, Value)
+			self.RecordNumber += 1
+		if self.RecordNumber >= self.RecordCount and self.Paused == False:
+			self.SetPaused(True)
+
+
+
+#/*******************************************************************/
+#/* Return the data logged for a list of PIDs since they were last  */
+#/* requested, as the ELM327 class does for data from the ECU. PIDs */
+#/* without new data are not returned. When no PIDs have new data,  */
+#/* wait for the next logged response, as for a response from the   */
+#/* ECU.                                                            */
+#/*******************************************************************/
+	def DoPIDs(self, PIDs):
+		Result = {}
+
+		self.Update()
+		if len([PID for PID in PIDs if PID in self.NewData]) == 0:
+			WaitTime = REPLAY_WAIT_PERIOD
+			if self.Paused == False and self.RecordNumber < self.RecordCount:
+				WaitTime = min((self.GetRecord(self.RecordNumber)[0] - self.GetReplayTime()) / self.Speed, WaitTime)
+			time.sleep(max(WaitTime, 0))
+			self.Update()
+
+		Now = time.monotonic()
+		ReplayTime = self.GetReplayTime()
+		for PID in PIDs:
+			if PID in self.NewData:
+				Time, Latency, Value = self.NewData.pop(PID)
+				# The data is timed as if received from the ECU at the replay speed.
+				ReceiveTime = Now - (ReplayTime - Time) / self.Speed
+				self.PidTimes[PID] = (ReceiveTime - Latency / self.Speed, ReceiveTime)
+				if math.isnan(Value) == True:
+					Result[PID] = ELM327.STRING_NO_DATA
+				else:
+					Result[PID] = Value
+
+		return Result
+
+
+
+#/*******************************************************************/
+#/* Return the data logged for a PID since it was last requested,   */
+#/* or no data when there is no new data.                           */
+#/*******************************************************************/
+	def DoPID(self, PID, FreezeIndex = -1):
+		return self.DoPIDs([PID]).get(PID, ELM327.STRING_NO_DATA)
+
+
+
+#/*******************************************************************/
+#/* Return the times the data last returned for a PID would have    */
+#/* been requested and received from the ECU, as a tuple            */
+#/* (SendTime, ReceiveTime).                                        */
+#/*******************************************************************/
+	def GetPidTimes(self, PID):
+		return self.PidTimes.get(PID, (0, 0))